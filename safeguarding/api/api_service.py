@@ -1,6 +1,9 @@
 from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 from filters.pipeline import run_full_pipeline
+from safeguarding.core.engine import live_engines
+from safeguarding.core.metrics import CONTENT_TYPE, render_metrics
 
 app = FastAPI()
 
@@ -11,3 +14,7 @@ class SafeguardRequest(BaseModel):
 async def filter_text(req: SafeguardRequest):
     result = run_full_pipeline(req.text)
     return result.dict()
+
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(render_metrics(live_engines()), media_type=CONTENT_TYPE)
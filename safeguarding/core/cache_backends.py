@@ -0,0 +1,267 @@
+import json
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List
+
+
+class CacheBackend(ABC):
+    """
+    Storage behind VerdictCache. Keys are opaque strings (already hashed), values JSON-compatible.
+    Backends never raise on lookups: a slow or unavailable store is just a miss,
+    so the caller falls back to running the filters.
+    """
+    # True when calls may block on I/O (the async path then runs them off the event loop)
+    blocking = False
+
+    def __init__(self):
+        self.stats = {"evictions": 0, "expirations": 0, "errors": 0}
+
+    def get(self, key: str):
+        return self.get_many([key])[0]
+
+    @abstractmethod
+    def get_many(self, keys: List[str]) -> list:
+        """
+        Values for keys, in order (None for a miss, expired entry or unreachable store).
+        """
+        pass
+
+    def set(self, key: str, value, ttl_seconds: float = None):
+        self.set_many([(key, value)], ttl_seconds)
+
+    @abstractmethod
+    def set_many(self, items: list, ttl_seconds: float = None):
+        """
+        Store [(key, value), ...], each expiring after ttl_seconds (None: never). Failures are counted, not raised.
+        """
+        pass
+
+    def clear(self):
+        """
+        Drop this process's view of the cache (shared backends rely on fingerprinted keys + TTL instead).
+        """
+
+    def close(self):
+        pass
+
+    def __len__(self) -> int:
+        return 0
+
+
+class InProcessBackend(CacheBackend):
+    """
+    LRU + TTL dict local to this process (the default).
+    """
+    def __init__(self, max_entries: int = 10000):
+        super().__init__()
+        self.max_entries = max(1, int(max_entries))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[str]) -> list:
+        now = time.monotonic()
+        out = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] is not None and now > entry[0]:
+                    del self._entries[key]
+                    self.stats["expirations"] += 1
+                    entry = None
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                out.append(None if entry is None else entry[1])
+        return out
+
+    def set_many(self, items: list, ttl_seconds: float = None):
+        expires = time.monotonic() + ttl_seconds if ttl_seconds else None
+        with self._lock:
+            for key, value in items:
+                self._entries[key] = (expires, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class BackendUnavailable(Exception):
+    pass
+
+
+class RedisBackend(CacheBackend):
+    """
+    Shared cache over the Redis protocol (RESP), so every API replica sees the same verdicts.
+    Speaks the wire protocol directly (GET/MGET/SET PX, pipelined), so no client library is needed;
+    works with Redis, Valkey, KeyDB and other RESP-compatible stores.
+    Every call is bounded by timeout_ms; after a failure the backend is skipped for cooldown_seconds
+    and lookups are plain misses, so a slow or dead cache never blocks filtering.
+    """
+    blocking = True
+
+    def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0, password: str = None,
+                 timeout_ms: float = 50, cooldown_seconds: float = 30, key_prefix: str = "safeguard:verdict:"):
+        super().__init__()
+        self.host = host
+        self.port = int(port)
+        self.db = int(db)
+        self.password = password
+        self.timeout = max(0.001, float(timeout_ms) / 1000.0)
+        self.cooldown = float(cooldown_seconds)
+        self.key_prefix = key_prefix
+        self._sock = None
+        self._reader = None
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[str]) -> list:
+        if not keys:
+            return []
+        try:
+            replies = self._execute([["MGET", *[self.key_prefix + k for k in keys]]])[0]
+        except BackendUnavailable:
+            return [None] * len(keys)
+        out = []
+        for raw in replies:
+            try:
+                out.append(None if raw is None else json.loads(raw))
+            except ValueError:
+                out.append(None)
+        return out
+
+    def set_many(self, items: list, ttl_seconds: float = None):
+        if not items:
+            return
+        commands = []
+        for key, value in items:
+            command = ["SET", self.key_prefix + key, json.dumps(value, separators=(",", ":"), default=str)]
+            if ttl_seconds:
+                command += ["PX", str(int(ttl_seconds * 1000))]
+            commands.append(command)
+        try:
+            self._execute(commands)
+        except BackendUnavailable:
+            pass
+
+    def ping(self) -> bool:
+        try:
+            return self._execute([["PING"]])[0] == "PONG"
+        except BackendUnavailable:
+            return False
+
+    def close(self):
+        with self._lock:
+            self._disconnect()
+
+    # --- Wire protocol
+    def _execute(self, commands: list) -> list:
+        """
+        Send commands pipelined on the shared connection and return their replies, in order.
+        Raises BackendUnavailable (and starts the cooldown) on any I/O or protocol error.
+        """
+        if time.monotonic() < self._down_until:
+            raise BackendUnavailable("cache backend cooling down")
+        with self._lock:
+            try:
+                if self._sock is None:
+                    self._connect()
+                self._sock.sendall(b"".join(_encode_command(c) for c in commands))
+                replies = [self._read_reply() for _ in commands]
+            except (OSError, ValueError, BackendUnavailable) as e:
+                self._disconnect()
+                self.stats["errors"] += 1
+                self._down_until = time.monotonic() + self.cooldown
+                raise BackendUnavailable(str(e))
+        for reply in replies:
+            if isinstance(reply, _ErrorReply):
+                self.stats["errors"] += 1
+                raise BackendUnavailable(str(reply))
+        return replies
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.settimeout(self.timeout)
+        self._reader = self._sock.makefile("rb")
+        setup = []
+        if self.password:
+            setup.append(["AUTH", self.password])
+        if self.db:
+            setup.append(["SELECT", str(self.db)])
+        if setup:
+            self._sock.sendall(b"".join(_encode_command(c) for c in setup))
+            for _ in setup:
+                reply = self._read_reply()
+                if isinstance(reply, _ErrorReply):
+                    raise BackendUnavailable(str(reply))
+
+    def _disconnect(self):
+        for closable in (self._reader, self._sock):
+            try:
+                if closable is not None:
+                    closable.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._reader = None
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ValueError("connection closed mid-reply")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode("utf-8")
+        if kind == b"-":
+            return _ErrorReply(body.decode("utf-8", "replace"))
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            if len(data) != length + 2:
+                raise ValueError("connection closed mid-reply")
+            return data[:-2]
+        if kind == b"*":
+            count = int(body)
+            return None if count < 0 else [self._read_reply() for _ in range(count)]
+        raise ValueError(f"unexpected RESP reply type {kind!r}")
+
+
+class _ErrorReply(str):
+    pass
+
+
+def _encode_command(parts: list) -> bytes:
+    out = [b"*%d\r\n" % len(parts)]
+    for part in parts:
+        data = part if isinstance(part, bytes) else str(part).encode("utf-8")
+        out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(out)
+
+
+def build_cache_backend(cache_cfg: dict) -> CacheBackend:
+    """
+    Backend for the verdict_cache config section: "memory" (default) or "redis" (verdict_cache.redis.*).
+    """
+    name = cache_cfg.get("backend", "memory")
+    if name == "memory":
+        return InProcessBackend(cache_cfg.get("max_entries", 10000))
+    if name == "redis":
+        return RedisBackend(**(cache_cfg.get("redis") or {}))
+    raise ValueError(f"Unknown verdict_cache.backend {name!r}; expected 'memory' or 'redis'.")
+
+# --- NOTES FOR AUDIT/MAINTAINERS:
+# - Only hashed keys and verdicts (flags/reasons/scores) ever leave the process; never raw text.
+# - Keys embed the engine's verdict fingerprint, so replicas on different rule sets never share entries.
+# - Keep redis.timeout_ms well under the classifier's latency: a cache slower than the model is pointless.
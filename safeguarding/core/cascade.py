@@ -0,0 +1,158 @@
+import json
+import threading
+import zlib
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+
+class HashedNgramScorer:
+    """
+    Tiny linear (logistic) model over hashed character n-grams.
+    Scores thousands of texts per second on one core, which makes it a good first tier
+    in front of a transformer: clearly benign (or clearly abusive) texts never reach BERT.
+    """
+    def __init__(self, weights, bias: float = 0.0, ngram_range: Tuple[int, int] = (3, 5), label: str = "toxic"):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.ngram_range = (int(ngram_range[0]), int(ngram_range[1]))
+        self.label = label
+
+    @property
+    def n_features(self) -> int:
+        return len(self.weights)
+
+    def features(self, text: str) -> np.ndarray:
+        """
+        Hashed n-gram bucket indices for one text (lowercased, padded with spaces).
+        """
+        text = f" {text.lower()} "
+        lo, hi = self.ngram_range
+        grams = [text[i:i + n] for n in range(lo, hi + 1) for i in range(len(text) - n + 1)]
+        return np.fromiter((zlib.crc32(g.encode("utf-8")) % self.n_features for g in grams), dtype=np.int64, count=len(grams))
+
+    def __call__(self, texts: List[str]) -> List[float]:
+        """
+        Probability of `label` for each text.
+        """
+        scores = []
+        for text in texts:
+            idx = self.features(text)
+            z = self.bias + (self.weights[idx].sum() / np.sqrt(len(idx)) if len(idx) else 0.0)
+            scores.append(float(1.0 / (1.0 + np.exp(-z))))
+        return scores
+
+    @classmethod
+    def fit(cls, texts: List[str], labels: List[int], n_features: int = 2 ** 18, ngram_range=(3, 5),
+            epochs: int = 5, learning_rate: float = 0.5, label: str = "toxic", seed: int = 0) -> "HashedNgramScorer":
+        """
+        Train with plain SGD on logistic loss (labels: 1 = label applies, 0 = clean).
+        """
+        model = cls(np.zeros(n_features), 0.0, ngram_range, label)
+        rng = np.random.default_rng(seed)
+        feats = [model.features(t) for t in texts]
+        y = np.asarray(labels, dtype=np.float64)
+        for _ in range(epochs):
+            for i in rng.permutation(len(texts)):
+                idx = feats[i]
+                norm = np.sqrt(len(idx)) if len(idx) else 1.0
+                z = model.bias + model.weights[idx].sum() / norm
+                grad = 1.0 / (1.0 + np.exp(-z)) - y[i]
+                np.add.at(model.weights, idx, -learning_rate * grad / norm)
+                model.bias -= learning_rate * grad
+        return model
+
+    def save(self, path: str):
+        nonzero = np.flatnonzero(self.weights)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "type": "hashed_ngram_logistic",
+                "label": self.label,
+                "n_features": self.n_features,
+                "ngram_range": list(self.ngram_range),
+                "bias": self.bias,
+                "weights": {str(i): float(self.weights[i]) for i in nonzero},
+            }, f)
+
+    @classmethod
+    def load(cls, path: str) -> "HashedNgramScorer":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        weights = np.zeros(int(data["n_features"]))
+        for i, w in data["weights"].items():
+            weights[int(i)] = w
+        return cls(weights, data.get("bias", 0.0), tuple(data.get("ngram_range", (3, 5))), data.get("label", "toxic"))
+
+
+class ClassifierCascade:
+    """
+    Two-tier classification: a cheap scorer sees every text; only texts whose fast score falls
+    inside the uncertainty band [low, high] are escalated to the full classifier.
+    Below the band the fast tier allows, above it the fast tier blocks.
+    Keeps per-tier counts and time so the band can be tuned against latency and recall.
+    """
+    def __init__(self, fast_scorer: Callable[[List[str]], List[float]], band=(0.2, 0.8), label: str = "toxic"):
+        self.fast_scorer = fast_scorer
+        self.low, self.high = float(band[0]), float(band[1])
+        if self.low > self.high:
+            raise ValueError(f"Cascade band must be [low, high], got {band!r}")
+        self.label = label
+        self.stats = {"fast": 0, "full": 0, "fast_seconds": 0.0, "full_seconds": 0.0}
+        self._lock = threading.Lock()
+
+    def triage(self, texts: List[str]) -> List[Tuple[Optional[tuple], float]]:
+        """
+        For each text: ((allowed, flags, reasons), fast_score) when the fast tier decides,
+        or (None, fast_score) when the text must be escalated.
+        """
+        out = []
+        for score in self.fast_scorer(list(texts)):
+            if score < self.low:
+                out.append(((True, [], []), score))
+            elif score > self.high:
+                flag = {"name": f"classifier_{self.label}", "score": score, "tier": "block"}
+                reason = f"Classifier cascade ({self.label}): fast score {score:.2f} > {self.high:.2f} (block)"
+                out.append(((False, [flag], [reason]), score))
+            else:
+                out.append((None, score))
+        return out
+
+    def record(self, tier: str, count: int, seconds: float):
+        with self._lock:
+            self.stats[tier] += count
+            self.stats[f"{tier}_seconds"] += seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        total = stats["fast"] + stats["full"]
+        stats["escalation_rate"] = stats["full"] / total if total else 0.0
+        return stats
+
+
+def build_cascade(cascade_cfg: dict, registry=None) -> Optional[ClassifierCascade]:
+    """
+    Build the cascade from the classifier.cascade config section (None when disabled).
+    The fast tier is either a hashed n-gram model file (fast_model_path) or a small
+    HuggingFace model (fast_model) whose `label` score is used.
+    """
+    if not cascade_cfg or not cascade_cfg.get("enabled", False):
+        return None
+    label = cascade_cfg.get("label", "toxic")
+    band = cascade_cfg.get("band", [0.2, 0.8])
+
+    if cascade_cfg.get("fast_model_path"):
+        scorer = HashedNgramScorer.load(cascade_cfg["fast_model_path"])
+    elif cascade_cfg.get("fast_model"):
+        from safeguarding.core.model_registry import default_registry
+        pipe = (registry or default_registry).get(cascade_cfg["fast_model"], warmup_texts=cascade_cfg.get("warmup_texts"))
+
+        def scorer(texts):
+            scores = []
+            for result in pipe(texts, top_k=None):
+                result = result if isinstance(result, list) else [result]
+                scores.append(max((r["score"] for r in result if r["label"].lower().replace(" ", "_") == label), default=0.0))
+            return scores
+    else:
+        raise ValueError("classifier.cascade needs either fast_model_path or fast_model.")
+    return ClassifierCascade(scorer, band=band, label=label)
@@ -1,6 +1,16 @@
 import json
+import time
 from typing import List
-from transformers.pipelines import pipeline
+from safeguarding.core.cascade import build_cascade
+from safeguarding.core.model_registry import ModelRegistry, default_registry
+from safeguarding.core.micro_batcher import MicroBatcher
+from safeguarding.core.text_windows import plan_windows, length_buckets, max_per_label
+from safeguarding.core.thresholds import CompiledThresholds
+from safeguarding.core.timing import Histogram
+from safeguarding.core.worker_pool import ClassifierWorkerPool
+
+# Upper bounds for the batch-size histogram (texts per scoring call)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
 
 # --- ClassifierResult is kept only for legacy/tests, not used in orchestrator
 class ClassifierResult:
@@ -18,11 +28,11 @@ class ClassifierFilter:
     Flags or blocks messages above a configured toxicity/abuse/etc. threshold.
     Returns (allowed, flags, reasons), always three values (Trinity contract).
     """
-    def __init__(self, config):
+    def __init__(self, config, registry: ModelRegistry = None):
         """
         Args:
-            config (dict, optional): Config dictionary. If None, falls back to loading from config_path.
-            config_path (str, optional): Path to config JSON if config is None.
+            config (dict): Config dictionary (required).
+            registry (ModelRegistry, optional): Where to get the shared model from (default: process-wide registry).
         """
         self.config = config
         
@@ -31,17 +41,78 @@ class ClassifierFilter:
 
         self.enabled = classifier_cfg.get("enabled", False)
         self.model_name = classifier_cfg.get("model", "unitary/toxic-bert")
+        self.revision = classifier_cfg.get("revision")
+        self.device = classifier_cfg.get("device")
+        self.precision = classifier_cfg.get("precision", "fp32")
         self.thresholds = classifier_cfg.get("thresholds", {})
+        self.batch_size = classifier_cfg.get("batch_size", 32)
+        # Long-text handling: overlapping token windows scored separately, max score per label kept
+        self.windowing = classifier_cfg.get("windowing", True)
+        self.max_tokens = classifier_cfg.get("max_tokens")          # None: the tokenizer's model_max_length
+        self.window_overlap = classifier_cfg.get("window_overlap", 64)
+        self.bucket_width = classifier_cfg.get("bucket_width", 32)  # tokens per padding bucket
         self.log_path = logging_cfg.get("log_path", "safeguard_flags.log")
         self.anonymize = logging_cfg.get("anonymize", True)
         self.classifier = None
+        self.batcher = None
+        self.cascade = None
+        self.worker_pool = None
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
 
         if self.enabled:
             try:
-                self.classifier = pipeline("text-classification", model=self.model_name)
+                # Shared per process: loaded and warmed up once, whatever the number of filters
+                self.classifier = (registry or default_registry).get(
+                    self.model_name,
+                    revision=self.revision,
+                    device=self.device,
+                    warmup_texts=classifier_cfg.get("warmup_texts"),
+                    precision=self.precision,
+                    quantized_cache_dir=classifier_cfg.get("quantized_cache_dir"),
+                )
             except Exception as e:
                 raise RuntimeError(f"Failed to load classifier pipeline '{self.model_name}': {e}")
 
+        # Resolved model identity (hub commit when known), part of the verdict cache fingerprint
+        model_config = getattr(getattr(self.classifier, "model", None), "config", None)
+        resolved = getattr(model_config, "_commit_hash", None) or self.revision or "main"
+        self.model_version = f"{self.model_name}@{resolved}/{self.precision}" if self.enabled else "disabled"
+
+        # Warn/block tiers compiled once, aligned with the model's label order when it is known
+        id2label = getattr(model_config, "id2label", None) or {}
+        self.compiled_thresholds = CompiledThresholds(
+            self.thresholds,
+            labels=[id2label[i] for i in sorted(id2label)],
+            normalize_label=_normalize_label,
+            flag_name="classifier_{label}",
+            reason="Classifier ({label}): {score:.2f} ≥ {threshold:.2f} ({tier})",
+        )
+
+        # Model loaded once here, then workers fork and share its weights copy-on-write (classifier.worker_pool)
+        pool_cfg = classifier_cfg.get("worker_pool") or {}
+        if self.enabled and pool_cfg.get("enabled", False):
+            self.worker_pool = ClassifierWorkerPool(
+                self._score_local,
+                workers=pool_cfg.get("workers", 2),
+                torch_threads=pool_cfg.get("torch_threads", 1),
+                timeout_ms=pool_cfg.get("timeout_ms", 30000),
+            )
+
+        # Concurrent single-text checks share padded forward passes (classifier.micro_batching)
+        if self.enabled and classifier_cfg.get("micro_batching", False):
+            self.batcher = MicroBatcher(
+                self.score_texts,
+                max_batch_size=classifier_cfg.get("max_batch_size", 16),
+                max_wait_ms=classifier_cfg.get("max_wait_ms", 5),
+            )
+
+        # Cheap first tier: only texts in its uncertainty band reach the full model (classifier.cascade)
+        if self.enabled:
+            try:
+                self.cascade = build_cascade(classifier_cfg.get("cascade"), registry)
+            except Exception as e:
+                raise RuntimeError(f"Failed to build classifier cascade: {e}")
+
     def check(self, text: str, source: str = "input"):
         """
         Run text classification and compare scores to configured warn/block thresholds.
@@ -49,59 +120,188 @@ class ClassifierFilter:
             text (str): Text to classify.
             source (str): Source label for audit/logging ("input" or "output").
         Returns:
-            dict: {
-                allowed (bool): False if any block tier triggered.
-                flags (list): List of dicts with flag info: {"name": str, "score": float, "tier": "warn"|"block"}
-                reasons (list): Human-readable reasons for block/flag.
-            }
+            allowed (bool): False if any block tier triggered.
+            flags (list): List of dicts with flag info: {"name": str, "score": float, "tier": "warn"|"block"}
+            reasons (list): Human-readable reasons for block/flag.
+        """
+        allowed, flags, reasons, _ = self.check_detailed(text, source)
+        return allowed, flags, reasons
+
+    def check_detailed(self, text: str, source: str = "input"):
+        """
+        check() plus a details dict for the audit context.
+        With the cascade enabled, details report which tier decided:
+        {"decided_by": "fast"|"full", "fast_score": float}.
         """
         if not self.enabled or not self.classifier:
-            return {"allowed": True, "flags": [], "reasons": []}
+            return True, [], [], {}
 
+        details = {}
         try:
-            result = self.classifier(text)
+            if self.cascade is not None:
+                started = time.perf_counter()
+                verdict, fast_score = self.cascade.triage([text])[0]
+                self.cascade.record("fast", 1 if verdict is not None else 0, time.perf_counter() - started)
+                details = {"decided_by": "fast" if verdict is not None else "full", "fast_score": fast_score}
+                if verdict is not None:
+                    return (*verdict, details)
+
+            started = time.perf_counter()
+            if self.batcher is not None:
+                result = self.batcher.predict(text)
+            else:
+                result = self.score_texts([text])[0]
+            if self.cascade is not None:
+                self.cascade.record("full", 1, time.perf_counter() - started)
         except Exception as e:
             raise RuntimeError(f"Classifier inference failed: {e}")
 
-        flags = []
-        reasons = []
-        blocked = False
-
-        for r in result:
-            label = r['label'].lower().replace(" ", "_")
-            score = r['score']
-
-            # Get tiered thresholds from config
-            thresh_config = self.thresholds.get(label, {})
-            warn_thresh = thresh_config.get("warn", 0.5)  # default warn threshold
-            block_thresh = thresh_config.get("block", 0.7)  # default block threshold
-
-            tier = None
-            if score >= block_thresh:
-                tier = "block"
-                blocked = True
-            elif score >= warn_thresh:
-                tier = "warn"
-
-            if tier:
-                flags.append({
-                    "name": f"classifier_{label}",
-                    "score": score,
-                    "tier": tier
-                })
-                reasons.append(f"Classifier ({label}): {score:.2f} ≥ {warn_thresh if tier=='warn' else block_thresh:.2f} ({tier})")
-
-        allowed = not blocked
-        return allowed, flags, reasons
+        return (*self._evaluate(result), details)
+
+    def score_texts(self, texts: List[str]) -> List[list]:
+        """
+        Label scores for each text: [[{"label", "score"}, ...], ...], in input order.
+        Texts longer than the model's window are split into overlapping token windows and
+        every window is scored (max per label), so long outputs are fully covered.
+        All windows are sorted into length buckets before batching to minimise padding.
+        With the worker pool enabled, scoring runs in the forked workers (large batches split across them).
+        """
+        self.batch_sizes.observe(len(texts))
+        if self.worker_pool is not None:
+            return self.worker_pool.map(texts, chunk_size=self.batch_size)
+        return self._score_local(texts)
+
+    def _score_local(self, texts: List[str]) -> List[list]:
+        """
+        score_texts() in the current process (what each pool worker runs).
+        """
+        tokenizer = getattr(self.classifier, "tokenizer", None)
+        pieces, owners, lengths = [], [], []
+        if self.windowing and tokenizer is not None:
+            window = self._window_tokens(tokenizer)
+            encoded = tokenizer(list(texts), add_special_tokens=False, truncation=False)["input_ids"]
+            for owner, (text, ids) in enumerate(zip(texts, encoded)):
+                if len(ids) <= window:
+                    pieces.append(text)
+                    owners.append(owner)
+                    lengths.append(len(ids))
+                    continue
+                for start, end in plan_windows(len(ids), window, self.window_overlap):
+                    pieces.append(tokenizer.decode(ids[start:end]))
+                    owners.append(owner)
+                    lengths.append(end - start)
+        else:
+            # No tokenizer available: ~4 characters per token as the padding proxy
+            pieces = list(texts)
+            owners = list(range(len(texts)))
+            lengths = [len(t) // 4 for t in texts]
+
+        # Safeguard: a decoded window can re-tokenize longer than it was, so the model limit is enforced again
+        limit_kwargs = {}
+        if tokenizer is not None:
+            limit_kwargs = {"truncation": True, "max_length": self._model_limit(tokenizer)}
+        piece_results = [None] * len(pieces)
+        for batch in length_buckets(lengths, self.bucket_width, self.batch_size):
+            outputs = self.classifier([pieces[i] for i in batch], batch_size=len(batch), **limit_kwargs)
+            for i, r in zip(batch, outputs):
+                # A list input yields one prediction (dict, or list of dicts with top_k) per text
+                piece_results[i] = r if isinstance(r, list) else [r]
+
+        per_text = [[] for _ in texts]
+        for owner, result in zip(owners, piece_results):
+            per_text[owner].append(result)
+        return [windows[0] if len(windows) == 1 else max_per_label(windows) for windows in per_text]
+
+    def _model_limit(self, tokenizer) -> int:
+        """
+        Tokens per forward pass, special tokens included (classifier.max_tokens or the tokenizer's limit).
+        """
+        limit = self.max_tokens or getattr(tokenizer, "model_max_length", 512)
+        if not limit or limit > 100_000:  # HF uses a huge sentinel when the limit is unknown
+            limit = 512
+        return limit
+
+    def _window_tokens(self, tokenizer) -> int:
+        """
+        Content tokens per window: the model limit minus the special tokens the tokenizer adds.
+        """
+        limit = self._model_limit(tokenizer)
+        special = tokenizer.num_special_tokens_to_add() if hasattr(tokenizer, "num_special_tokens_to_add") else 2
+        return max(1, limit - special)
+
+    def check_batch(self, texts: List[str], sources: List[str]):
+        """
+        Batch variant of check(): length-bucketed batched forward passes over all texts.
+        Returns a list of (allowed, flags, reasons), in input order.
+        """
+        return [r[:3] for r in self.check_batch_detailed(texts, sources)]
+
+    def check_batch_detailed(self, texts: List[str], sources: List[str]):
+        """
+        check_batch() plus per-text details (see check_detailed).
+        With the cascade enabled, only the escalated texts go through the full model.
+        """
+        if not self.enabled or not self.classifier:
+            return [(True, [], [], {}) for _ in texts]
+        if not texts:
+            return []
+
+        out = [None] * len(texts)
+        escalated = list(range(len(texts)))
+        try:
+            if self.cascade is not None:
+                started = time.perf_counter()
+                escalated = []
+                for i, (verdict, fast_score) in enumerate(self.cascade.triage(texts)):
+                    if verdict is None:
+                        escalated.append(i)
+                        out[i] = {"decided_by": "full", "fast_score": fast_score}
+                    else:
+                        out[i] = (*verdict, {"decided_by": "fast", "fast_score": fast_score})
+                self.cascade.record("fast", len(texts) - len(escalated), time.perf_counter() - started)
+
+            started = time.perf_counter()
+            results = self.score_texts([texts[i] for i in escalated]) if escalated else []
+            if self.cascade is not None and escalated:
+                self.cascade.record("full", len(escalated), time.perf_counter() - started)
+        except Exception as e:
+            raise RuntimeError(f"Classifier inference failed: {e}")
+
+        # Whole batch tiered as one score matrix; reasons built only for rows that tripped
+        for i, verdict in zip(escalated, self.compiled_thresholds.evaluate(results)):
+            out[i] = (*verdict, out[i] or {})
+        return out
+
+    def close(self):
+        """
+        Stop the micro-batcher thread and the worker processes, if any.
+        """
+        if self.batcher is not None:
+            self.batcher.close()
+        if self.worker_pool is not None:
+            self.worker_pool.close()
+
+    def _evaluate(self, result):
+        """
+        Compare one text's label scores to the warn/block tiers.
+        """
+        return self.compiled_thresholds.evaluate([result])[0]
+
+def _normalize_label(label: str) -> str:
+    return label.lower().replace(" ", "_")
 
 # --- Classic API for legacy/tests only; not for orchestrator
 def classifier_filter(text: str, source: str = "input", config: dict = None) -> ClassifierResult:
     """
     Returns a ClassifierResult object, for compatibility/testing only.
     Config must be passed explicitly—no fallback.
+    Runs the shared engine's classifier for this config (never a filter of its own, whose worker pool or
+    micro-batcher would outlive the call); allowed when the config's filter chain has no classifier.
     """
     if config is None:
         raise ValueError("Config must be provided to classifier_filter (no default allowed).")
-    allowed, _, reasons = ClassifierFilter(config).check(text, source)
+    from safeguarding.core.engine import get_engine  # the engine builds this module's filters
+    classifier = get_engine(config).classifier
+    allowed, _, reasons = classifier.check(text, source) if classifier is not None else (True, [], [])
     return ClassifierResult(score=1.0 if allowed else 0.0, blocked=not allowed, reasons=reasons)
 
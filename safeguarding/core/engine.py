@@ -0,0 +1,1079 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from functools import lru_cache, partial
+from typing import Optional
+
+from safeguarding.core.filter_registry import build_chain
+from safeguarding.core.cache_backends import build_cache_backend
+from safeguarding.core.metrics import OutcomeCounters
+from safeguarding.core.perspective_api_filter import UNAVAILABLE_REASON
+from safeguarding.core.timing import StageHistograms, StageTimer
+from safeguarding.core.evaluation import (
+    EVALUATION_POLICIES, FILTER_EXECUTION_MODES, TIMEOUT_POLICIES, FilterCostTracker
+)
+from safeguarding.core.verdict_cache import VerdictCache
+from safeguarding.utils.override_checker import check_override, load_override_phrases
+from safeguarding.utils.config_loader import load_config
+from safeguarding.utils.audit_record import AUDIT_MODES, AuditRecord
+from safeguarding.utils.logger import build_entry, log_entries
+from safeguarding.utils.log_rotation import configure_rotation
+from safeguarding.utils.log_sampling import build_sampler
+from safeguarding.utils.log_writer import WRITER_MODES, open_writer
+from safeguarding.utils.serializer import use_backend as use_json_backend
+
+from safeguarding.hooks.pre_process_hook import pre_process
+from safeguarding.hooks.post_process_hook import post_process
+
+
+def config_fingerprint(config: dict) -> str:
+    """
+    Stable hash of a config dict, used to key engines (and anything cached per rule set).
+    """
+    blob = json.dumps(config, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class SafeguardEngine:
+    """
+    Long-lived safeguard pipeline, built once from a Trinity config dict.
+    Holds the configured filter chain (compiled keyword/regex rules, loaded classifier, ...) and the
+    override phrases, so each call only pays for the actual scan/inference.
+    Safe to share between threads: filters keep no per-call state.
+    """
+    def __init__(self, config: dict):
+        """
+        Args:
+            config (dict): Config dict to build the engine from (required).
+        """
+        if config is None:
+            raise ValueError("Config must be provided to SafeguardEngine (no default allowed).")
+        self.config = config
+        self.fingerprint = config_fingerprint(config)
+
+        logging_cfg = self.config.get("logging", {})
+        self.log_path = logging_cfg.get("log_path", "safeguard_flags.log")
+        self.anonymize = logging_cfg.get("anonymize", True)
+        # logging.audit_mode "consolidated": one audit record per request instead of override/flag/outcome lines
+        self.audit_mode = logging_cfg.get("audit_mode", "legacy")
+        if self.audit_mode not in AUDIT_MODES:
+            raise ValueError(f"Unknown logging.audit_mode {self.audit_mode!r}; expected one of {AUDIT_MODES}.")
+        # logging.json_backend: record encoder for log_path ("json" default; "auto": orjson when installed)
+        if "json_backend" in logging_cfg:
+            use_json_backend(self.log_path, logging_cfg["json_backend"])
+        # logging.sampling: per-outcome share of audit entries written (e.g. all blocks, 1% of allows)
+        self.sampler = build_sampler(logging_cfg)
+        # logging.writer.mode "background": audit entries for log_path go through a batching writer thread
+        writer_cfg = dict(logging_cfg.get("writer") or {})
+        writer_mode = writer_cfg.pop("mode", "sync")
+        if writer_mode not in WRITER_MODES:
+            raise ValueError(f"Unknown logging.writer.mode {writer_mode!r}; expected one of {WRITER_MODES}.")
+
+        # --- Built once: override phrases and the declared filter chain (config "filters").
+        #     Before any of the engine's background threads start: classifier.worker_pool forks here.
+        self.override_data = load_override_phrases(config)
+        chain = build_chain(config)
+        self.filters = [(spec.name, flt) for spec, flt in chain]
+        self.filter_groups = {spec.name: spec.group for spec, _ in chain}
+        named = dict(self.filters)
+        self.keyword = named.get("keyword")
+        self.classifier = named.get("classifier")
+
+        # --- Log threads only now that the chain (and any forked classifier workers) exists
+        # logging.rotation: roll log_path into gzipped segments by size/age, with retention (shared per file)
+        rotation_cfg = dict(logging_cfg.get("rotation") or {})
+        if rotation_cfg.pop("enabled", False):
+            configure_rotation(self.log_path, **rotation_cfg)
+        self.log_writer = open_writer(self.log_path, **writer_cfg) if writer_mode == "background" else None
+
+        # --- Bounded executor for CPU-bound filters on the async path (created on first use)
+        concurrency_cfg = self.config.get("concurrency", {})
+        self.max_workers = concurrency_cfg.get("max_workers", 4)
+        # "sequential" (latency = sum of filters) or "concurrent" (latency ~ slowest filter)
+        self.filter_execution = concurrency_cfg.get("filter_execution", "sequential")
+        if self.filter_execution not in FILTER_EXECUTION_MODES:
+            raise ValueError(
+                f"Unknown concurrency.filter_execution {self.filter_execution!r}; expected one of {FILTER_EXECUTION_MODES}."
+            )
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+        # --- evaluation.policy: "exhaustive" runs every filter (full audit trail), "short_circuit" runs
+        #     filters cheapest-measured-first and stops at the first block
+        evaluation_cfg = self.config.get("evaluation", {})
+        self.evaluation_policy = evaluation_cfg.get("policy", "exhaustive")
+        if self.evaluation_policy not in EVALUATION_POLICIES:
+            raise ValueError(
+                f"Unknown evaluation.policy {self.evaluation_policy!r}; expected one of {EVALUATION_POLICIES}."
+            )
+        self.filter_costs = FilterCostTracker(evaluation_cfg.get("cost_alpha", 0.2))
+        for spec, _ in chain:
+            if spec.cost_hint_ms is not None:
+                self.filter_costs.seed(spec.name, spec.cost_hint_ms / 1000.0)
+
+        # --- Latency budget: deadline.default_ms (per-call deadline_ms overrides), and what a filter
+        #     that cannot finish in time counts as (fail_open: allow, fail_closed: block)
+        deadline_cfg = self.config.get("deadline", {})
+        self.default_deadline_ms = deadline_cfg.get("default_ms")
+        self.default_on_timeout = deadline_cfg.get("default_on_timeout", "fail_open")
+        self.on_timeout = deadline_cfg.get("on_timeout", {})
+        for policy in [self.default_on_timeout, *self.on_timeout.values()]:
+            if policy not in TIMEOUT_POLICIES:
+                raise ValueError(f"Unknown deadline timeout policy {policy!r}; expected one of {TIMEOUT_POLICIES}.")
+
+        # --- Per-stage latency: histograms per process (timing.histograms), per-result "timings" on request
+        timing_cfg = self.config.get("timing", {})
+        self.include_timings = timing_cfg.get("include_in_result", False)
+        self.stage_timings = StageHistograms() if timing_cfg.get("histograms", True) else None
+        self.outcomes = OutcomeCounters()
+
+        # --- Repeated texts skip the filters entirely (verdict_cache.enabled; backend memory|redis)
+        cache_cfg = self.config.get("verdict_cache", {})
+        self.verdict_cache = None
+        if cache_cfg.get("enabled", False):
+            self.verdict_cache = VerdictCache(
+                self.verdict_fingerprint(),
+                ttl_seconds=cache_cfg.get("ttl_seconds", 300),
+                backend=build_cache_backend(cache_cfg),
+            )
+
+    def verdict_fingerprint(self) -> str:
+        """
+        Identity of everything a cached verdict depends on: the config (rules, thresholds, model name)
+        plus the loaded model's resolved version, so a new rule set or model never serves stale verdicts.
+        """
+        versions = [getattr(flt, "model_version", "") for _, flt in self.filters]
+        blob = "\x00".join([self.fingerprint, *versions])
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def run(
+        self,
+        text: str,
+        source: str = "input",
+        user_id: str = "anon",
+        session_id: str = "anon_session",
+        context: dict = None,
+        log_path: str = None,
+        anonymize: bool = None,
+        deadline_ms: float = None,
+    ) -> dict:
+        """
+        Run the full safeguard pipeline for one text (see run_all_filters for the contract).
+        log_path/anonymize/deadline_ms fall back to the engine's config when not given.
+        """
+        timer = StageTimer()
+        deadline_ms, deadline = self._deadline(deadline_ms)
+        log_path = log_path if log_path is not None else self.log_path
+        anonymize = anonymize if anonymize is not None else self.anonymize
+
+        context = context or {}
+        # --- Step 0: Pre-process hook (input sanitization/enrichment)
+        text, context = pre_process(text, context)
+        timer.lap("pre_process")
+        record = self._audit_record()
+
+        try:
+            # --- Step 1: Check for parent/moderator override
+            override_used, override_role, cleaned_text = check_override(
+                text,
+                override_data=self.override_data,
+                log_path=log_path,
+                anonymize=anonymize,
+                collect=record.override_entries if record is not None else None
+            )
+            timer.lap("override")
+
+            # --- Step 2: Run all core filters on cleaned input (or reuse a cached verdict)
+            verdicts, cache_status = self._cached_verdicts(cleaned_text, source)
+            if cache_status == "hit" and record is None:
+                self._log_cached_verdicts(cleaned_text, source, verdicts)
+            timer.lap("cache")
+            if verdicts is None:
+                verdicts = self._evaluate(cleaned_text, source, deadline, timer)
+                timer.lap("filters")
+                self._cache_verdicts(cleaned_text, source, verdicts)
+                timer.lap("cache")
+
+            return self._finish(
+                text, source, user_id, session_id, context, log_path, anonymize,
+                override_used, override_role, verdicts, cache_status=cache_status, deadline_ms=deadline_ms,
+                timer=timer, record=record
+            )
+
+        except Exception as e:
+            # --- Step 6: Always log unexpected errors for forensics and traceability
+            self._log_error(e, text, source, user_id, session_id, context, log_path, anonymize, record=record)
+            # Raise for upstream handling or crash reporting
+            raise
+
+    async def arun(
+        self,
+        text: str,
+        source: str = "input",
+        user_id: str = "anon",
+        session_id: str = "anon_session",
+        context: dict = None,
+        log_path: str = None,
+        anonymize: bool = None,
+        deadline_ms: float = None,
+    ) -> dict:
+        """
+        Async variant of run() that never blocks the event loop.
+        CPU-bound filters (and log I/O) run in the engine's bounded thread pool;
+        filters exposing an async acheck() (network filters) are awaited natively.
+        """
+        timer = StageTimer()
+        deadline_ms, deadline = self._deadline(deadline_ms)
+        log_path = log_path if log_path is not None else self.log_path
+        anonymize = anonymize if anonymize is not None else self.anonymize
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+
+        context = context or {}
+        # --- Step 0: Pre-process hook (input sanitization/enrichment)
+        text, context = pre_process(text, context)
+        timer.lap("pre_process")
+        record = self._audit_record()
+
+        try:
+            # --- Step 1: Override check (writes the override audit entry, so off-loop, unless it is only collected)
+            if record is not None:
+                override_used, override_role, cleaned_text = check_override(
+                    text,
+                    override_data=self.override_data,
+                    anonymize=anonymize,
+                    collect=record.override_entries
+                )
+            else:
+                override_used, override_role, cleaned_text = await loop.run_in_executor(
+                    executor,
+                    partial(
+                        check_override,
+                        text,
+                        override_data=self.override_data,
+                        log_path=log_path,
+                        anonymize=anonymize
+                    )
+                )
+            timer.lap("override")
+
+            # --- Step 2: Run all filters without blocking the loop (or reuse a cached verdict)
+            if self.verdict_cache is not None and self.verdict_cache.blocking:
+                verdicts, cache_status = await loop.run_in_executor(
+                    executor, self._cached_verdicts, cleaned_text, source
+                )
+            else:
+                verdicts, cache_status = self._cached_verdicts(cleaned_text, source)
+            if cache_status == "hit" and record is None:
+                await loop.run_in_executor(executor, self._log_cached_verdicts, cleaned_text, source, verdicts)
+            timer.lap("cache")
+            if verdicts is None:
+                verdicts = await self._aevaluate(cleaned_text, source, executor, deadline, timer)
+                timer.lap("filters")
+                if self.verdict_cache is not None and self.verdict_cache.blocking:
+                    await loop.run_in_executor(executor, self._cache_verdicts, cleaned_text, source, verdicts)
+                else:
+                    self._cache_verdicts(cleaned_text, source, verdicts)
+                timer.lap("cache")
+
+            # --- Steps 3-5: audit write + post-process hook, off-loop
+            return await loop.run_in_executor(
+                executor,
+                partial(
+                    self._finish,
+                    text, source, user_id, session_id, context, log_path, anonymize,
+                    override_used, override_role, verdicts,
+                    endpoint="arun_all_filters", cache_status=cache_status, deadline_ms=deadline_ms,
+                    timer=timer, record=record
+                )
+            )
+
+        except Exception as e:
+            await loop.run_in_executor(
+                executor,
+                partial(self._log_error, e, text, source, user_id, session_id, context, log_path, anonymize,
+                        traceback.format_exc(), "arun_all_filters", record)
+            )
+            raise
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="safeguard"
+                    )
+        return self._executor
+
+    def shutdown(self):
+        """
+        Release the engine's worker threads and any filter workers (safe to call more than once).
+        The engine should not be used afterwards.
+        """
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        for _, flt in self.filters:
+            if hasattr(flt, "close"):
+                flt.close()
+        if self.verdict_cache is not None:
+            self.verdict_cache.close()
+        if self.log_writer is not None:
+            # Shared with other engines logging to the same file: flushed, not closed (closed at exit)
+            self.log_writer.flush()
+
+    def _log_error(
+        self, error, text, source, user_id, session_id, context, log_path, anonymize,
+        tb: str = None, endpoint: str = "run_all_filters", record: AuditRecord = None
+    ):
+        self.outcomes.record("error")
+        keep, sample_rate = self._sample("error")
+        if not keep:
+            return
+        if sample_rate is not None:
+            context = {**context, "sample_rate": sample_rate}
+        entry = build_entry(
+            text=text,
+            status="error",
+            flags=[],
+            reasons=["filter_exception"],
+            override_used=False,
+            override_role=None,
+            source=source,
+            anonymize=anonymize,
+            user_id=user_id,
+            session_id=session_id,
+            action_type="error",
+            error=str(error),
+            context={
+                **context,
+                "traceback": tb or traceback.format_exc(),
+                "endpoint": endpoint
+            }
+        )
+        log_entries([record.attach(entry) if record is not None else entry], log_path)
+
+    def _sample(self, status: str, override_used: bool = False, flags: list = (), override_attempted: bool = False,
+                degraded: bool = False) -> tuple:
+        """
+        (keep, sample_rate) for this outcome's audit entry; always kept when logging.sampling is off.
+        """
+        if self.sampler is None:
+            return True, None
+        return self.sampler.sample(status, override_used, flags, override_attempted, degraded)
+
+    def _audit_record(self) -> Optional[AuditRecord]:
+        return AuditRecord() if self.audit_mode == "consolidated" else None
+
+    def run_batch(
+        self,
+        items: list,
+        source: str = "input",
+        user_id: str = "anon",
+        session_id: str = "anon_session",
+        context: dict = None,
+        log_path: str = None,
+        anonymize: bool = None,
+        deadline_ms: float = None,
+    ) -> list:
+        """
+        Run the pipeline over many texts at once; returns one result dict per item, in order.
+        Items are either plain strings or dicts with "text" and optional per-item
+        "source"/"user_id"/"session_id"/"context" (the keyword arguments are the defaults).
+        Filters run through their check_batch() (tight keyword loop, one batched classifier pass)
+        and all audit entries are written in one bulk append.
+        deadline_ms bounds the whole batch.
+        """
+        deadline_ms, deadline = self._deadline(deadline_ms)
+        log_path = log_path if log_path is not None else self.log_path
+        anonymize = anonymize if anonymize is not None else self.anonymize
+        defaults = {"source": source, "user_id": user_id, "session_id": session_id, "context": context}
+        requests = [_batch_item(item, defaults) for item in items]
+        pending_logs = []
+        timer = StageTimer()
+
+        try:
+            # --- Steps 0-1 per item: pre-process hook and override check (log entries collected)
+            prepared = []
+            records = []
+            for req in requests:
+                text, ctx = pre_process(req["text"], dict(req["context"] or {}))
+                record = self._audit_record()
+                override_used, override_role, cleaned_text = check_override(
+                    text,
+                    override_data=self.override_data,
+                    anonymize=anonymize,
+                    collect=record.override_entries if record is not None else pending_logs
+                )
+                prepared.append((req, text, ctx, override_used, override_role, cleaned_text))
+                records.append(record)
+            timer.lap("override")
+
+            # --- Step 2: cached verdicts first (one multi-get), then each filter sees the remaining texts at once
+            cleaned_texts = [p[5] for p in prepared]
+            sources = [p[0]["source"] for p in prepared]
+            if self.verdict_cache is not None:
+                verdicts = self.verdict_cache.get_many(cleaned_texts, sources)
+                cache_statuses = ["miss" if v is None else "hit" for v in verdicts]
+            else:
+                verdicts = [None] * len(prepared)
+                cache_statuses = [None] * len(prepared)
+            misses = [i for i, v in enumerate(verdicts) if v is None]
+            for i, status in enumerate(cache_statuses):
+                if status == "hit" and records[i] is None:
+                    self._log_cached_verdicts(cleaned_texts[i], sources[i], verdicts[i], collect=pending_logs)
+            timer.lap("cache")
+            if misses:
+                computed = self._evaluate_batch(
+                    [cleaned_texts[i] for i in misses], [sources[i] for i in misses], deadline, timer,
+                    collect=pending_logs
+                )
+                for i, item_verdicts in zip(misses, computed):
+                    verdicts[i] = item_verdicts
+                timer.lap("filters")
+                if self.verdict_cache is not None:
+                    self.verdict_cache.put_many([
+                        (cleaned_texts[i], sources[i], verdicts[i]) for i in misses if _cacheable(verdicts[i])
+                    ])
+                timer.lap("cache")
+
+            # --- Steps 3-5 per item, audit entries collected for a single write
+            results = []
+            for i, (req, text, ctx, override_used, override_role, _) in enumerate(prepared):
+                results.append(self._finish(
+                    text, req["source"], req["user_id"], req["session_id"], ctx, log_path, anonymize,
+                    override_used, override_role, verdicts[i],
+                    collect=pending_logs, endpoint="run_all_filters_batch", cache_status=cache_statuses[i],
+                    deadline_ms=deadline_ms, record=records[i]
+                ))
+            timer.lap("merge")
+
+            log_entries(pending_logs, log_path)
+            timer.lap("logging")
+            if self.stage_timings is not None:
+                self.stage_timings.record(timer.finish(), prefix="batch.")
+            return results
+
+        except Exception as e:
+            # --- Persist whatever was collected plus the batch error, then re-raise
+            self.outcomes.record("error")
+            pending_logs.append(build_entry(
+                text="",
+                status="error",
+                flags=[],
+                reasons=["filter_exception"],
+                source=source,
+                anonymize=anonymize,
+                user_id=user_id,
+                session_id=session_id,
+                action_type="error",
+                error=str(e),
+                context={
+                    **(context or {}),
+                    "batch_size": len(requests),
+                    "traceback": traceback.format_exc(),
+                    "endpoint": "run_all_filters_batch"
+                }
+            ))
+            log_entries(pending_logs, log_path)
+            raise
+
+    def _cached_verdicts(self, text: str, source: str) -> tuple:
+        """
+        (verdicts, cache_status): cached per-filter [(result, details), ...] or None on a miss;
+        status is "hit"/"miss", or None when the cache is disabled.
+        """
+        if self.verdict_cache is None:
+            return None, None
+        verdicts = self.verdict_cache.get(text, source)
+        return verdicts, ("miss" if verdicts is None else "hit")
+
+    def _log_cached_verdicts(self, text: str, source: str, verdicts: list, collect: list = None):
+        """
+        Legacy audit mode, verdict cache hit: filters that write their own entries when they run (keyword flag
+        lines) write them from the cached verdict, so the log does not depend on whether the verdict was cached.
+        """
+        for (_, flt), verdict in zip(self.filters, verdicts):
+            if verdict is not None and hasattr(flt, "log_verdict"):
+                flt.log_verdict(text, source, verdict[0], collect=collect)
+
+    def _cache_verdicts(self, text: str, source: str, verdicts: list):
+        # Transient verdicts (deadline stand-ins, fail-open bypasses) are never cached
+        if self.verdict_cache is not None and _cacheable(verdicts):
+            self.verdict_cache.put(text, source, verdicts)
+
+    def _deadline(self, deadline_ms: float = None) -> tuple:
+        """
+        (deadline_ms, absolute perf_counter deadline or None) for a call starting now.
+        """
+        deadline_ms = deadline_ms if deadline_ms is not None else self.default_deadline_ms
+        if deadline_ms is None:
+            return None, None
+        return deadline_ms, time.perf_counter() + float(deadline_ms) / 1000.0
+
+    def _run_filter(self, index: int, text: str, source: str, timer: StageTimer = None) -> tuple:
+        """
+        ((allowed, flags, reasons), details) from one filter, with its cost recorded
+        (and charged to the request's timer as "filter.<name>").
+        """
+        name, flt = self.filters[index]
+        started = time.perf_counter()
+        verdict = _check(flt, text, source)
+        self._observe(name, time.perf_counter() - started, 1, timer)
+        return verdict
+
+    def _run_filter_batch(
+        self, index: int, texts: list, sources: list, timer: StageTimer = None, collect: list = None
+    ) -> list:
+        name, flt = self.filters[index]
+        started = time.perf_counter()
+        verdicts = _check_batch(flt, texts, sources, collect)
+        self._observe(name, time.perf_counter() - started, len(texts), timer)
+        return verdicts
+
+    def _observe(self, name: str, seconds: float, count: int, timer: StageTimer = None):
+        self.filter_costs.observe(name, seconds, count)
+        if timer is not None:
+            timer.add(f"filter.{name}", seconds * 1000.0)
+
+    async def _arun_filter(
+        self, index: int, text: str, source: str, executor, timer: StageTimer = None, inline: bool = True
+    ) -> tuple:
+        """
+        Async _run_filter: acheck() awaited natively, "inline" group filters called on the loop
+        (cheap scans not worth a thread hop), anything else in the executor.
+        inline: False sends "inline" group filters to the executor too (under a deadline, so a cancelled
+        wait never leaves the loop blocked in a synchronous check).
+        """
+        name, flt = self.filters[index]
+        if not hasattr(flt, "acheck"):
+            if inline and self._group(index) == "inline":
+                return self._run_filter(index, text, source, timer)
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, self._run_filter, index, text, source, timer
+            )
+        started = time.perf_counter()
+        verdict = (await flt.acheck(text, source), {})
+        self._observe(name, time.perf_counter() - started, 1, timer)
+        return verdict
+
+    def _evaluate(self, text: str, source: str, deadline: float = None, timer: StageTimer = None) -> list:
+        """
+        Per-filter verdicts for one text, aligned with self.filters (None = skipped).
+        Concurrent mode runs "inline" group filters in this thread and the others in the thread pool;
+        with short_circuit, a block stops waiting for the rest (not-yet-started ones are cancelled).
+        deadline (perf_counter time): filters that cannot finish in time get their timeout verdict.
+        """
+        verdicts = [None] * len(self.filters)
+        order = self._evaluation_order()
+        if self.filter_execution == "sequential" or len(order) < 2:
+            for i in order:
+                verdicts[i] = self._within_budget(i, deadline, self._run_filter, i, text, source, timer)
+                if self._stop_after(verdicts[i]):
+                    break
+            return verdicts
+
+        # Without a deadline "inline" group filters run in the caller's thread; with one, everything goes
+        # through the pool so nothing can hold the caller past the budget
+        executor = self._get_executor()
+        inline = [i for i in order if self._group(i) == "inline"] if deadline is None else []
+        futures = {executor.submit(self._run_filter, i, text, source, timer): i for i in order if i not in inline}
+        blocked = False
+        for i in inline:
+            verdicts[i] = self._run_filter(i, text, source, timer)
+            blocked = blocked or self._stop_after(verdicts[i])
+        pending = set(futures)
+        while pending and not blocked:
+            timeout = None if deadline is None else deadline - time.perf_counter()
+            if timeout is not None and timeout <= 0:
+                break
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                verdicts[futures[future]] = future.result()
+                blocked = blocked or self._stop_after(verdicts[futures[future]])
+        for future in pending:
+            future.cancel()
+            if not blocked:
+                verdicts[futures[future]] = self._budget_verdict(futures[future], "timed_out")
+        return verdicts
+
+    async def _aevaluate(
+        self, text: str, source: str, executor, deadline: float = None, timer: StageTimer = None
+    ) -> list:
+        """
+        Async _evaluate: concurrent mode gathers all filters at once (HTTP filters awaited, CPU filters in
+        the pool); with short_circuit, the first block cancels whatever is still pending.
+        With a deadline, unfinished filters are cancelled and get their timeout verdict.
+        """
+        verdicts = [None] * len(self.filters)
+        order = self._evaluation_order()
+        if self.filter_execution == "sequential" or len(order) < 2:
+            for i in order:
+                if deadline is None:
+                    verdicts[i] = await self._arun_filter(i, text, source, executor, timer)
+                else:
+                    fits, remaining = self._fits(i, deadline)
+                    if not fits:
+                        verdicts[i] = self._budget_verdict(i, "skipped")
+                    else:
+                        try:
+                            verdicts[i] = await asyncio.wait_for(
+                                self._arun_filter(i, text, source, executor, timer, inline=False), timeout=remaining
+                            )
+                        except asyncio.TimeoutError:
+                            verdicts[i] = self._budget_verdict(i, "timed_out")
+                if self._stop_after(verdicts[i]):
+                    break
+            return verdicts
+
+        tasks = {
+            asyncio.ensure_future(self._arun_filter(i, text, source, executor, timer, inline=deadline is None)): i
+            for i in order
+        }
+        pending = set(tasks)
+        blocked = False
+        try:
+            while pending and not blocked:
+                timeout = None if deadline is None else deadline - time.perf_counter()
+                if timeout is not None and timeout <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    verdicts[tasks[task]] = task.result()
+                    blocked = blocked or self._stop_after(verdicts[tasks[task]])
+        finally:
+            for task in pending:
+                task.cancel()
+                if not blocked:
+                    verdicts[tasks[task]] = self._budget_verdict(tasks[task], "timed_out")
+        return verdicts
+
+    def _evaluate_batch(
+        self, texts: list, sources: list, deadline: float = None, timer: StageTimer = None, collect: list = None
+    ) -> list:
+        """
+        Per-text verdict lists (aligned with self.filters) for a batch; each filter takes its texts at once.
+        The deadline applies to the whole batch.
+        collect: log entries filters write themselves (legacy keyword flag lines) are appended here instead.
+        """
+        verdicts = [[None] * len(self.filters) for _ in texts]
+        if self.filter_execution == "concurrent":
+            executor = self._get_executor()
+            futures = {
+                executor.submit(self._run_filter_batch, f, texts, sources, timer, collect): f
+                for f in range(len(self.filters))
+            }
+            timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            done, pending = wait(futures, timeout=timeout)
+            for future in pending:
+                future.cancel()
+            for future, f in futures.items():
+                results = future.result() if future in done else self._budget_verdict(f, "timed_out", len(texts))
+                for k, verdict in enumerate(results):
+                    verdicts[k][f] = verdict
+            return verdicts
+
+        pending = list(range(len(texts)))
+        for f in self._evaluation_order():
+            if not pending:
+                break
+            results = self._within_budget(
+                f, deadline, self._run_filter_batch, f,
+                [texts[k] for k in pending], [sources[k] for k in pending], timer, collect,
+                count=len(pending)
+            )
+            for k, verdict in zip(pending, results):
+                verdicts[k][f] = verdict
+            # short_circuit: texts already blocked skip the remaining (more expensive) filters
+            pending = [k for k in pending if not self._stop_after(verdicts[k][f])]
+        return verdicts
+
+    def _group(self, index: int) -> str:
+        return self.filter_groups.get(self.filters[index][0], "pool")
+
+    def _fits(self, index: int, deadline: float, count: int = 1) -> tuple:
+        """
+        (fits, remaining_seconds): whether the filter's measured cost for `count` texts fits the budget left.
+        Filters never measured are given the chance (and bounded by the remaining time); skipping decays the
+        estimate (FilterCostTracker.skipped), so a filter that stops fitting is retried and re-measured later.
+        """
+        remaining = deadline - time.perf_counter()
+        estimate = self.filter_costs.cost(self.filters[index][0])
+        fits = remaining > 0 and (estimate is None or estimate * count <= remaining)
+        return fits, remaining
+
+    def _within_budget(self, index: int, deadline: float, fn, *args, count: int = None):
+        """
+        fn(*args) for filter `index`, bounded by the deadline: skipped if its measured cost no longer fits,
+        abandoned if it overruns (the caller gets the filter's fail-open/fail-closed verdict instead).
+        Always run in the pool: a cheap estimate is no guarantee, and only a future can be waited on with a timeout.
+        count: number of texts for batch calls (None: a single-text call).
+        """
+        if deadline is None:
+            return fn(*args)
+        fits, remaining = self._fits(index, deadline, count or 1)
+        if not fits:
+            return self._budget_verdict(index, "skipped", count)
+        future = self._get_executor().submit(fn, *args)
+        try:
+            return future.result(timeout=remaining)
+        except FuturesTimeout:
+            future.cancel()
+            return self._budget_verdict(index, "timed_out", count)
+
+    def _budget_verdict(self, index: int, outcome: str, count: int = None):
+        """
+        Stand-in verdict for a filter that did not run ("skipped") or finish ("timed_out") within the deadline:
+        fail_open allows, fail_closed blocks. details["deadline"] marks the request as degraded: the verdict
+        is never cached, and a degraded allow is audited unsampled (log_sampling "degraded" tier).
+        """
+        name = self.filters[index][0]
+        if outcome == "skipped":
+            self.filter_costs.skipped(name)
+        if self.on_timeout.get(name, self.default_on_timeout) == "fail_closed":
+            verdict = (
+                (False, [f"deadline_{name}"], [f"{name} did not complete within the latency budget (fail-closed)."]),
+                {"deadline": outcome, "on_timeout": "fail_closed"}
+            )
+        else:
+            verdict = ((True, [], []), {"deadline": outcome, "on_timeout": "fail_open"})
+        return verdict if count is None else [verdict] * count
+
+    def _evaluation_order(self) -> list:
+        """
+        Indices into self.filters in the order they should run for the current policy.
+        """
+        if self.evaluation_policy == "short_circuit":
+            return self.filter_costs.order([name for name, _ in self.filters])
+        return list(range(len(self.filters)))
+
+    def _stop_after(self, verdict) -> bool:
+        """
+        True when a definitive block makes the remaining filters unnecessary (short_circuit only).
+        """
+        return self.evaluation_policy == "short_circuit" and not verdict[0][0]
+
+    def _finish(
+        self, text, source, user_id, session_id, context, log_path, anonymize,
+        override_used, override_role, verdicts,
+        collect: list = None, endpoint: str = "run_all_filters", cache_status: str = None,
+        deadline_ms: float = None, timer: StageTimer = None, record: AuditRecord = None
+    ) -> dict:
+        """
+        Merge/dedupe filter output, write the audit entry and build the canonical result.
+        verdicts: per-filter ((allowed, flags, reasons), details), aligned with self.filters;
+        None for a filter skipped by short_circuit evaluation.
+        With collect, the audit entry is appended there instead of written.
+        With a deadline, the result also carries "degraded" and "filters_run".
+        timer: the request's StageTimer; its stages go to the histograms (and to result["timings"]
+        with timing.include_in_result).
+        record: the request's AuditRecord (consolidated audit mode), completed and written as the one entry.
+        """
+        # --- Step 3: Merge and deduplicate all flags/reasons from every filter that ran
+        all_allowed, flags, reasons = _merge(v[0] for v in verdicts if v is not None)
+        all_flags = _dedupe(flags)
+        all_reasons = _dedupe(reasons)
+        skipped = [name for (name, _), v in zip(self.filters, verdicts) if v is None]
+        degraded = {
+            name: v[1]["deadline"] for (name, _), v in zip(self.filters, verdicts)
+            if v is not None and "deadline" in v[1]
+        }
+        filters_run = [name for (name, _), v in zip(self.filters, verdicts) if v is not None and name not in degraded]
+
+        # --- Step 4: Log the outcome of this filter run (audit traceable)
+        audit_context = {
+            **context,
+            "filters": [name for name, _ in self.filters],
+            "endpoint": endpoint
+        }
+        filter_details = {name: v[1] for (name, _), v in zip(self.filters, verdicts) if v is not None and v[1]}
+        if filter_details:
+            audit_context["filter_details"] = filter_details
+        if skipped:
+            # Explains why e.g. no classifier score exists for this request
+            audit_context["skipped_filters"] = skipped
+            audit_context["evaluation_policy"] = self.evaluation_policy
+        if cache_status is not None:
+            audit_context["verdict_cache"] = cache_status
+        if deadline_ms is not None:
+            audit_context["deadline_ms"] = deadline_ms
+            audit_context["filters_run"] = filters_run
+            if degraded:
+                audit_context["degraded"] = degraded
+        status = "allowed" if (override_used or all_allowed) else "blocked"
+        self.outcomes.record(status, all_flags)
+        keep, sample_rate = self._sample(
+            status, override_used, all_flags, _override_attempted(record), degraded=not _cacheable(verdicts)
+        )
+        if sample_rate is not None:
+            audit_context["sample_rate"] = sample_rate
+        entry_fields = dict(
+            text=text,
+            status=status,
+            flags=all_flags,
+            reasons=all_reasons,
+            override_used=override_used,
+            override_role=override_role if override_used else None,
+            source=source,
+            anonymize=anonymize,
+            user_id=user_id,
+            session_id=session_id,
+            action_type="override" if override_used else ("allow" if all_allowed else "block"),
+            error=None,
+            context=audit_context
+        )
+        if timer is not None:
+            timer.lap("merge")
+        if keep:
+            entry = build_entry(**entry_fields)
+            if record is not None:
+                for (name, _), v in zip(self.filters, verdicts):
+                    if v is not None:
+                        record.add_filter(name, v[0])  # details stay in context["filter_details"]
+                record.attach(entry)
+            if collect is None:
+                log_entries([entry], log_path)
+            else:
+                collect.append(entry)
+        if timer is not None:
+            timer.lap("logging")
+
+        # --- Step 5: Return canonical result
+        result = {
+            "status": status,
+            "flags": all_flags,
+            "reasons": all_reasons,
+            "override": bool(override_used),
+            "role": override_role if override_used else None,
+        }
+        if deadline_ms is not None:
+            result["degraded"] = bool(degraded)
+            result["filters_run"] = filters_run
+        result, context = post_process(result, context)
+        if timer is not None:
+            timer.lap("post_process")
+            stages = timer.finish()
+            if self.stage_timings is not None:
+                self.stage_timings.record(stages)
+            if self.include_timings:
+                result["timings"] = stages
+        return result
+
+
+def _override_attempted(record: Optional[AuditRecord]) -> bool:
+    """
+    True if the request carried override phrases that were not granted (ambiguous match).
+    """
+    if record is None or not record.override_entries:
+        return False
+    return record.override_entries[-1]["reasons"] != ["no_match"]
+
+
+def _batch_item(item, defaults: dict) -> dict:
+    """
+    Normalise one run_batch item (str or dict) into a full request dict.
+    """
+    if isinstance(item, str):
+        return {**defaults, "text": item}
+    if "text" not in item:
+        raise ValueError("Batch items must be strings or dicts with a 'text' key.")
+    return {**defaults, **item}
+
+
+def _check(flt, text: str, source: str) -> tuple:
+    """
+    ((allowed, flags, reasons), details) for one filter; details are {} unless it has check_detailed().
+    """
+    if hasattr(flt, "check_detailed"):
+        allowed, flags, reasons, details = flt.check_detailed(text, source)
+        return (allowed, flags, reasons), details
+    return flt.check(text, source), {}
+
+
+def _check_batch(flt, texts: list, sources: list, collect: list = None) -> list:
+    """
+    [((allowed, flags, reasons), details), ...] for a batch, using the filter's batch API when it has one.
+    collect is passed to check_batch() when the filter accepts it (its own log entries go there, not to disk).
+    """
+    if hasattr(flt, "check_batch_detailed"):
+        return [(r[:3], r[3]) for r in flt.check_batch_detailed(texts, sources)]
+    if hasattr(flt, "check_batch"):
+        if collect is not None and _accepts_collect(type(flt)):
+            return [(r, {}) for r in flt.check_batch(texts, sources, collect=collect)]
+        return [(r, {}) for r in flt.check_batch(texts, sources)]
+    return [_check(flt, t, s) for t, s in zip(texts, sources)]
+
+
+@lru_cache(maxsize=None)
+def _accepts_collect(filter_type) -> bool:
+    try:
+        return "collect" in inspect.signature(filter_type.check_batch).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _degraded(verdicts: list) -> bool:
+    """
+    True if any filter's verdict is a deadline stand-in rather than a real result.
+    """
+    return any(v is not None and "deadline" in v[1] for v in verdicts)
+
+
+def _cacheable(verdicts: list) -> bool:
+    """
+    False for verdicts that reflect a transient condition rather than the text: a deadline stand-in, or a
+    filter that failed open because its backend was unavailable (caching it would bypass the filter for the TTL).
+    """
+    return not _degraded(verdicts) and not any(
+        v is not None and UNAVAILABLE_REASON in v[0][2] for v in verdicts
+    )
+
+
+def _merge(results) -> tuple:
+    """
+    Combine per-filter (allowed, flags, reasons) tuples into one.
+    """
+    all_allowed = True
+    flags = []
+    reasons = []
+    for allowed, f_flags, f_reasons in results:
+        all_allowed = all_allowed and allowed
+        flags += f_flags
+        reasons += f_reasons
+    return all_allowed, flags, reasons
+
+
+def _dedupe(items: list) -> list:
+    """
+    Order-preserving dedupe; classifier flags are dicts, so fall back to their JSON form as key.
+    """
+    seen = set()
+    out = []
+    for item in items:
+        key = item if isinstance(item, str) else json.dumps(item, sort_keys=True, default=str)
+        if key not in seen:
+            seen.add(key)
+            out.append(item)
+    return out
+
+
+# --- Process-wide engines: one default (from load_config) plus the most recently used distinct configs passed in
+MAX_CACHED_ENGINES = 4
+_default_engine: Optional[SafeguardEngine] = None
+_engines = OrderedDict()  # fingerprint -> engine, least recently used first
+_engine_lock = threading.Lock()
+
+
+def _cached_engine(config: Optional[dict]) -> Optional[SafeguardEngine]:
+    """
+    The cached engine for config, or None (caller holds _engine_lock). The config object an engine was built
+    from is matched by identity first, so a config loaded once is hashed once, not on every call.
+    """
+    if config is None:
+        return _default_engine
+    key = next((key for key, engine in _engines.items() if engine.config is config), None)
+    if key is None:
+        key = config_fingerprint(config)
+    engine = _engines.get(key)
+    if engine is not None:
+        _engines.move_to_end(key)
+    return engine
+
+
+def get_engine(config: dict = None) -> SafeguardEngine:
+    """
+    Return the shared engine for this config, building it on first use.
+    With config=None the default engine is built from load_config(). Engines for other configs are kept for
+    the MAX_CACHED_ENGINES most recently used ones; older ones are shut down (models, pools, threads released).
+    """
+    global _default_engine
+    evicted = []
+    with _engine_lock:
+        engine = _cached_engine(config)
+        if engine is None:
+            if config is None:
+                engine = _default_engine = SafeguardEngine(load_config())
+            else:
+                engine = SafeguardEngine(config)
+                _engines[engine.fingerprint] = engine
+                while len(_engines) > MAX_CACHED_ENGINES:
+                    evicted.append(_engines.popitem(last=False)[1])
+    for old in evicted:
+        old.shutdown()
+    return engine
+
+
+async def aget_engine(config: dict = None) -> SafeguardEngine:
+    """
+    get_engine for async callers: an engine not built yet is built in a worker thread, so the first request
+    does not stall the event loop on config loading, the filter chain and the model load.
+    """
+    with _engine_lock:
+        engine = _cached_engine(config)
+    if engine is None:
+        engine = await asyncio.get_running_loop().run_in_executor(None, get_engine, config)
+    return engine
+
+
+def live_engines() -> list:
+    """
+    Every engine built so far in this process (default first), e.g. for the metrics endpoint.
+    """
+    with _engine_lock:
+        return [e for e in [_default_engine, *_engines.values()] if e is not None]
+
+
+def reset_engines():
+    """
+    Drop all cached engines (config reload, tests). The next call rebuilds them.
+    """
+    global _default_engine
+    with _engine_lock:
+        for engine in [_default_engine, *_engines.values()]:
+            if engine is not None:
+                engine.shutdown()
+        _default_engine = None
+        _engines.clear()
+
+# --- NOTES FOR AUDIT/MAINTAINERS:
+# - Build engines once per process (or use get_engine); never instantiate filters per request.
+# - get_engine keeps at most MAX_CACHED_ENGINES non-default engines and shuts the least recently used down, so
+#   reloading a changed config does not leak the old engine. Treat a config dict as frozen once passed in
+#   (engines match it by identity before hashing it): load a new dict to change the rules.
+# - classifier.worker_pool forks while the filter chain is built, so it must exist before any background thread
+#   starts (log writer, rotation, executor): build an engine with a worker pool first, before other engines.
+# - Which filters run, in what order and execution group, comes from config "filters" (core/filter_registry.py).
+# - Engines are keyed by config fingerprint, so a changed config gets a fresh engine automatically.
+# - The engine keeps no per-request state: every request's audit context is passed explicitly.
+# - arun() is the event-loop-safe path: size the pool with concurrency.max_workers in config.
+# - Filters may expose check_detailed() returning a 4th "details" dict (e.g. which cascade tier decided);
+#   non-empty details are logged under context["filter_details"][filter_name].
+# - With verdict_cache.enabled, repeated texts reuse the filters' verdicts (never degraded or fail-open ones,
+#   see _cacheable); every request is still audited
+#   (context["verdict_cache"] = "hit"/"miss").
+# - evaluation.policy = "short_circuit" trades completeness for latency: filters skipped after a block
+#   are listed in context["skipped_filters"]. Use "exhaustive" when every score must be audited.
+# - concurrency.filter_execution = "concurrent" overlaps the filters of one request; size max_workers for
+#   (concurrent requests x filters), since each request may hold several pool threads at once.
+# - deadline_ms: filters whose measured cost no longer fits are skipped, overrunning ones abandoned (a thread
+#   already running a CPU filter still finishes in the background). deadline.on_timeout decides per filter
+#   whether that allows (fail_open) or blocks (fail_closed); the result is marked "degraded" either way.
+#   Under a deadline every filter runs in the pool (never inline), and each skip decays its cost estimate, so a
+#   filter knocked out by one slow call or a high cost_hint_ms is retried within a few requests.
+# - logging.audit_mode = "consolidated" writes one entry per request (override attempt and per-filter outcomes
+#   under entry["audit"], utils/audit_record.py); "legacy" keeps the separate override/flag/outcome lines.
+# - With logging.writer.mode = "background", audit writes for the engine's log_path are queued and batched
+#   (utils/log_writer.py); a per-call log_path override without its own writer is still appended synchronously.
+# - Every request is timed per stage (core/timing.py); engine.stage_timings holds the process's histograms
+#   (snapshot()/dump()), and timing.include_in_result adds the request's own "timings" (ms) to its result.
+# - With logging.sampling.enabled, only a share of each outcome tier's entries is written (utils/log_sampling.py);
+#   engine.sampler counts the dropped ones. Requests are still counted in engine.outcomes either way.
@@ -0,0 +1,68 @@
+import threading
+from typing import Dict, List
+
+EVALUATION_POLICIES = ("exhaustive", "short_circuit")
+FILTER_EXECUTION_MODES = ("sequential", "concurrent")
+TIMEOUT_POLICIES = ("fail_open", "fail_closed")
+
+
+class FilterCostTracker:
+    """
+    Exponentially weighted moving average of each filter's per-text cost (seconds).
+    Drives the short_circuit evaluation order: cheapest measured filter first,
+    filters never measured keep their configured position after the measured ones.
+    """
+    def __init__(self, alpha: float = 0.2):
+        """
+        Args:
+            alpha (float): Weight of the newest observation (0 < alpha <= 1).
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError(f"EWMA alpha must be in (0, 1], got {alpha!r}")
+        self.alpha = float(alpha)
+        self._costs = {}
+        self._seeded = set()
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float, count: int = 1):
+        """
+        Record one run of `name` that took `seconds` for `count` texts.
+        """
+        per_text = seconds / max(1, count)
+        with self._lock:
+            previous = None if name in self._seeded else self._costs.get(name)
+            self._seeded.discard(name)
+            self._costs[name] = per_text if previous is None else previous + self.alpha * (per_text - previous)
+
+    def skipped(self, name: str):
+        """
+        Record that `name` was skipped because its estimate did not fit a latency budget. The estimate decays
+        by the same weight as an observation of zero cost, so a filter is never shut out for good by one slow
+        call or a cost hint set too high: after a few skips it fits again, runs, and is re-measured.
+        """
+        with self._lock:
+            if name in self._costs:
+                self._costs[name] *= 1.0 - self.alpha
+
+    def seed(self, name: str, seconds: float):
+        """
+        Initial estimate (e.g. a configured cost hint), used until real measurements take over.
+        """
+        with self._lock:
+            if name not in self._costs:
+                self._costs[name] = float(seconds)
+                self._seeded.add(name)
+
+    def cost(self, name: str):
+        return self._costs.get(name)
+
+    def order(self, names: List[str]) -> List[int]:
+        """
+        Indices of `names` sorted cheapest first; unmeasured names keep their relative order, last.
+        """
+        costs = self._costs
+        return sorted(range(len(names)), key=lambda i: (names[i] not in costs, costs.get(names[i], 0.0)))
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._costs)
@@ -0,0 +1,100 @@
+import importlib
+from typing import Callable, Dict, List
+
+EXECUTION_GROUPS = ("inline", "pool", "io")
+
+# Chain used when the config has no "filters" section (the historical keyword -> classifier pipeline)
+DEFAULT_CHAIN = [
+    {"name": "keyword", "enabled": True, "order": 10, "cost_hint_ms": 0.05, "group": "inline"},
+    {"name": "classifier", "enabled": True, "order": 20, "cost_hint_ms": 40, "group": "pool"},
+    {"name": "perspective", "enabled": False, "order": 30, "cost_hint_ms": 150, "group": "io"},
+]
+
+_FILTER_TYPES: Dict[str, Callable] = {}
+
+
+def register_filter(name: str, factory: Callable = None):
+    """
+    Register a filter type under `name`; usable directly or as a class/function decorator.
+    factory(config, **options) must return an object with check(text, source) -> (allowed, flags, reasons)
+    (optionally check_batch/check_detailed/acheck/close).
+    """
+    def _register(f):
+        _FILTER_TYPES[name] = f
+        return f
+    return _register(factory) if factory is not None else _register
+
+
+def registered_filters() -> List[str]:
+    return sorted(_FILTER_TYPES)
+
+
+def _resolve_factory(filter_type: str) -> Callable:
+    """
+    A registered name, or "package.module:Factory" for filters living outside this package.
+    """
+    if filter_type in _FILTER_TYPES:
+        return _FILTER_TYPES[filter_type]
+    if ":" in filter_type:
+        module_name, attr = filter_type.split(":", 1)
+        return getattr(importlib.import_module(module_name), attr)
+    raise ValueError(f"Unknown filter type {filter_type!r}; registered: {registered_filters()}.")
+
+
+class FilterSpec:
+    """
+    One entry of the declarative filter chain (config "filters").
+    """
+    def __init__(self, name: str, type: str = None, enabled: bool = True, order: int = 0,
+                 cost_hint_ms: float = None, group: str = "pool", options: dict = None, position: int = 0):
+        if group not in EXECUTION_GROUPS:
+            raise ValueError(f"Filter {name!r}: unknown group {group!r}; expected one of {EXECUTION_GROUPS}.")
+        self.name = name
+        self.type = type or name
+        self.enabled = enabled
+        self.order = order
+        self.cost_hint_ms = cost_hint_ms
+        self.group = group
+        self.options = options or {}
+        self.position = position
+
+    @classmethod
+    def from_config(cls, entry: dict, position: int = 0) -> "FilterSpec":
+        if "name" not in entry:
+            raise ValueError(f"Filter chain entries need a 'name': {entry!r}")
+        return cls(position=position, **entry)
+
+
+def chain_specs(config: dict) -> List[FilterSpec]:
+    """
+    Enabled filter specs from config "filters" (DEFAULT_CHAIN when absent), sorted by order then position.
+    """
+    specs = [FilterSpec.from_config(entry, i) for i, entry in enumerate(config.get("filters", DEFAULT_CHAIN))]
+    names = [s.name for s in specs]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate filter names in chain: {duplicates}")
+    return sorted((s for s in specs if s.enabled), key=lambda s: (s.order, s.position))
+
+
+def build_chain(config: dict) -> List[tuple]:
+    """
+    Instantiate the configured chain once: [(spec, filter), ...] in execution order.
+    """
+    return [(spec, _resolve_factory(spec.type)(config, **spec.options)) for spec in chain_specs(config)]
+
+
+# --- Built-in filters (imported here so the registry is complete as soon as it is imported)
+from safeguarding.core.keyword_filter import KeywordRegexFilter  # noqa: E402
+from safeguarding.core.classifier_filter import ClassifierFilter  # noqa: E402
+from safeguarding.core.perspective_api_filter import PerspectiveAPIFilter  # noqa: E402
+
+register_filter("keyword", KeywordRegexFilter)
+register_filter("classifier", ClassifierFilter)
+register_filter("perspective", PerspectiveAPIFilter)
+
+# --- NOTES FOR AUDIT/MAINTAINERS:
+# - Filters are declared in config "filters": name, type (defaults to name), enabled, order, cost_hint_ms,
+#   group ("inline": caller's thread/event loop, cheap only; "pool": thread pool; "io": awaited acheck()).
+# - Disabled entries are never instantiated: nothing of theirs is loaded or run.
+# - cost_hint_ms seeds the cost tracker, so short_circuit ordering and deadline checks work from request one.
@@ -1,6 +1,11 @@
 import re
-from typing import List
-from safeguarding.utils.logger import log_flag
+from typing import List, Optional
+from safeguarding.core.keyword_matcher import AhoCorasickMatcher
+from safeguarding.core.rule_compiler import CompiledRegexRules
+from safeguarding.utils.logger import log_flag, build_flag_entry, log_entries
+
+# Below this many keywords, plain substring scans (C speed) beat a Python-level automaton pass
+AUTOMATON_MIN_KEYWORDS = 64
 
 
 # --- RuleResult: for legacy/tests only, not used in Trinity orchestrator
@@ -31,12 +36,23 @@ class KeywordRegexFilter:
         # Compile set of banned keywords (lowercase for match speed)
         self.banned_keywords = set(kw.lower() for kw in rules_cfg.get("banned_keywords", []))
 
-        # Compile regex patterns for performance
-        self.banned_regex = [re.compile(rx, re.IGNORECASE) for rx in rules_cfg.get("banned_regex", [])]
+        # Large block lists go through one automaton pass instead of a scan per keyword.
+        # rules.keyword_matcher: "auto" (default), "automaton" or "substring"
+        matcher_mode = rules_cfg.get("keyword_matcher", "auto")
+        use_automaton = matcher_mode == "automaton" or (
+            matcher_mode == "auto" and len(self.banned_keywords) >= AUTOMATON_MIN_KEYWORDS
+        )
+        self.keyword_matcher = AhoCorasickMatcher(sorted(self.banned_keywords)) if use_automaton else None
+
+        # Compile regex patterns for performance: one normalised alternation, one scan per text
+        self.regex_rules = CompiledRegexRules(rules_cfg.get("banned_regex", []), re.IGNORECASE)
+        self.rule_warnings = self.regex_rules.warnings
 
         # Logging settings (Trinity spec)
         self.log_path = logging_cfg.get("log_path", "safeguard_flags.log")
         self.anonymize = logging_cfg.get("anonymize", True)
+        # Consolidated audit mode: the engine's one record per request carries these flags, so no own lines
+        self.log_flags = logging_cfg.get("audit_mode", "legacy") != "consolidated"
 
     def check(self, text: str, source: str = "input"):
         """
@@ -49,26 +65,11 @@ class KeywordRegexFilter:
             flags (list): ["keyword", "regex", ...] for each type matched.
             reasons (list): Human-readable reasons for block/flag.
         """
-        flags = []
-        reasons = []
-        lower_text = text.lower()
-
-        # --- Check all banned keywords (case-insensitive, fast scan)
-        for keyword in self.banned_keywords:
-            if keyword in lower_text:
-                flags.append("keyword")
-                reasons.append(f"Banned keyword: {keyword}")
-
-        # --- Check all banned regex patterns (pre-compiled for perf)
-        for rx in self.banned_regex:
-            if rx.search(text):
-                flags.append("regex")
-                reasons.append(f"Banned pattern: {rx.pattern}")
-
+        flags, reasons = self._scan(text)
         blocked = bool(flags)
 
         # --- Log all flags/blocks for audit (never skip logging blocked attempts)
-        if blocked:
+        if blocked and self.log_flags:
             log_flag(
                 self.log_path,
                 {
@@ -83,13 +84,92 @@ class KeywordRegexFilter:
         allowed = not blocked
         return allowed, flags, reasons
 
+    def check_batch(self, texts: List[str], sources: List[str], collect: Optional[list] = None):
+        """
+        Batch variant of check(): scans every text in one tight loop and writes
+        all flag log entries in a single append.
+        Args:
+            collect (list, optional): If given, the flag entries are appended here instead of written
+                (the engine's run_batch writes them with the rest of the batch in one append).
+        Returns a list of (allowed, flags, reasons), in input order.
+        """
+        results = []
+        pending_logs = []
+        scan = self._scan
+        for text, source in zip(texts, sources):
+            flags, reasons = scan(text)
+            if flags and self.log_flags:
+                pending_logs.append(build_flag_entry(
+                    {"text": text, "source": source, "flags": flags, "reasons": reasons},
+                    anonymize=self.anonymize
+                ))
+            results.append((not flags, flags, reasons))
+        if collect is not None:
+            collect.extend(pending_logs)
+        else:
+            log_entries(pending_logs, self.log_path)
+        return results
+
+    def log_verdict(self, text: str, source: str, result, collect: Optional[list] = None):
+        """
+        Write the flag entry check() writes for a blocked result, for a result reused without running the scan
+        (the engine's verdict cache), so the legacy audit log reads the same whether or not the filter ran.
+        Args:
+            result: (allowed, flags, reasons) as returned by check().
+            collect (list, optional): As in check_batch().
+        """
+        allowed, flags, reasons = result
+        if allowed or not self.log_flags:
+            return
+        entry = build_flag_entry(
+            {"text": text, "source": source, "flags": flags, "reasons": reasons},
+            anonymize=self.anonymize
+        )
+        if collect is not None:
+            collect.append(entry)
+        else:
+            log_entries([entry], self.log_path)
+
+    def _scan(self, text: str):
+        """
+        Pure scan (no logging): returns (flags, reasons) for one text.
+        """
+        flags = []
+        reasons = []
+        lower_text = text.lower()
+
+        # --- Check all banned keywords (case-insensitive, fast scan)
+        for keyword in self.match_keywords(lower_text):
+            flags.append("keyword")
+            reasons.append(f"Banned keyword: {keyword}")
+
+        # --- Check all banned regex patterns (single combined scan, reported per configured rule)
+        for idx in self.regex_rules.search_all(text):
+            flags.append("regex")
+            reasons.append(f"Banned pattern: {self.regex_rules.patterns[idx]}")
+
+        return flags, reasons
+
+    def match_keywords(self, lower_text: str) -> List[str]:
+        """
+        Distinct banned keywords found in already-lowercased text.
+        Use keyword_matcher.find_all(lower_text) directly when match positions are needed.
+        """
+        if self.keyword_matcher is not None:
+            return self.keyword_matcher.search(lower_text)
+        return [keyword for keyword in self.banned_keywords if keyword in lower_text]
+
 # --- Classic API for legacy/tests only; do NOT use in orchestrator
 def rule_filter(text: str, source: str = "input", *, config: dict) -> RuleResult:
     """
     Returns a RuleResult object, for legacy/testing only.
+    Runs the shared engine's keyword filter for this config (rules compiled once, not per call);
+    allowed when the config's filter chain has no keyword filter.
     """
     if config is None:
         raise ValueError("Config must be provided to rule_filter (no default allowed).")
-    allowed, _, reasons = KeywordRegexFilter(config).check(text, source)
+    from safeguarding.core.engine import get_engine  # the engine builds this module's filters
+    keyword = get_engine(config).keyword
+    allowed, _, reasons = keyword.check(text, source) if keyword is not None else (True, [], [])
     return RuleResult(blocked=not allowed, reasons=reasons)
 
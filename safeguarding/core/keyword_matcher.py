@@ -0,0 +1,90 @@
+from collections import deque
+from typing import Iterable, List, Tuple
+
+
+class AhoCorasickMatcher:
+    """
+    Compiled multi-keyword matcher (Aho-Corasick automaton).
+    Finds every occurrence of every keyword in a single left-to-right pass over the text,
+    so cost is O(len(text) + matches) no matter how many keywords are loaded.
+    Matching is exact (case folding is the caller's job, e.g. KeywordRegexFilter lowercases both sides).
+    """
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Args:
+            keywords (iterable of str): Keywords to compile. Empty strings and duplicates are ignored.
+        """
+        self.keywords = []
+        self._goto = [{}]        # state -> {char: next_state}
+        self._fail = [0]         # state -> longest proper suffix state
+        self._out = [()]         # state -> keyword indices ending here (incl. via suffix links)
+
+        seen = set()
+        for kw in keywords:
+            if kw and kw not in seen:
+                seen.add(kw)
+                self._add(kw)
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _add(self, keyword: str):
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = self._out[state] + (len(self.keywords),)
+        self.keywords.append(keyword)
+
+    def _build(self):
+        # --- Breadth-first so every state's fail target is finalised before its children
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Return every (start, end, keyword) occurrence in text, ordered by end position.
+        Overlapping and nested occurrences are all reported.
+        """
+        goto, fail, out, keywords = self._goto, self._fail, self._out, self.keywords
+        matches = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                end = i + 1
+                for idx in out[state]:
+                    kw = keywords[idx]
+                    matches.append((end - len(kw), end, kw))
+        return matches
+
+    def search(self, text: str) -> List[str]:
+        """
+        Return the distinct keywords present in text, in order of their first match.
+        """
+        found = []
+        seen = set()
+        for _, _, kw in self.find_all(text):
+            if kw not in seen:
+                seen.add(kw)
+                found.append(kw)
+        return found
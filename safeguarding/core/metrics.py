@@ -0,0 +1,146 @@
+import threading
+from collections import Counter
+from typing import List
+
+from safeguarding.core.perspective_api_filter import PerspectiveAPIFilter
+from safeguarding.utils import logger
+
+# Prometheus text exposition format, version 0.0.4
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class OutcomeCounters:
+    """
+    Per-engine request counts by final status, and block counts by flag type.
+    """
+    def __init__(self):
+        self.requests = Counter()
+        self.blocks = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, status: str, flags: list = ()):
+        with self._lock:
+            self.requests[status] += 1
+            if status == "blocked":
+                for flag in flags:
+                    self.blocks[flag_type(flag)] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"requests": dict(self.requests), "blocks": dict(self.blocks)}
+
+
+def flag_type(flag) -> str:
+    """
+    "keyword"/"regex"/"deadline_<filter>" flags are their own type; classifier flags are dicts named by label.
+    """
+    return flag.get("name", "unknown") if isinstance(flag, dict) else str(flag)
+
+
+class _Exposition:
+    """
+    Accumulates metric families in text exposition format: HELP/TYPE once per family,
+    and every sample of a family kept together even when several engines contribute to it.
+    """
+    def __init__(self):
+        self.families = {}
+
+    def declare(self, name: str, kind: str, help_text: str):
+        if name not in self.families:
+            self.families[name] = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+    def sample(self, name: str, labels: dict, value, family: str = None):
+        self.families[family or name].append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def histogram(self, name: str, labels: dict, hist, scale: float = 1.0):
+        """
+        One histogram series; scale converts the stored unit (e.g. 0.001 for ms -> seconds).
+        """
+        for bound, count in hist.cumulative():
+            self.sample(f"{name}_bucket", {**labels, "le": _number(bound * scale)}, count, family=name)
+        self.sample(f"{name}_sum", labels, hist.sum * scale, family=name)
+        self.sample(f"{name}_count", labels, hist.count, family=name)
+
+    def render(self) -> str:
+        return "".join(line + "\n" for lines in self.families.values() for line in lines)
+
+
+def render_metrics(engines: List) -> str:
+    """
+    Metrics of the given engines (see engine.live_engines()) in Prometheus text format,
+    each series labelled with its engine's config fingerprint prefix.
+    """
+    out = _Exposition()
+    for engine in engines:
+        base = {"engine": engine.fingerprint[:12]}
+
+        counts = engine.outcomes.snapshot()
+        out.declare("safeguard_requests_total", "counter", "Requests by final status.")
+        for status, n in sorted(counts["requests"].items()):
+            out.sample("safeguard_requests_total", {**base, "status": status}, n)
+        out.declare("safeguard_blocks_total", "counter", "Flags on blocked requests, by flag type.")
+        for flag, n in sorted(counts["blocks"].items()):
+            out.sample("safeguard_blocks_total", {**base, "flag": flag}, n)
+
+        if engine.stage_timings is not None:
+            for stage, hist in engine.stage_timings.items():
+                if stage.startswith("filter."):
+                    out.declare("safeguard_filter_latency_seconds", "histogram", "Per-filter latency.")
+                    out.histogram("safeguard_filter_latency_seconds", {**base, "filter": stage[7:]}, hist, 0.001)
+                else:
+                    out.declare("safeguard_stage_latency_seconds", "histogram", "Pipeline stage latency.")
+                    out.histogram("safeguard_stage_latency_seconds", {**base, "stage": stage}, hist, 0.001)
+
+        for name, flt in engine.filters:
+            if hasattr(flt, "batch_sizes"):
+                out.declare("safeguard_classifier_batch_size", "histogram", "Texts per classifier scoring call.")
+                out.histogram("safeguard_classifier_batch_size", {**base, "filter": name}, flt.batch_sizes)
+            if isinstance(flt, PerspectiveAPIFilter):
+                out.declare("safeguard_perspective_requests_total", "counter", "Perspective API calls by outcome.")
+                calls = dict(flt.calls)
+                for outcome, n in sorted(calls.items()):
+                    out.sample("safeguard_perspective_requests_total", {**base, "outcome": outcome}, n)
+                out.declare("safeguard_perspective_error_ratio", "gauge", "Share of Perspective API calls that failed.")
+                total = sum(calls.values())
+                out.sample("safeguard_perspective_error_ratio", base, calls["error"] / total if total else 0)
+
+        if engine.verdict_cache is not None:
+            stats = engine.verdict_cache.stats
+            out.declare("safeguard_verdict_cache_lookups_total", "counter", "Verdict cache lookups by result.")
+            out.sample("safeguard_verdict_cache_lookups_total", {**base, "result": "hit"}, stats["hits"])
+            out.sample("safeguard_verdict_cache_lookups_total", {**base, "result": "miss"}, stats["misses"])
+            out.declare("safeguard_verdict_cache_hit_ratio", "gauge", "Share of verdict cache lookups that hit.")
+            lookups = stats["hits"] + stats["misses"]
+            out.sample("safeguard_verdict_cache_hit_ratio", base, stats["hits"] / lookups if lookups else 0)
+
+        if engine.sampler is not None:
+            sampled = engine.sampler.snapshot()
+            out.declare("safeguard_audit_entries_total", "counter", "Audit entries by outcome tier and sampling decision.")
+            for decision in ("written", "dropped"):
+                for tier, n in sorted(sampled[decision].items()):
+                    out.sample("safeguard_audit_entries_total", {**base, "outcome": tier, "decision": decision}, n)
+
+    out.declare("safeguard_log_queue_depth", "gauge", "Audit log entries accepted but not yet written.")
+    out.sample("safeguard_log_queue_depth", {}, logger.queue_depth())
+    return out.render()
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+# --- NOTES FOR AUDIT/MAINTAINERS:
+# - Served at GET /metrics by api/api_service.py; plain text, no client library needed to scrape it.
+# - Metrics carry no text, user or session data: only counts, flag types and latencies.
+# - Latency histograms come from engine.stage_timings (timing.histograms); disabling them drops those series.
@@ -0,0 +1,103 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching queue in front of a batch predictor (e.g. the classifier pipeline).
+    Concurrent callers each submit one item; a background thread collects up to max_batch_size
+    items or waits at most max_wait_ms after the first one, runs a single batched call,
+    and hands each caller its own result.
+    """
+    def __init__(self, predict: Callable[[List], List], max_batch_size: int = 16, max_wait_ms: float = 5.0):
+        """
+        Args:
+            predict (callable): predict(items) -> results, one result per item, same order.
+            max_batch_size (int): Upper bound on items per batched call.
+            max_wait_ms (float): How long the first queued item may wait for company.
+        """
+        self.predict_batch = predict
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.batches = 0
+        self.items = 0
+        self.batch_listeners = []   # callables(batch_size), e.g. metrics
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, item) -> Future:
+        """
+        Queue one item; the returned Future resolves to its result (or the batch's exception).
+        """
+        self._ensure_started()
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def predict(self, item):
+        """
+        Blocking single-item call routed through the batcher.
+        """
+        return self.submit(item).result()
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._loop, name="safeguard-microbatch", daemon=True)
+                    self._thread.start()
+
+    def _loop(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            stop = False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    nxt = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stop = True
+                    break
+                batch.append(nxt)
+            self._run(batch)
+            if stop:
+                return
+
+    def _run(self, batch):
+        items = [item for item, _ in batch]
+        try:
+            results = self.predict_batch(items)
+            if len(results) != len(items):
+                raise RuntimeError(f"Batch predictor returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+        self.batches += 1
+        self.items += len(items)
+        for listener in self.batch_listeners:
+            listener(len(items))
+
+    def close(self):
+        """
+        Stop the worker after it drains what is already queued.
+        """
+        with self._lock:
+            if self._thread is not None:
+                self._queue.put(_STOP)
+                self._thread.join()
+                self._thread = None
@@ -0,0 +1,118 @@
+import threading
+from typing import Callable, List, Optional, Tuple
+from safeguarding.core.quantization import SUPPORTED_PRECISIONS, load_quantized_pipeline
+
+DEFAULT_WARMUP_TEXTS = ["Hello, this is a warm-up message."]
+
+
+def _load_pipeline(task: str, model_name: str, revision: Optional[str], device,
+                   precision: str = "fp32", cache_dir: Optional[str] = None):
+    if precision == "int8-dynamic":
+        return load_quantized_pipeline(task, model_name, revision, device, cache_dir)
+    # Imported lazily so the package (and keyword-only deployments) work without transformers installed
+    from transformers.pipelines import pipeline
+    kwargs = {"model": model_name}
+    if revision is not None:
+        kwargs["revision"] = revision
+    if device is not None:
+        kwargs["device"] = device
+    return pipeline(task, **kwargs)
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of loaded HuggingFace pipelines, keyed by (task, model, revision, device, precision).
+    Each model is loaded (and warmed up) once per process; every ClassifierFilter, engine and legacy
+    helper asking for the same key gets the same shared pipeline object.
+    """
+    def __init__(self, loader: Callable = None):
+        """
+        Args:
+            loader (callable, optional): loader(task, model_name, revision, device, precision, cache_dir) -> pipeline.
+                Defaults to transformers' pipeline(); inject a stub in tests.
+        """
+        self._loader = loader or _load_pipeline
+        self._models = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model_name: str, revision: Optional[str] = None, device=None,
+            task: str = "text-classification", precision: str = "fp32") -> Tuple:
+        return (task, model_name, revision, device, precision)
+
+    def get(
+        self,
+        model_name: str,
+        revision: Optional[str] = None,
+        device=None,
+        task: str = "text-classification",
+        warmup_texts: Optional[List[str]] = None,
+        precision: str = "fp32",
+        quantized_cache_dir: Optional[str] = None,
+    ):
+        """
+        Return the shared pipeline for this key, loading and warming it up on first use.
+        Concurrent first calls for the same key load it only once.
+        Args:
+            warmup_texts (list, optional): Texts run once through a freshly loaded model
+                (None uses DEFAULT_WARMUP_TEXTS, [] skips warm-up).
+            precision (str): "fp32" or "int8-dynamic" (CPU dynamic quantization of Linear layers).
+            quantized_cache_dir (str, optional): Where quantized weights are cached between runs.
+        """
+        if precision not in SUPPORTED_PRECISIONS:
+            raise ValueError(f"Unsupported classifier precision {precision!r}; expected one of {SUPPORTED_PRECISIONS}.")
+        key = self.key(model_name, revision, device, task, precision)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            model = self._models.get(key)
+            if model is None:
+                model = self._loader(task, model_name, revision, device, precision, quantized_cache_dir)
+                self.warm_up(model, DEFAULT_WARMUP_TEXTS if warmup_texts is None else warmup_texts)
+                self._models[key] = model
+        return model
+
+    def register(self, model, model_name: str, revision: Optional[str] = None, device=None,
+                 task: str = "text-classification", precision: str = "fp32"):
+        """
+        Install an already-built pipeline under a key (custom/fine-tuned models, tests).
+        """
+        with self._lock:
+            self._models[self.key(model_name, revision, device, task, precision)] = model
+
+    @staticmethod
+    def warm_up(model, texts: List[str]):
+        """
+        Run warm-up inference so the first real request does not pay for lazy init/allocation.
+        """
+        if texts:
+            model(list(texts))
+
+    def loaded(self) -> List[Tuple]:
+        return list(self._models.keys())
+
+    def release(self, model_name: str, revision: Optional[str] = None, device=None,
+                task: str = "text-classification", precision: str = "fp32"):
+        """
+        Drop a model from the registry (it is freed once no filter still references it).
+        """
+        with self._lock:
+            self._models.pop(self.key(model_name, revision, device, task, precision), None)
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+
+# --- The shared registry used by ClassifierFilter unless one is injected
+default_registry = ModelRegistry()
+
+# --- NOTES FOR AUDIT/MAINTAINERS:
+# - One copy of each model per process: never call transformers.pipeline() directly in filters.
+# - Warm-up texts are configurable via classifier.warmup_texts ([] disables warm-up).
+# - classifier.precision = "int8-dynamic" loads a quantized CPU copy; check drift first with quantization_check.py.
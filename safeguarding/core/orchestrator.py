@@ -1,11 +1,4 @@
-from safeguarding.core.keyword_filter import KeywordRegexFilter
-from safeguarding.core.classifier_filter import ClassifierFilter
-from safeguarding.utils.override_checker import check_override
-from safeguarding.utils.logger import log_entry
-import traceback
-
-from safeguarding.hooks.pre_process_hook import pre_process
-from safeguarding.hooks.post_process_hook import post_process
+from safeguarding.core.engine import aget_engine, get_engine
 
 
 def run_all_filters(
@@ -16,10 +9,12 @@ def run_all_filters(
     context: dict = None,
     log_path: str = None,
     anonymize: bool = None,
-    config: dict = None
+    config: dict = None,
+    deadline_ms: float = None
 ) -> dict:
     """
     Canonical safeguard pipeline for SafeGuard.
+    Thin wrapper over the shared SafeguardEngine for this config (filters/model built once per process).
     - Applies override logic
     - Runs all filters
     - Merges/dedupes flags/reasons
@@ -34,6 +29,9 @@ def run_all_filters(
         context (dict): Optional additional context for logs.
         log_path (str): Optional log file path (for test/prod separation).
         anonymize (bool): Redact text in logs if True (GDPR/test).
+        config (dict): Config dict; None uses the process-wide default engine (load_config()).
+        deadline_ms (float): Latency budget for this call (default: deadline.default_ms, None = unbounded).
+            Filters that cannot finish in time count as allowed or blocked per deadline.on_timeout.
 
     Returns:
         dict: {
@@ -41,104 +39,88 @@ def run_all_filters(
             "flags": [...],
             "reasons": [...],
             "override": True | False,
-            "role": "parent" | "moderator" | None
+            "role": "parent" | "moderator" | None,
+            # only when a deadline applied:
+            "degraded": True | False,
+            "filters_run": [...]
         }
     """
-    context = context or {}
-        # --- Step 0: Pre-process hook (input sanitization/enrichment)
-    text, context = pre_process(text, context)
-
-    try:
-        # --- Step 1: Check for parent/moderator override
-        override_used, override_role, cleaned_text = check_override(
-            text,
-            log_path=log_path,
-            anonymize=anonymize
-        )
-
-        # --- Step 2: Instantiate and run all core filters on cleaned input
-        keyword = KeywordRegexFilter(config)
-        classifier = ClassifierFilter(config)
-
-        allowed_kw, flags_kw, reasons_kw = keyword.check(cleaned_text, source)
-        allowed_clf, flags_clf, reasons_clf = classifier.check(cleaned_text, source)
+    return get_engine(config).run(
+        text,
+        source=source,
+        user_id=user_id,
+        session_id=session_id,
+        context=context,
+        log_path=log_path,
+        anonymize=anonymize,
+        deadline_ms=deadline_ms,
+    )
 
-        # --- Step 3: Merge and deduplicate all flags/reasons from every filter
-        all_flags = list(set(flags_kw + flags_clf))
-        all_reasons = list(set(reasons_kw + reasons_clf))
-
-        # --- Step 4: Log the outcome of this filter run (audit traceable)
-        log_entry(
-            text=text,
-            status="allowed" if (override_used or (allowed_kw and allowed_clf)) else "blocked",
-            flags=all_flags,
-            reasons=all_reasons,
-            override_used=override_used,
-            override_role=override_role if override_used else None,
-            source=source,
-            log_path=log_path,
-            anonymize=anonymize,
-            user_id=user_id,
-            session_id=session_id,
-            action_type="override" if override_used else ("allow" if (allowed_kw and allowed_clf) else "block"),
-            error=None,
-            context={
-                **context,
-                "filters": ["keyword", "classifier"],
-                "endpoint": "run_all_filters"
-            }
-        )
+async def arun_all_filters(
+    text: str,
+    source: str = "input",
+    user_id: str = "anon",
+    session_id: str = "anon_session",
+    context: dict = None,
+    log_path: str = None,
+    anonymize: bool = None,
+    config: dict = None,
+    deadline_ms: float = None
+) -> dict:
+    """
+    Asyncio version of run_all_filters for async frameworks (FastAPI/Starlette).
+    Same arguments and result; CPU-bound filters run in the engine's bounded thread pool
+    and network filters are awaited natively, so the event loop is never blocked.
+    """
+    engine = await aget_engine(config)
+    return await engine.arun(
+        text,
+        source=source,
+        user_id=user_id,
+        session_id=session_id,
+        context=context,
+        log_path=log_path,
+        anonymize=anonymize,
+        deadline_ms=deadline_ms,
+    )
 
-        # --- Step 5: Return canonical result
-        if override_used:
-            result = {
-                "status": "allowed",
-                "flags": all_flags,
-                "reasons": all_reasons,
-                "override": True,
-                "role": override_role,
-            }
-            result, context = post_process(result, context)
-            return result
+def run_all_filters_batch(
+    items: list,
+    source: str = "input",
+    user_id: str = "anon",
+    session_id: str = "anon_session",
+    context: dict = None,
+    log_path: str = None,
+    anonymize: bool = None,
+    config: dict = None,
+    deadline_ms: float = None
+) -> list:
+    """
+    Batch version of run_all_filters for transcripts/backfills.
 
-        final_allowed = allowed_kw and allowed_clf
-        result = {
-            "status": "allowed" if final_allowed else "blocked",
-            "flags": all_flags,
-            "reasons": all_reasons,
-            "override": False,
-            "role": None,
-        }
-        result, context = post_process(result, context)
-        return result
+    Args:
+        items (list): Texts (str) or dicts {"text", "source"?, "user_id"?, "session_id"?, "context"?};
+            missing per-item fields fall back to the keyword arguments below.
+        source, user_id, session_id, context, log_path, anonymize, config: As run_all_filters.
+        deadline_ms (float): Latency budget for the whole batch.
 
-    except Exception as e:
-        # --- Step 6: Always log unexpected errors for forensics and traceability
-        log_entry(
-            text=text,
-            status="error",
-            flags=[],
-            reasons=["filter_exception"],
-            override_used=False,
-            override_role=None,
-            source=source,
-            log_path=log_path,
-            anonymize=anonymize,
-            user_id=user_id,
-            session_id=session_id,
-            action_type="error",
-            error=str(e),
-            context={
-                **context,
-                "traceback": traceback.format_exc(),
-                "endpoint": "run_all_filters"
-            }
-        )
-        # Raise for upstream handling or crash reporting
-        raise
+    Returns:
+        list: One run_all_filters-style result dict per item, in input order.
+    """
+    return get_engine(config).run_batch(
+        items,
+        source=source,
+        user_id=user_id,
+        session_id=session_id,
+        context=context,
+        log_path=log_path,
+        anonymize=anonymize,
+        deadline_ms=deadline_ms,
+    )
 
 # --- NOTES FOR AUDIT/MAINTAINERS:
 # - All filter pipeline results, override attempts, and errors are logged in JSONL via log_entry.
 # - Every log entry includes user/session/context for full auditability.
 # - All errors, not just happy path, are persisted to the log for forensic review.
+# - Filters and the classifier model live on SafeguardEngine (core/engine.py), built once per config.
 # - To extend: Add additional filters, context fields, or adapt for web adapter injection.
@@ -1,7 +1,18 @@
+import asyncio
+import threading
 import requests
 from safeguarding.utils.logger import log_entry
+from safeguarding.core.thresholds import CompiledThresholds
 from typing import Dict, Any, Tuple, List
 
+try:
+    import httpx  # optional: enables native (non-blocking) calls from acheck()
+except ImportError:
+    httpx = None
+
+ENDPOINT = "https://commentanalyzer.googleapis.com/v1alpha1/comments:analyze"
+UNAVAILABLE_REASON = "Perspective API unavailable — filter bypassed."
+
 class PerspectiveAPIFilter:
     """
     Google Perspective API filter.
@@ -27,64 +38,134 @@ class PerspectiveAPIFilter:
         self.thresholds = perspective_cfg.get("thresholds", {})
         self.privacy_mode = perspective_cfg.get("privacy_mode", True)
         self.log_path = logging_cfg.get("log_path", "safeguard_flags.log")
+        # HTTP timeout per call; the engine's per-request deadline may cut it shorter
+        self.timeout = perspective_cfg.get("timeout_ms", 5000) / 1000.0
+
+        # API call outcomes for the metrics endpoint: {"ok": n, "error": n}
+        self.calls = {"ok": 0, "error": 0}
+        self._calls_lock = threading.Lock()
+
+        # Pooled httpx.AsyncClients (keep-alive connections), one per event loop: {loop: client}
+        self._aclients = {}
+        self._aclients_lock = threading.Lock()
+
+        # Expect threshold config like {"TOXICITY": {"warn": 0.5, "block": 0.7}, ...} (bare number = block)
+        self.compiled_thresholds = CompiledThresholds(self.thresholds)
 
-    def check(self, text: str, source: str = "input") -> dict:
+    def check(self, text: str, source: str = "input"):
         """
         Check the given text using Perspective API.
-        Returns a dict with allowed status, flags, and reasons.
+        Returns (allowed, flags, reasons), always three values (Trinity contract).
         """
         if not self.enabled or not self.api_key:
-            return {"allowed": True, "flags": [], "reasons": []}
-
-        endpoint = "https://commentanalyzer.googleapis.com/v1alpha1/comments:analyze"
-        headers = {"Content-Type": "application/json"}
-        requested_attrs = {k: {} for k in self.thresholds.keys()}
-
-        payload = {
-            "comment": {"text": "[REDACTED]" if self.privacy_mode else text},
-            "languages": ["en"],
-            "requestedAttributes": requested_attrs
-        }
+            return True, [], []
 
         try:
             response = requests.post(
-                url=f"{endpoint}?key={self.api_key}",
-                headers=headers,
-                json=payload,
-                timeout=5
+                url=f"{ENDPOINT}?key={self.api_key}",
+                headers={"Content-Type": "application/json"},
+                json=self._payload(text),
+                timeout=self.timeout
             )
             response.raise_for_status()
-            result = response.json()
-
-            flags = []
-            reasons = []
-            blocked = False
-
-            for attr, details in result.get("attributeScores", {}).items():
-                score = details["summaryScore"]["value"]
-                # Expect threshold config like {"toxicity": {"warn": 0.5, "block": 0.7}, ...}
-                thresh_config = self.thresholds.get(attr, {})
-                warn_thresh = thresh_config.get("warn", 0.5)
-                block_thresh = thresh_config.get("block", 0.7)
-
-                tier = None
-                if score >= block_thresh:
-                    tier = "block"
-                    blocked = True
-                elif score >= warn_thresh:
-                    tier = "warn"
-
-                if tier:
-                    flags.append({
-                        "name": attr,
-                        "score": score,
-                        "tier": tier
-                    })
-                    reasons.append(f"{attr} score {score:.2f} ≥ {warn_thresh if tier=='warn' else block_thresh:.2f} ({tier})")
-
-            allowed = not blocked
-            return {"allowed": allowed, "flags": flags, "reasons": reasons}
+            self._count("ok")
+            return self._evaluate(response.json())
 
         except requests.exceptions.RequestException as e:
-            return {"allowed": True, "flags": [], "reasons": ["Perspective API unavailable — filter bypassed."]}
+            self._count("error")
+            return True, [], [UNAVAILABLE_REASON]
+
+    async def acheck(self, text: str, source: str = "input"):
+        """
+        Async variant of check() for the asyncio orchestrator.
+        Awaits the HTTP call natively when httpx is installed, otherwise runs check() in a thread.
+        """
+        if not self.enabled or not self.api_key:
+            return True, [], []
+        if httpx is None:
+            return await asyncio.to_thread(self.check, text, source)
+
+        try:
+            response = await self._async_client().post(
+                f"{ENDPOINT}?key={self.api_key}",
+                headers={"Content-Type": "application/json"},
+                json=self._payload(text)
+            )
+            response.raise_for_status()
+            self._count("ok")
+            return self._evaluate(response.json())
+
+        except httpx.HTTPError as e:
+            self._count("error")
+            return True, [], [UNAVAILABLE_REASON]
+
+    def _async_client(self):
+        """
+        The AsyncClient for the running loop, reused across calls so requests share pooled connections instead
+        of paying a TCP/TLS handshake each. A client is bound to its event loop, so each loop (e.g. one per
+        worker thread) gets its own; clients of loops that have since closed are dropped.
+        """
+        loop = asyncio.get_running_loop()
+        with self._aclients_lock:
+            for stale in [l for l in self._aclients if l.is_closed()]:
+                del self._aclients[stale]  # its connections died with the loop
+            client = self._aclients.get(loop)
+            if client is None:
+                client = self._aclients[loop] = httpx.AsyncClient(timeout=self.timeout)
+        return client
+
+    async def aclose(self):
+        """
+        Close the pooled AsyncClients: the running loop's is awaited, other loops' are closed on their own loop
+        (safe to call more than once).
+        """
+        loop = asyncio.get_running_loop()
+        with self._aclients_lock:
+            clients, self._aclients = self._aclients, {}
+        own = clients.pop(loop, None)
+        for other_loop, client in clients.items():
+            _close_on_loop(client, other_loop)
+        if own is not None:
+            await own.aclose()
+
+    def close(self):
+        """
+        Release the pooled AsyncClients from synchronous code (engine.shutdown()): each is closed on its own loop.
+        """
+        with self._aclients_lock:
+            clients, self._aclients = self._aclients, {}
+        for loop, client in clients.items():
+            _close_on_loop(client, loop)
+
+    def _count(self, outcome: str):
+        with self._calls_lock:
+            self.calls[outcome] += 1
+
+    def _payload(self, text: str) -> dict:
+        return {
+            "comment": {"text": "[REDACTED]" if self.privacy_mode else text},
+            "languages": ["en"],
+            "requestedAttributes": {k: {} for k in self.thresholds.keys()}
+        }
+
+    def _evaluate(self, result: dict):
+        """
+        Compare returned attribute scores to the configured warn/block tiers.
+        """
+        scores = [
+            {"label": attr, "score": details["summaryScore"]["value"]}
+            for attr, details in result.get("attributeScores", {}).items()
+        ]
+        return self.compiled_thresholds.evaluate([scores])[0]
+
 
+def _close_on_loop(client, loop):
+    """
+    Schedule client.aclose() on the loop that owns its connections, from any thread. Never drives the loop itself:
+    if it is not running the close happens when it next runs, and a closed loop already took the connections along.
+    """
+    if not loop.is_closed():
+        try:
+            loop.call_soon_threadsafe(lambda: loop.create_task(client.aclose()))
+        except RuntimeError:  # closed in the meantime
+            pass
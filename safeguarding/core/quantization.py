@@ -0,0 +1,140 @@
+import os
+import pickle
+import re
+from typing import Dict, List, Optional
+
+SUPPORTED_PRECISIONS = ("fp32", "int8-dynamic")
+
+
+def quantized_cache_dir(cache_dir: Optional[str] = None) -> str:
+    """
+    Absolute cache directory: classifier.quantized_cache_dir (~ expanded), else
+    $XDG_CACHE_HOME/safeguard_quantized (~/.cache/safeguard_quantized). Never relative to the working directory.
+    """
+    if not cache_dir:
+        cache_dir = os.path.join(os.environ.get("XDG_CACHE_HOME") or "~/.cache", "safeguard_quantized")
+    return os.path.abspath(os.path.expanduser(cache_dir))
+
+
+def quantized_cache_path(cache_dir: str, model_name: str, commit: Optional[str], torch_version: str) -> str:
+    """
+    File holding the int8 state dict for this model at this resolved commit, so an updated hub model is
+    quantized again instead of reusing stale weights. The torch version is part of the name,
+    since packed quantized weights are not portable across torch releases.
+    """
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "--", model_name)
+    return os.path.join(cache_dir, f"{safe_name}@{commit or 'main'}.int8-dynamic.torch-{torch_version}.pt")
+
+
+def _owned_by_us(path: str) -> bool:
+    """
+    The cached file and its directory belong to this user and are not writable by group/others (POSIX).
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    for p in (path, os.path.dirname(path)):
+        st = os.stat(p)
+        if st.st_uid != os.getuid() or st.st_mode & 0o022:
+            return False
+    return True
+
+
+def load_quantized_pipeline(task: str, model_name: str, revision: Optional[str] = None, device=None,
+                            cache_dir: Optional[str] = None):
+    """
+    Build a CPU pipeline whose nn.Linear layers are int8 dynamically quantized.
+    First load: fp32 weights are loaded, quantized and the quantized state dict is cached on disk.
+    Later loads: the (randomly initialised) architecture is quantized and the cached int8 weights
+    are loaded into it directly (tensors only, weights_only=True), skipping the fp32 checkpoint.
+    The cache is keyed by the resolved hub commit, the same one ClassifierFilter.model_version reports.
+    """
+    import torch
+    from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer
+    from transformers.pipelines import pipeline
+
+    if device not in (None, -1, "cpu"):
+        raise ValueError(f"int8-dynamic precision runs on CPU only (got device={device!r}).")
+
+    model_config = AutoConfig.from_pretrained(model_name, revision=revision)
+    commit = getattr(model_config, "_commit_hash", None) or revision
+    cache_path = quantized_cache_path(quantized_cache_dir(cache_dir), model_name, commit, torch.__version__)
+    tokenizer = AutoTokenizer.from_pretrained(model_name, revision=revision)
+
+    model = None
+    if os.path.exists(cache_path) and _owned_by_us(cache_path):
+        model = AutoModelForSequenceClassification.from_config(model_config)
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        try:
+            model.load_state_dict(torch.load(cache_path, weights_only=True))
+        except (pickle.UnpicklingError, RuntimeError, EOFError):
+            model = None  # unreadable or not a plain state dict: rebuild it from the fp32 weights
+    if model is None:
+        model = AutoModelForSequenceClassification.from_pretrained(model_name, revision=revision)
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        os.makedirs(os.path.dirname(cache_path), mode=0o700, exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        torch.save(model.state_dict(), tmp_path)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, cache_path)  # atomic: concurrent loaders never see a half-written file
+
+    model.eval()
+    return pipeline(task, model=model, tokenizer=tokenizer)
+
+
+def _label_scores(result) -> Dict[str, float]:
+    return {r["label"].lower().replace(" ", "_"): r["score"] for r in _as_scores(result)}
+
+
+def _as_scores(result) -> list:
+    # A list input yields one prediction per text: a dict (top-1) or a list of dicts; as in ClassifierFilter
+    return result if isinstance(result, list) else [result]
+
+
+def compare_precisions(reference, candidate, texts: List[str], evaluate=None) -> dict:
+    """
+    Score the same held-out texts with a reference (fp32) and candidate (quantized) pipeline.
+    Args:
+        reference, candidate: Pipelines, called as pipe(texts, top_k=None) for all label scores.
+        texts (list): Held-out sample.
+        evaluate (callable, optional): scores_list -> (allowed, flags, reasons), e.g. ClassifierFilter._evaluate,
+            used to count texts whose allow/block decision changes. Decisions are made on what ClassifierFilter
+            sees in production, the default pipe(texts) call (top-1 label per text), not on all label scores.
+    Returns:
+        dict: per-label mean/max absolute score drift, decision flips and the worst offenders.
+    """
+    ref_results = reference(list(texts), top_k=None)
+    cand_results = candidate(list(texts), top_k=None)
+    if evaluate is not None:
+        ref_decided = reference(list(texts))
+        cand_decided = candidate(list(texts))
+
+    per_label = {}
+    worst = []
+    flips = []
+    for i, (text, ref, cand) in enumerate(zip(texts, ref_results, cand_results)):
+        ref_scores = _label_scores(ref)
+        cand_scores = _label_scores(cand)
+        for label, ref_score in ref_scores.items():
+            drift = abs(cand_scores.get(label, 0.0) - ref_score)
+            stats = per_label.setdefault(label, {"sum": 0.0, "max": 0.0, "n": 0})
+            stats["sum"] += drift
+            stats["max"] = max(stats["max"], drift)
+            stats["n"] += 1
+            worst.append((drift, label, text))
+        if evaluate is not None:
+            ref_allowed = evaluate(_as_scores(ref_decided[i]))[0]
+            cand_allowed = evaluate(_as_scores(cand_decided[i]))[0]
+            if ref_allowed != cand_allowed:
+                flips.append({"text": text, "fp32_allowed": ref_allowed, "quantized_allowed": cand_allowed})
+
+    worst.sort(key=lambda w: -w[0])
+    return {
+        "samples": len(texts),
+        "labels": {
+            label: {"mean_abs_drift": s["sum"] / s["n"], "max_abs_drift": s["max"]}
+            for label, s in sorted(per_label.items())
+        },
+        "max_abs_drift": max((s["max"] for s in per_label.values()), default=0.0),
+        "decision_flips": flips,
+        "worst": [{"drift": d, "label": label, "text": text} for d, label, text in worst[:5]],
+    }
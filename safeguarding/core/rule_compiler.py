@@ -0,0 +1,125 @@
+import re
+import warnings
+from typing import Iterable, List, Optional
+
+
+class RegexRuleWarning(UserWarning):
+    """
+    Raised (as a warning) at compile time for banned_regex patterns with backtracking-prone shapes.
+    """
+
+
+# --- Shapes that can backtrack catastrophically (heuristic, checked on the normalised pattern)
+_RISKY_SHAPES = [
+    (re.compile(r"\((?:[^()\\]|\\.)*[+*](?:[^()\\]|\\.)*\)(?:[+*]|\{\d*,\})"),
+     "nested quantifier (quantified group containing + or *)"),
+    (re.compile(r"\((?:[^()\\]|\\.)*\|(?:[^()\\]|\\.)*\)(?:[+*]|\{\d*,\})"),
+     "quantified alternation (branches may overlap)"),
+    (re.compile(r"(?<!\\)\.[*+]\??(?:\\s[*+?])?\.[*+]"),
+     "adjacent unbounded wildcards"),
+]
+
+# --- Constructs that cannot be merged into one alternation without changing meaning
+_UNMERGEABLE = re.compile(r"\\[1-9]|\(\?P[<=]|\(\?[aiLmsux]+\)")
+
+
+def _unescaped_at(pattern: str, idx: int) -> bool:
+    """
+    True if pattern[idx] is not escaped (even number of backslashes before it).
+    """
+    backslashes = 0
+    while idx - backslashes - 1 >= 0 and pattern[idx - backslashes - 1] == "\\":
+        backslashes += 1
+    return backslashes % 2 == 0
+
+
+def normalize_pattern(pattern: str) -> str:
+    """
+    Strip a redundant leading/trailing .* (or .*?) from a search pattern.
+    For re.search these are no-ops that only add backtracking: ".*naked.*" finds exactly what "naked" finds.
+    Anchored forms (^.* / .*$) are left alone, since "." does not cross newlines.
+    """
+    normalized = pattern
+    for prefix in (".*?", ".*"):
+        if normalized.startswith(prefix) and normalized[len(prefix):len(prefix) + 1] not in ("*", "+", "?", "{"):
+            normalized = normalized[len(prefix):]
+            break
+    for suffix in (".*?", ".*"):
+        dot = len(normalized) - len(suffix)
+        if dot > 0 and normalized.endswith(suffix) and _unescaped_at(normalized, dot):
+            normalized = normalized[:dot]
+            break
+    return normalized if normalized else pattern
+
+
+def backtracking_warnings(pattern: str) -> List[str]:
+    """
+    Return a description for each catastrophic-backtracking shape found in pattern.
+    """
+    return [f"{description}: {pattern!r}" for rx, description in _RISKY_SHAPES if rx.search(pattern)]
+
+
+class CompiledRegexRules:
+    """
+    banned_regex rules compiled into a single alternation with one named group per rule,
+    so one scan of the text reports which rules fired.
+    Rules whose syntax cannot be merged safely (backreferences, named groups, global inline flags)
+    are kept as standalone patterns. Reported rule indices refer to the original pattern list.
+    """
+    def __init__(self, patterns: Iterable[str], flags: int = re.IGNORECASE, warn: bool = True):
+        """
+        Args:
+            patterns (iterable of str): Patterns as configured in rules.banned_regex.
+            flags (int): re flags applied to every rule (default: case-insensitive).
+            warn (bool): Emit RegexRuleWarning for risky patterns (always recorded in .warnings).
+        """
+        self.patterns = list(patterns)
+        self.flags = flags
+        self.normalized = [normalize_pattern(p) for p in self.patterns]
+        self.compiled = [re.compile(p, flags) for p in self.normalized]  # invalid rules fail loudly here
+        self.warnings = []
+        for p in self.normalized:
+            self.warnings.extend(backtracking_warnings(p))
+        if warn:
+            for message in self.warnings:
+                warnings.warn(f"banned_regex rule may backtrack catastrophically — {message}", RegexRuleWarning, stacklevel=2)
+
+        self.merged = [i for i, p in enumerate(self.normalized) if not _UNMERGEABLE.search(p)]
+        self.standalone = [i for i in range(len(self.patterns)) if i not in set(self.merged)]
+        self.combined = self._combine()
+
+    def _combine(self) -> Optional["re.Pattern"]:
+        if not self.merged:
+            return None
+        alternation = "|".join(f"(?P<r{i}>{self.normalized[i]})" for i in self.merged)
+        try:
+            return re.compile(alternation, self.flags)
+        except re.error:
+            # Should not happen for merge-safe rules; fall back to one scan per rule
+            self.standalone = list(range(len(self.patterns)))
+            self.merged = []
+            return None
+
+    def search_all(self, text: str) -> List[int]:
+        """
+        Return the indices of every rule that matches text, in rule order.
+        Clean text costs one scan of the combined pattern. When something fires, merged rules
+        not seen in that scan are re-checked individually, since a non-overlapping scan can hide
+        a rule whose match overlaps another rule's match.
+        """
+        fired = set()
+        if self.combined is not None:
+            for match in self.combined.finditer(text):
+                fired.add(int(match.lastgroup[1:]))
+            if fired and len(fired) < len(self.merged):
+                fired.update(i for i in self.merged if i not in fired and self.compiled[i].search(text))
+        fired.update(i for i in self.standalone if self.compiled[i].search(text))
+        return sorted(fired)
+
+    def search(self, text: str) -> bool:
+        """
+        True if any rule matches text (single scan when all rules are merged).
+        """
+        if self.combined is not None and self.combined.search(text):
+            return True
+        return any(self.compiled[i].search(text) for i in self.standalone)
@@ -0,0 +1,55 @@
+from typing import Dict, List, Tuple
+
+
+def plan_windows(n_tokens: int, window: int, overlap: int) -> List[Tuple[int, int]]:
+    """
+    Split n_tokens into overlapping (start, end) windows of at most `window` tokens.
+    Consecutive windows share `overlap` tokens, so nothing straddling a boundary is missed.
+    The last window is aligned to the end of the text so it is never a tiny fragment.
+    """
+    if n_tokens <= window:
+        return [(0, n_tokens)]
+    step = max(1, window - max(0, overlap))
+    spans = []
+    start = 0
+    while start + window < n_tokens:
+        spans.append((start, start + window))
+        start += step
+    spans.append((n_tokens - window, n_tokens))
+    return spans
+
+
+def length_buckets(lengths: List[int], bucket_width: int, batch_size: int) -> List[List[int]]:
+    """
+    Group item indices into batches of similar length to minimise padding.
+    Items are bucketed by length // bucket_width (shortest first, arrival order kept within a bucket)
+    and each bucket is cut into batches of at most batch_size.
+    """
+    width = max(1, bucket_width)
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i] // width)
+    batches = []
+    current = []
+    current_bucket = None
+    for i in order:
+        bucket = lengths[i] // width
+        if current and (bucket != current_bucket or len(current) >= batch_size):
+            batches.append(current)
+            current = []
+        current.append(i)
+        current_bucket = bucket
+    if current:
+        batches.append(current)
+    return batches
+
+
+def max_per_label(window_results: List[List[Dict]]) -> List[Dict]:
+    """
+    Aggregate several windows' [{"label", "score"}, ...] into one list: the max score per label,
+    highest score first.
+    """
+    best = {}
+    for result in window_results:
+        for r in result:
+            if r["score"] > best.get(r["label"], float("-inf")):
+                best[r["label"]] = r["score"]
+    return [{"label": label, "score": score} for label, score in sorted(best.items(), key=lambda kv: -kv[1])]
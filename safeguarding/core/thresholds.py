@@ -0,0 +1,119 @@
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_WARN = 0.5
+DEFAULT_BLOCK = 0.7
+
+
+def normalize_tiers(value, default_warn: float = DEFAULT_WARN, default_block: float = DEFAULT_BLOCK) -> tuple:
+    """
+    (warn, block) for one label's config entry: {"warn": x, "block": y}, or a bare number
+    meaning the block threshold (warn then defaults to min(default_warn, block)).
+    """
+    if isinstance(value, (int, float)):
+        return min(default_warn, float(value)), float(value)
+    value = value or {}
+    return float(value.get("warn", default_warn)), float(value.get("block", default_block))
+
+
+class CompiledThresholds:
+    """
+    Warn/block tiers compiled once into NumPy arrays aligned with a label index,
+    so a whole batch's (texts x labels) score matrix is tiered in one vectorized comparison.
+    Flags and reason strings are only built for rows that actually tripped a tier.
+    Labels never configured get the default tiers; labels first seen at evaluation time are added on the fly.
+    """
+    def __init__(
+        self,
+        thresholds: Dict,
+        labels: Optional[List[str]] = None,
+        normalize_label: Callable[[str], str] = None,
+        flag_name: str = "{label}",
+        reason: str = "{label} score {score:.2f} ≥ {threshold:.2f} ({tier})",
+        default_warn: float = DEFAULT_WARN,
+        default_block: float = DEFAULT_BLOCK,
+    ):
+        """
+        Args:
+            thresholds (dict): Config thresholds, {label: {"warn", "block"} | number}.
+            labels (list, optional): The model's label order (e.g. id2label values); config labels are appended.
+            normalize_label (callable, optional): Maps raw model labels to config keys.
+            flag_name, reason (str): Format strings for flag names/reasons ({label}, {score}, {threshold}, {tier}).
+        """
+        self.normalize_label = normalize_label or (lambda label: label)
+        self.flag_name = flag_name
+        self.reason = reason
+        self.default_warn = default_warn
+        self.default_block = default_block
+        self._config = {self.normalize_label(k): v for k, v in (thresholds or {}).items()}
+        self._lock = threading.Lock()
+        self.labels = []
+        self.index = {}
+        self.warn = np.zeros(0)
+        self.block = np.zeros(0)
+        self._extend([self.normalize_label(label) for label in (labels or [])] + list(self._config))
+
+    def _extend(self, labels: List[str]):
+        new = [label for label in dict.fromkeys(labels) if label not in self.index]
+        if not new:
+            return
+        with self._lock:
+            new = [label for label in new if label not in self.index]
+            tiers = [normalize_tiers(self._config.get(label), self.default_warn, self.default_block) for label in new]
+            all_labels = self.labels + new
+            warn = np.concatenate([self.warn, np.array([t[0] for t in tiers], dtype=np.float64)])
+            block = np.concatenate([self.block, np.array([t[1] for t in tiers], dtype=np.float64)])
+            # Publish arrays before the index so readers never see an index past the arrays' end
+            self.warn, self.block, self.labels = warn, block, all_labels
+            self.index = {label: i for i, label in enumerate(all_labels)}
+
+    def score_matrix(self, results: List[List[Dict]]) -> np.ndarray:
+        """
+        Build the (texts x labels) matrix from per-text [{"label", "score"}, ...] lists.
+        Labels a text has no score for are -inf, so they can never trip a tier.
+        """
+        self._extend([self.normalize_label(r["label"]) for result in results for r in result])
+        index = self.index
+        matrix = np.full((len(results), len(self.labels)), -np.inf)
+        for row, result in enumerate(results):
+            for r in result:
+                matrix[row, index[self.normalize_label(r["label"])]] = r["score"]
+        return matrix
+
+    def evaluate_matrix(self, matrix: np.ndarray) -> List[tuple]:
+        """
+        Tier every row at once; returns one (allowed, flags, reasons) per row.
+        """
+        warn, block, labels = self.warn, self.block, self.labels
+        n_cols = matrix.shape[1]
+        block_hits = matrix >= block[:n_cols]
+        warn_hits = (matrix >= warn[:n_cols]) & ~block_hits
+        blocked_rows = block_hits.any(axis=1)
+        tripped_rows = np.flatnonzero(blocked_rows | warn_hits.any(axis=1))
+
+        results = [(True, [], []) for _ in range(matrix.shape[0])]
+        for row in tripped_rows:
+            cols = np.flatnonzero(block_hits[row] | warn_hits[row])
+            cols = cols[np.argsort(-matrix[row, cols], kind="stable")]  # highest score first
+            flags = []
+            reasons = []
+            for col in cols:
+                is_block = bool(block_hits[row, col])
+                tier = "block" if is_block else "warn"
+                score = float(matrix[row, col])
+                threshold = float(block[col] if is_block else warn[col])
+                label = labels[col]
+                flags.append({"name": self.flag_name.format(label=label), "score": score, "tier": tier})
+                reasons.append(self.reason.format(label=label, score=score, threshold=threshold, tier=tier))
+            results[row] = (not bool(blocked_rows[row]), flags, reasons)
+        return results
+
+    def evaluate(self, results: List[List[Dict]]) -> List[tuple]:
+        """
+        Convenience: score_matrix + evaluate_matrix.
+        """
+        if not results:
+            return []
+        return self.evaluate_matrix(self.score_matrix(results))
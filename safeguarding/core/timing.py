@@ -0,0 +1,157 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List
+
+# Latency histogram bucket upper bounds (milliseconds); roughly 1-2.5-5 steps from 50 us to 10 s, plus +Inf
+DEFAULT_BUCKETS_MS = (
+    0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000
+)
+
+
+class StageTimer:
+    """
+    Per-request stopwatch. lap(stage) charges the time since the previous lap to `stage` (repeated laps add up);
+    add(stage, ms) records a stage measured elsewhere (e.g. one filter running in a pool thread).
+    perf_counter_ns and a dict write per stage: cheap enough to leave on for every request.
+    """
+    __slots__ = ("started", "stages", "_mark")
+
+    def __init__(self):
+        self.started = self._mark = time.perf_counter_ns()
+        self.stages = {}
+
+    def lap(self, stage: str):
+        now = time.perf_counter_ns()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self._mark) / 1e6
+        self._mark = now
+
+    def add(self, stage: str, ms: float):
+        self.stages[stage] = ms
+
+    def finish(self) -> Dict[str, float]:
+        """
+        Stage durations (ms) plus "total" since the timer was created.
+        """
+        stages = dict(self.stages)
+        stages["total"] = (time.perf_counter_ns() - self.started) / 1e6
+        return stages
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram: constant memory, lock-protected counts,
+    quantiles estimated by linear interpolation inside the bucket.
+    """
+    def __init__(self, buckets):
+        self.bounds = tuple(sorted(float(b) for b in buckets))
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot: +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        slot = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[slot] += 1
+            self.count += 1
+            self.sum += value
+
+    def quantile(self, q: float):
+        """
+        Estimated q-quantile (0 < q <= 1), or None before the first observation.
+        Values in the +Inf bucket are reported as the largest finite bound.
+        """
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for i, n in enumerate(counts):
+            if n and seen + n >= rank:
+                if i == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[i - 1] if i else 0.0
+                return lower + (self.bounds[i] - lower) * (rank - seen) / n
+            seen += n
+        return self.bounds[-1]
+
+    def cumulative(self) -> List[tuple]:
+        """
+        [(upper_bound, cumulative_count), ...] ending with (inf, count): the Prometheus bucket layout.
+        """
+        with self._lock:
+            counts = list(self.counts)
+        out, running = [], 0
+        for bound, n in zip(self.bounds + (float("inf"),), counts):
+            running += n
+            out.append((bound, running))
+        return out
+
+
+class LatencyHistogram(Histogram):
+    """
+    Histogram of durations in milliseconds.
+    """
+    def __init__(self, buckets_ms=DEFAULT_BUCKETS_MS):
+        super().__init__(buckets_ms)
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum, 3),
+            "p50_ms": self.quantile(0.5),
+            "p90_ms": self.quantile(0.9),
+            "p99_ms": self.quantile(0.99),
+        }
+
+
+class StageHistograms:
+    """
+    Process-wide per-stage latency histograms, fed with each request's StageTimer output.
+    """
+    def __init__(self, buckets_ms=DEFAULT_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        hist = self._histograms.get(stage)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(stage, LatencyHistogram(self.buckets_ms))
+        return hist
+
+    def record(self, stages: Dict[str, float], prefix: str = ""):
+        for stage, ms in stages.items():
+            self.histogram(prefix + stage).observe(ms)
+
+    def items(self) -> List[tuple]:
+        with self._lock:
+            return sorted(self._histograms.items())
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        {stage: {count, sum_ms, p50_ms, p90_ms, p99_ms}} for every stage seen so far.
+        """
+        return {stage: hist.snapshot() for stage, hist in self.items()}
+
+    def dump(self, path: str):
+        """
+        Write snapshot() as JSON (e.g. from a signal handler or a periodic job).
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2, sort_keys=True)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+# --- NOTES FOR AUDIT/MAINTAINERS:
+# - Stage names: pre_process, override, cache, filters (wall time of the whole filter step),
+#   filter.<name> (each filter that ran), merge, logging, post_process, total.
+#   run_batch records its stages once per batch under a "batch." prefix ("batch.override" includes pre_process).
+# - Timings are latency only; no text or user data ever enters a timer or histogram.
+# - Quantiles are bucket estimates: resolution is the bucket width, which is fine for p50/p99 dashboards.
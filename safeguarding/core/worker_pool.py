@@ -0,0 +1,230 @@
+import gc
+import multiprocessing
+import queue
+import sys
+import threading
+import traceback
+import warnings
+from typing import Callable, List, Optional
+
+_STOP = None
+# Pools alive in this process; gc.freeze() is undone when the last one closes
+_live_pools = 0
+_live_pools_lock = threading.Lock()
+
+
+def _set_torch_threads(torch_threads: Optional[int]):
+    if not torch_threads:
+        return
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(int(torch_threads))
+
+
+def _worker_main(conn, predict: Callable[[List], List], torch_threads: Optional[int]):
+    """
+    Worker loop (runs in the forked child): receive a batch, score it, send results back.
+    predict and the model it closes over were inherited from the parent at fork time.
+    """
+    _set_torch_threads(torch_threads)
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is _STOP:
+            return
+        try:
+            conn.send((True, predict(request)))
+        except Exception as e:
+            conn.send((False, f"{type(e).__name__}: {e}\n{traceback.format_exc()}"))
+
+
+class _Worker:
+    def __init__(self, context, predict, torch_threads):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, predict, torch_threads),
+            name="safeguard-classifier-worker",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+
+class ClassifierWorkerPool:
+    """
+    Pre-forked pool of classifier processes.
+    The model is loaded once in the parent; workers are forked afterwards, so the weights are
+    shared copy-on-write instead of being loaded once per worker. Batches are sent to an idle
+    worker over a pipe, so inference scales across cores without one process's GIL in the way.
+    POSIX only (needs the fork start method).
+    """
+    def __init__(
+        self,
+        predict: Callable[[List], List],
+        workers: int = 2,
+        torch_threads: Optional[int] = 1,
+        timeout_ms: Optional[float] = 30000,
+    ):
+        """
+        Args:
+            predict (callable): predict(texts) -> results; runs inside the workers.
+            workers (int): Number of worker processes.
+            torch_threads (int, optional): torch.set_num_threads() in each worker (None leaves torch's default).
+                workers x torch_threads should not exceed the cores available. Forced to 1 when torch is
+                already loaded in this process (see NOTES).
+            timeout_ms (float, optional): How long a batch may take in a worker before the worker is killed,
+                replaced and the call fails (None waits forever).
+        """
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("classifier.worker_pool needs the 'fork' start method (POSIX only).")
+        if "torch" in sys.modules and torch_threads != 1:
+            # The parent has loaded (and warmed up) the model, so torch's OpenMP pool already exists; it does not
+            # survive fork, and a child that runs more than one intra-op thread can hang in it
+            warnings.warn(
+                f"classifier.worker_pool.torch_threads={torch_threads!r} is unsafe once torch has run in the "
+                "parent; workers use 1 thread each (scale with workers instead).",
+                RuntimeWarning, stacklevel=2,
+            )
+            torch_threads = 1
+        self.predict = predict
+        self.workers = max(1, int(workers))
+        self.torch_threads = torch_threads
+        self.timeout = None if timeout_ms is None else timeout_ms / 1000.0
+        self.batches = 0
+        self.restarts = 0
+        self._context = multiprocessing.get_context("fork")
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        others = [t.name for t in threading.enumerate() if t is not threading.current_thread()]
+        if others:
+            # The children get a copy of whatever locks those threads hold, and can deadlock on them
+            warnings.warn(
+                f"classifier.worker_pool forks while other threads run ({', '.join(others)}); "
+                "build it before starting log writers, rotation or executors.",
+                RuntimeWarning, stacklevel=2,
+            )
+
+        # Move everything allocated so far out of the GC's reach, so collections in the
+        # workers do not touch (and so copy) the parent's pages (undone in close())
+        global _live_pools
+        with _live_pools_lock:
+            _live_pools += 1
+            gc.freeze()
+        self._all = [_Worker(self._context, predict, torch_threads) for _ in range(self.workers)]
+        for worker in self._all:
+            self._idle.put(worker)
+
+    def score(self, texts: List) -> List:
+        """
+        Score texts in one worker (blocks until a worker is free). Same contract as predict().
+        Raises RuntimeError if the worker fails, dies or does not answer within the pool's timeout.
+        """
+        if self._closed:
+            raise RuntimeError("Classifier worker pool is closed.")
+        texts = list(texts)
+        if not texts:
+            return []
+        worker = self._idle.get()
+        try:
+            worker.conn.send(texts)
+            if not worker.conn.poll(self.timeout):
+                worker = self._replace(worker)
+                raise RuntimeError(f"Classifier worker did not answer within {self.timeout:.1f}s (replaced).")
+            ok, payload = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            worker = self._replace(worker)
+            raise RuntimeError(f"Classifier worker died: {e}")
+        finally:
+            self._idle.put(worker)
+        if not ok:
+            raise RuntimeError(f"Classifier worker failed: {payload}")
+        with self._lock:
+            self.batches += 1
+        return payload
+
+    def map(self, texts: List, chunk_size: int = 32) -> List:
+        """
+        Split a large batch into chunks scored in parallel across workers; results in input order.
+        """
+        texts = list(texts)
+        if len(texts) <= chunk_size:
+            return self.score(texts)
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        results = [None] * len(chunks)
+        errors = []
+
+        def run(i):
+            try:
+                results[i] = self.score(chunks[i])
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(i,), daemon=True) for i in range(len(chunks))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if errors:
+            raise errors[0]
+        return [r for chunk in results for r in chunk]
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        """
+        Fork a fresh worker in place of a dead (or hung) one.
+        """
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join(timeout=1)
+        worker.conn.close()
+        replacement = _Worker(self._context, self.predict, self.torch_threads)
+        with self._lock:
+            self._all[self._all.index(worker)] = replacement
+            self.restarts += 1
+        return replacement
+
+    def close(self):
+        """
+        Stop all workers (safe to call more than once).
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for worker in self._all:
+            try:
+                worker.conn.send(_STOP)
+            except (OSError, ValueError):
+                pass
+        for worker in self._all:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.conn.close()
+        global _live_pools
+        with _live_pools_lock:
+            _live_pools -= 1
+            if _live_pools == 0:
+                gc.unfreeze()
+
+    def pids(self) -> List[int]:
+        return [w.process.pid for w in self._all]
+
+# --- NOTES FOR AUDIT/MAINTAINERS:
+# - Build the pool before any other thread exists (the engine builds its filter chain before starting its log
+#   writer/rotation threads): forking a process that already runs threads only copies the forking thread,
+#   and a lock another thread held at fork time stays held forever in the child. A RuntimeWarning names
+#   the threads found running. Worker restarts fork again later and carry the same risk.
+# - The model is loaded and warmed up before the fork, so torch's OpenMP thread pool already exists in the parent
+#   and does not survive into the children: with torch loaded, workers always run 1 intra-op thread.
+# - A batch that takes longer than timeout_ms kills and replaces its worker and fails the call (RuntimeError,
+#   an error outcome for the request) rather than blocking the caller forever.
+# - gc.freeze() is process-wide; the objects are unfrozen again when the last pool in the process closes.
+# - Workers inherit whatever the parent loaded; to change the model, build a new filter/engine.
+# - Keep workers x torch_threads <= physical cores, or workers will fight over the same cores.
@@ -2,9 +2,11 @@ from safeguarding.core.keyword_filter import rule_filter
 from safeguarding.core.classifier_filter import classifier_filter
 from safeguarding.utils.override_checker import check_override
 from safeguarding.core.models import FilterResult
+from safeguarding.utils.config_loader import load_config
 
-def run_full_pipeline(text: str) -> FilterResult:
-    override_used, override_role, cleaned_text = check_override(text)
+def run_full_pipeline(text: str, config: dict = None) -> FilterResult:
+    config = config if config is not None else load_config()
+    override_used, override_role, cleaned_text = check_override(text, config=config)
 
     result = FilterResult(
         original_text=text,
@@ -20,8 +22,8 @@ def run_full_pipeline(text: str) -> FilterResult:
         final_reasons=[]
     )
 
-    rule_result = rule_filter(cleaned_text)
-    classifier_result = classifier_filter(cleaned_text)
+    rule_result = rule_filter(cleaned_text, config=config)
+    classifier_result = classifier_filter(cleaned_text, config=config)  # model comes from the shared registry
 
     result.rule_triggered = rule_result.blocked
     result.rule_reasons = rule_result.reasons
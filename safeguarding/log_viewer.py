@@ -3,6 +3,7 @@ import json
 import os
 from datetime import datetime
 from typing import List, Optional
+from safeguarding.utils.log_rotation import open_segment, segment_paths
 
 LOG_PATH = "safeguard_flags.log"
 
@@ -12,12 +13,22 @@ def parse_log_line(line: str) -> Optional[dict]:
     except json.JSONDecodeError:
         return None
 
-def load_logs(path: str = LOG_PATH) -> List[dict]:
-    if not os.path.exists(path):
+def load_logs(path: str = LOG_PATH, after: Optional[str] = None, before: Optional[str] = None) -> List[dict]:
+    """
+    Entries from the rotated segments (per the manifest, gzip or not) and then the active file, oldest first.
+    after/before (ISO timestamps) skip whole segments outside the window; filter_logs() still filters entries.
+    """
+    files = segment_paths(path, after=after, before=before)
+    if os.path.exists(path):
+        files.append(path)
+    if not files:
         print(f"No log file found at {path}")
         return []
-    with open(path, "r", encoding="utf-8") as f:
-        return [log for line in f if (log := parse_log_line(line))]
+    logs = []
+    for file in files:
+        with open_segment(file) as f:
+            logs.extend(log for line in f if (log := parse_log_line(line)))
+    return logs
 
 def filter_logs(
     logs: List[dict], 
@@ -85,7 +96,7 @@ def main():
     parser.add_argument("--limit", type=int, default=25, help="Limit number of results (default: 25)")
 
     args = parser.parse_args()
-    logs = load_logs()
+    logs = load_logs(after=args.after, before=args.before)
     filtered_logs = filter_logs(
         logs,
         keyword=args.keyword,
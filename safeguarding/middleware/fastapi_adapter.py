@@ -2,10 +2,8 @@ from fastapi import FastAPI
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response, JSONResponse
-from safeguarding.utils.override_checker import check_override
-from safeguarding.filters.pipeline import run_full_pipeline
 from safeguarding.middleware.base import LLMSafeguardMiddleware
-from safeguarding.core.orchestrator import run_all_filters
+from safeguarding.core.orchestrator import arun_all_filters
 from typing import Callable
 import json
 
@@ -14,7 +12,12 @@ class SafeguardMiddleware(BaseHTTPMiddleware, LLMSafeguardMiddleware):
     """
     Handles input override logic, then pipeline, for advanced control and full Trinity compliance.
     Use for internal AI/LLM integration, or if you want to audit override attempts.
+    Runs the async orchestrator, so filtering never blocks the event loop.
     """
+    def __init__(self, app, config: dict = None, **kwargs):
+        super().__init__(app, **kwargs)
+        self.config = config
+
     async def dispatch(self, request: Request, call_next: Callable):
         try:
             body_bytes = await request.body()
@@ -23,16 +26,14 @@ class SafeguardMiddleware(BaseHTTPMiddleware, LLMSafeguardMiddleware):
         except Exception:
             return JSONResponse(status_code=400, content={"error": "Invalid request body"})
 
-        override_used, override_role, cleaned_text = check_override(text)
-
-        # run_full_pipeline returns an object with .is_blocked, .final_reasons, etc.
-        result = run_full_pipeline(cleaned_text)
-        if result.is_blocked and not override_used:
+        # Override handling is part of the orchestrator: an accepted override comes back "allowed"
+        result = await arun_all_filters(text, config=self.config)
+        if result.get("status") != "allowed":
             return JSONResponse(
                 status_code=403,
                 content={
                     "error": "Input blocked by safeguard",
-                    "reasons": result.final_reasons
+                    "reasons": result.get("reasons", [])
                 }
             )
         # If allowed or override, continue
@@ -46,6 +47,10 @@ class FastAPISafeguardMiddleware(BaseHTTPMiddleware):
     Minimal plug-and-play FastAPI middleware that runs universal safeguard logic via run_all_filters.
     Use if you want quick/portable integration (no advanced override logic).
     """
+    def __init__(self, app, config: dict = None, **kwargs):
+        super().__init__(app, **kwargs)
+        self.config = config
+
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         try:
             body_bytes = await request.body()
@@ -54,7 +59,7 @@ class FastAPISafeguardMiddleware(BaseHTTPMiddleware):
         except Exception:
             return JSONResponse(status_code=400, content={"error": "Invalid JSON in request body"})
 
-        result = run_all_filters(text, config=self.config)
+        result = await arun_all_filters(text, config=self.config)
         allowed = result.get("status") == "allowed"
         flags = result.get("flags", [])
         reasons = result.get("reasons", [])
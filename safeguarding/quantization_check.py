@@ -0,0 +1,90 @@
+import argparse
+import json
+import os
+from typing import List
+
+from safeguarding.core.classifier_filter import ClassifierFilter
+from safeguarding.core.model_registry import ModelRegistry
+from safeguarding.core.quantization import compare_precisions
+from safeguarding.utils.config_loader import load_config
+
+# Small held-out sample (benign, borderline and abusive); pass --samples for a real evaluation set
+DEFAULT_SAMPLES = [
+    "Let's talk about healthy food.",
+    "Can you help me with my maths homework?",
+    "Thanks, that was really helpful!",
+    "I disagree with you, but I see your point.",
+    "That movie was so bad it was almost funny.",
+    "You are an idiot and nobody likes you.",
+    "Shut up, you stupid loser.",
+    "I will find you and hurt you.",
+    "Go kill yourself.",
+    "This game is killing me, level 12 is impossible.",
+    "What a dumb question, honestly.",
+    "Send me a picture of yourself, don't tell your parents.",
+]
+
+def load_samples(path: str) -> List[str]:
+    """
+    One text per line, or JSONL with a "text" field.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No samples file found at {path}")
+    samples = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                try:
+                    samples.append(json.loads(line)["text"])
+                    continue
+                except (json.JSONDecodeError, KeyError):
+                    pass
+            samples.append(line)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare int8-dynamic vs fp32 classifier scores before enabling quantization")
+    parser.add_argument("--config", help="Path to safeguard_config.json (default: normal config resolution)")
+    parser.add_argument("--samples", help="Held-out texts: one per line or JSONL with a 'text' field")
+    parser.add_argument("--max-drift", type=float, default=0.05, help="Fail if any label drifts more than this (default: 0.05)")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    classifier_cfg = config.get("classifier", {})
+    model_name = classifier_cfg.get("model", "unitary/toxic-bert")
+    revision = classifier_cfg.get("revision")
+    texts = load_samples(args.samples) if args.samples else DEFAULT_SAMPLES
+
+    registry = ModelRegistry()
+    reference = registry.get(model_name, revision=revision, warmup_texts=[])
+    candidate = registry.get(
+        model_name,
+        revision=revision,
+        warmup_texts=[],
+        precision="int8-dynamic",
+        quantized_cache_dir=classifier_cfg.get("quantized_cache_dir"),
+    )
+
+    # Decision flips are judged as ClassifierFilter decides: top-1 label against the configured thresholds
+    evaluator = ClassifierFilter({**config, "classifier": {**classifier_cfg, "enabled": False}})
+    report = compare_precisions(reference, candidate, texts, evaluate=evaluator._evaluate)
+
+    print(f"Model: {model_name}  samples: {report['samples']}")
+    for label, stats in report["labels"].items():
+        print(f"  {label:<20} mean |Δ| {stats['mean_abs_drift']:.4f}   max |Δ| {stats['max_abs_drift']:.4f}")
+    print(f"Decision flips (allow/block): {len(report['decision_flips'])}")
+    for flip in report["decision_flips"]:
+        print(f"  fp32 allowed={flip['fp32_allowed']} int8 allowed={flip['quantized_allowed']}: {flip['text'][:80]}")
+    print("Largest drifts:")
+    for w in report["worst"]:
+        print(f"  {w['drift']:.4f} {w['label']}: {w['text'][:80]}")
+
+    ok = report["max_abs_drift"] <= args.max_drift and not report["decision_flips"]
+    print("\nOK to enable classifier.precision=int8-dynamic" if ok else "\nDrift above tolerance — keep fp32")
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+
+from safeguarding.utils import serializer
+from safeguarding.utils.logger import build_entry
+
+
+def sample_entry() -> dict:
+    """
+    A blocked request as the engine logs it (consolidated audit mode, classifier + keyword flags).
+    """
+    flags = ["keyword", {"name": "classifier_toxic", "score": 0.9731, "tier": "block"}]
+    reasons = ["Banned keyword: idiot", "Classifier (toxic): 0.97 ≥ 0.80 (block)"]
+    return build_entry(
+        text="[REDACTED]",
+        status="blocked",
+        flags=flags,
+        reasons=reasons,
+        override_used=False,
+        override_role=None,
+        source="input",
+        anonymize=True,
+        user_id="user-4821",
+        session_id="sess-93f1c2",
+        action_type="block",
+        context={
+            "endpoint": "run_all_filters",
+            "filters": ["keyword", "classifier"],
+            "filter_details": {"classifier": {"decided_by": "full", "fast_score": 0.64}},
+            "verdict_cache": "miss",
+        },
+    ) | {"audit": {
+        "filters": {
+            "keyword": {"allowed": False, "flags": ["keyword"], "reasons": reasons[:1]},
+            "classifier": {"allowed": False, "flags": flags[1:], "reasons": reasons[1:]},
+        },
+        "override": {"status": "override_failed", "reasons": ["no_match"], "role": "none"},
+    }}
+
+
+def baseline(entry: dict) -> str:
+    # What every log line cost before: a fresh isoformat() timestamp and a json.dumps call
+    entry["timestamp"] = datetime.now(timezone.utc).isoformat()
+    return json.dumps(entry, ensure_ascii=False)
+
+
+def stdlib(entry: dict) -> str:
+    entry["timestamp"] = serializer.utc_timestamp()
+    return serializer.json_dumps(entry)
+
+
+def fast(entry: dict) -> str:
+    entry["timestamp"] = serializer.utc_timestamp()
+    return serializer.orjson_dumps(entry)
+
+
+def measure(fn, entry: dict, records: int, repeat: int) -> float:
+    """
+    Best-of-`repeat` records/second for timestamping + serializing `records` entries.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(records):
+            fn(entry)
+        best = min(best, time.perf_counter() - started)
+    return records / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit record serialization throughput (records/second)")
+    parser.add_argument("--records", type=int, default=50000, help="Records per run (default: 50000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant, best kept (default: 5)")
+    args = parser.parse_args()
+
+    entry = sample_entry()
+    # The stdlib backend must be a drop-in replacement: identical bytes to json.dumps
+    if serializer.json_dumps(entry) != json.dumps(entry, ensure_ascii=False):
+        raise SystemExit("json_dumps output differs from json.dumps")
+    variants = [("json.dumps + isoformat (before)", baseline), ("shared encoder + cached timestamp", stdlib)]
+    if serializer.orjson is not None:
+        variants.append(("orjson + cached timestamp", fast))
+
+    before = None
+    for label, fn in variants:
+        rate = measure(fn, dict(entry), args.records, args.repeat)
+        before = before or rate
+        print(f"{label:<34} {rate:>12,.0f} records/s   x{rate / before:.2f}")
+    if serializer.orjson is None:
+        print("orjson not installed: pip install orjson for the fast backend")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Shared test doubles and fixtures for the safeguarding test suite (not collected as tests itself).
+"""
+import asyncio
+import json
+import os
+import time
+import unittest
+from safeguarding.core.engine import SafeguardEngine
+from safeguarding.core.model_registry import default_registry
+
+
+def read_entries(path):
+    """Audit log entries at path, in order ([] when nothing has been written yet)."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class CountingPipeline:
+    """
+    Stand-in text-classification pipeline: one "toxic" score per text (`hit` when `trigger` is in it,
+    else `miss`), counting the texts scored (calls) and keeping them in order (seen).
+    """
+    def __init__(self, trigger="idiot", hit=0.95, miss=0.01):
+        self.trigger = trigger
+        self.hit = hit
+        self.miss = miss
+        self.calls = 0
+        self.seen = []
+
+    def __call__(self, texts, **kwargs):
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        self.calls += len(texts)
+        self.seen += texts
+        return [{"label": "toxic", "score": self.hit if self.trigger in t else self.miss} for t in texts]
+
+
+class SleepyFilter:
+    """
+    Stand-in filter that takes `seconds` per check, then allows (or flags itself by name when allowed=False).
+    """
+    def __init__(self, seconds, allowed=True, name="sleepy"):
+        self.seconds = seconds
+        self.allowed = allowed
+        self.name = name
+
+    def check(self, text, source="input"):
+        time.sleep(self.seconds)
+        return self.allowed, [] if self.allowed else [self.name], []
+
+
+class AsyncSleepyFilter(SleepyFilter):
+    """
+    SleepyFilter with a native acheck, so arun awaits it instead of running check on a thread.
+    """
+    async def acheck(self, text, source="input"):
+        await asyncio.sleep(self.seconds)
+        return self.allowed, [] if self.allowed else [self.name], []
+
+
+class EngineTestCase(unittest.TestCase):
+    """
+    Base for engine-level tests. Engines from build_engine() log to `log_path` (unanonymized) and are shut down
+    after each test, and the log is removed before and after. With `model` set, a CountingPipeline is registered
+    under that name for the test as self.pipeline.
+    """
+    log_path = None
+    model = None
+
+    def setUp(self):
+        self.engines = []
+        self.remove_log()
+        if self.model:
+            self.pipeline = CountingPipeline()
+            default_registry.register(self.pipeline, self.model)
+
+    def tearDown(self):
+        for engine in self.engines:
+            engine.shutdown()
+        if self.model:
+            default_registry.release(self.model)
+        self.remove_log()
+
+    def remove_log(self):
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+
+    def build_engine(self, config, filters=None):
+        """
+        SafeguardEngine from config, with no banned rules and logging to self.log_path unless config says otherwise.
+        filters: replaces the configured chain ([(name, filter), ...]) when given.
+        """
+        engine = SafeguardEngine({
+            "rules": {"banned_keywords": [], "banned_regex": []},
+            **config,
+            "logging": {"log_path": self.log_path, "anonymize": False, **config.get("logging", {})},
+        })
+        if filters is not None:
+            engine.filters = filters
+        self.engines.append(engine)
+        return engine
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import unittest
+from safeguarding.core.engine import SafeguardEngine
+from safeguarding.tests.helpers import read_entries
+
+class BrokenFilter:
+    def check(self, text, source="input"):
+        raise RuntimeError("boom")
+
+class TestConsolidatedAudit(unittest.TestCase):
+    def setUp(self):
+        self.log_path = "logs/test_audit_record.log"
+        self.engines = []
+
+    def tearDown(self):
+        for engine in self.engines:
+            engine.shutdown()
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+
+    def make_engine(self, audit_mode="consolidated"):
+        engine = SafeguardEngine({
+            "rules": {"banned_keywords": ["badword"], "banned_regex": []},
+            "classifier": {"enabled": False},
+            "override": {"parent_phrases": ["override123"]},
+            "logging": {"log_path": self.log_path, "anonymize": False, "audit_mode": audit_mode},
+        })
+        self.engines.append(engine)
+        return engine
+
+    def test_blocked_request_is_one_record(self):
+        self.make_engine().run("this has badword")
+        entries = read_entries(self.log_path)
+        self.assertEqual(len(entries), 1)
+        record = entries[0]
+        self.assertEqual(record["status"], "blocked")
+        self.assertEqual(record["audit"]["override"], {"status": "override_failed", "reasons": ["no_match"], "role": "none"})
+        self.assertEqual(record["audit"]["filters"]["keyword"]["flags"], ["keyword"])
+        self.assertFalse(record["audit"]["filters"]["keyword"]["allowed"])
+
+    def test_override_recorded(self):
+        result = asyncio.run(self.make_engine().arun("override123 badword"))
+        self.assertTrue(result["override"])
+        entries = read_entries(self.log_path)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["audit"]["override"]["role"], "parent")
+
+    def test_batch_one_record_per_item(self):
+        self.make_engine().run_batch(["hello", "badword", "override123 hi"])
+        entries = read_entries(self.log_path)
+        self.assertEqual([e["status"] for e in entries], ["allowed", "blocked", "allowed"])
+        self.assertTrue(all("audit" in e for e in entries))
+
+    def test_error_record_keeps_override_attempt(self):
+        engine = self.make_engine()
+        engine.filters = [("broken", BrokenFilter())]
+        with self.assertRaises(RuntimeError):
+            engine.run("hello")
+        entries = read_entries(self.log_path)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["status"], "error")
+        self.assertEqual(entries[0]["audit"]["override"]["status"], "override_failed")
+
+    def test_legacy_mode_keeps_per_event_lines(self):
+        self.make_engine("legacy").run("this has badword")
+        entries = read_entries(self.log_path)
+        self.assertEqual(len(entries), 3)  # override_failed, keyword flag, outcome
+        self.assertFalse(any("audit" in e for e in entries))
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            self.make_engine("verbose")
+
+if __name__ == "__main__":
+    unittest.main()
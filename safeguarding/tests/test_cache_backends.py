@@ -0,0 +1,154 @@
+import socketserver
+import threading
+import time
+import unittest
+from safeguarding.core.cache_backends import CacheBackend, InProcessBackend, RedisBackend, build_cache_backend
+from safeguarding.core.verdict_cache import VerdictCache
+from safeguarding.tests.helpers import EngineTestCase
+
+TEST_MODEL = "test/backend-toxic"
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    """
+    Minimal stand-in for a Redis server: PING, GET, MGET, SET [PX ms], AUTH, SELECT.
+    """
+    def handle(self):
+        while True:
+            try:
+                command = self._read_command()
+            except (ConnectionError, ValueError):
+                return
+            if command is None:
+                return
+            if self.server.delay:
+                time.sleep(self.server.delay)
+            self.wfile.write(self.server.dispatch(command))
+
+    def _read_command(self):
+        header = self.rfile.readline()
+        if not header:
+            return None
+        parts = []
+        for _ in range(int(header[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            parts.append(self.rfile.read(length + 2)[:-2])
+        return parts
+
+class StandInServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _RespHandler)
+        self.data = {}
+        self.delay = 0.0
+        self.commands = []
+
+    def dispatch(self, command):
+        name = command[0].upper().decode()
+        self.commands.append(name)
+        if name in ("PING",):
+            return b"+PONG\r\n"
+        if name in ("AUTH", "SELECT"):
+            return b"+OK\r\n"
+        if name == "SET":
+            expires = time.monotonic() + int(command[4]) / 1000 if len(command) > 4 else None
+            self.data[command[1]] = (command[2], expires)
+            return b"+OK\r\n"
+        if name in ("GET", "MGET"):
+            values = []
+            for key in command[1:]:
+                value, expires = self.data.get(key, (None, None))
+                values.append(None if value is None or (expires and time.monotonic() > expires) else value)
+            encoded = [b"$-1\r\n" if v is None else b"$%d\r\n%s\r\n" % (len(v), v) for v in values]
+            return encoded[0] if name == "GET" else b"*%d\r\n" % len(values) + b"".join(encoded)
+        return b"-ERR unknown command\r\n"
+
+class TestInProcessBackend(unittest.TestCase):
+    def test_base_class_is_abstract(self):
+        with self.assertRaises(TypeError):
+            CacheBackend()
+
+    def test_get_many_and_eviction(self):
+        backend = InProcessBackend(max_entries=2)
+        backend.set_many([("a", 1), ("b", 2), ("c", 3)])
+        self.assertEqual(backend.get_many(["a", "b", "c"]), [None, 2, 3])
+        self.assertEqual(backend.stats["evictions"], 1)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            build_cache_backend({"backend": "memcached"})
+
+class TestRedisBackend(EngineTestCase):
+    log_path = "logs/test_cache_backends.log"
+    model = TEST_MODEL
+
+    def setUp(self):
+        super().setUp()
+        self.server = StandInServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.port = self.server.server_address[1]
+        self.backend = RedisBackend(port=self.port, timeout_ms=200, cooldown_seconds=0.2)
+
+    def tearDown(self):
+        self.backend.close()
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def test_round_trip_and_multi_get(self):
+        self.assertTrue(self.backend.ping())
+        self.backend.set_many([("a", [[[True, [], []], {}]]), ("b", {"x": 1})], ttl_seconds=60)
+        self.assertEqual(self.backend.get_many(["a", "missing", "b"]), [[[[True, [], []], {}]], None, {"x": 1}])
+        self.assertIn("MGET", self.server.commands)
+        self.assertIn(b"safeguard:verdict:a", self.server.data)
+
+    def test_ttl_passed_to_server(self):
+        self.backend.set("a", 1, ttl_seconds=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(self.backend.get("a"))
+
+    def test_slow_server_falls_back_to_miss(self):
+        self.backend.set("a", 1)
+        self.server.delay = 0.5
+        started = time.monotonic()
+        self.assertIsNone(self.backend.get("a"))
+        self.assertLess(time.monotonic() - started, 0.45)
+        self.assertEqual(self.backend.stats["errors"], 1)
+        # Cooling down: no network round trip at all
+        self.assertIsNone(self.backend.get("a"))
+        self.assertEqual(self.backend.stats["errors"], 1)
+
+        self.server.delay = 0.0
+        time.sleep(0.6)
+        self.assertEqual(self.backend.get("a"), 1)
+
+    def test_down_server_falls_back_to_miss(self):
+        backend = RedisBackend(port=1, timeout_ms=50)
+        self.assertEqual(backend.get_many(["a", "b"]), [None, None])
+        backend.set("a", 1)  # never raises
+        self.assertFalse(backend.ping())
+
+    def test_shared_between_engines(self):
+        config = {
+            "rules": {"banned_keywords": ["drugs"], "banned_regex": []},
+            "classifier": {"enabled": True, "model": TEST_MODEL, "thresholds": {"toxic": {"warn": 0.5, "block": 0.8}}},
+            "logging": {"anonymize": True},
+            "verdict_cache": {"enabled": True, "backend": "redis", "redis": {"port": self.port, "timeout_ms": 200}},
+        }
+        first, second = self.build_engine(config), self.build_engine(config)
+        self.assertEqual(first.run("you idiot")["status"], "blocked")
+        self.assertEqual(second.run("you idiot")["status"], "blocked")
+        results = second.run_batch(["you idiot", "hello"])
+        self.assertEqual([r["status"] for r in results], ["blocked", "allowed"])
+        self.assertEqual(self.pipeline.calls, 2)
+        self.assertEqual(second.verdict_cache.stats["hits"], 2)
+
+    def test_verdict_cache_over_backend(self):
+        cache = VerdictCache("fp", ttl_seconds=60, backend=self.backend)
+        cache.put_many([("hi", "input", [[[True, [], []], {}]])])
+        self.assertEqual(cache.get_many(["hi", "bye"], ["input", "input"]), [[[[True, [], []], {}]], None])
+        self.assertEqual(cache.snapshot()["hits"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+import unittest
+from safeguarding.core.cascade import ClassifierCascade, HashedNgramScorer, build_cascade
+from safeguarding.core.classifier_filter import ClassifierFilter
+from safeguarding.core.engine import SafeguardEngine
+from safeguarding.core.model_registry import ModelRegistry
+from safeguarding.tests.helpers import CountingPipeline
+
+FULL_MODEL = "test/full-toxic"
+
+def fast_scores(texts):
+    # "hello" is clearly benign, "idiot" clearly abusive, anything else is uncertain
+    return [0.05 if "hello" in t else 0.95 if "idiot" in t else 0.5 for t in texts]
+
+def counting_pipeline():
+    return CountingPipeline(trigger="dumb", hit=0.9, miss=0.1)
+
+def make_filter(pipeline, band=(0.2, 0.8)):
+    registry = ModelRegistry()
+    registry.register(pipeline, FULL_MODEL)
+    flt = ClassifierFilter({"classifier": {
+        "enabled": True,
+        "model": FULL_MODEL,
+        "thresholds": {"toxic": {"warn": 0.5, "block": 0.8}},
+    }}, registry=registry)
+    flt.cascade = ClassifierCascade(fast_scores, band=band)
+    return flt
+
+class TestClassifierCascade(unittest.TestCase):
+    def test_triage(self):
+        cascade = ClassifierCascade(fast_scores, band=(0.2, 0.8))
+        (benign, _), (abusive, _), (unsure, score) = cascade.triage(["hello there", "you idiot", "you are dumb"])
+        self.assertEqual(benign, (True, [], []))
+        self.assertFalse(abusive[0])
+        self.assertEqual(abusive[1][0]["tier"], "block")
+        self.assertIsNone(unsure)
+        self.assertEqual(score, 0.5)
+
+    def test_invalid_band(self):
+        with self.assertRaises(ValueError):
+            ClassifierCascade(fast_scores, band=(0.9, 0.1))
+
+    def test_only_uncertain_texts_escalated(self):
+        pipeline = counting_pipeline()
+        flt = make_filter(pipeline)
+        results = flt.check_batch_detailed(["hello there", "you idiot", "you are dumb", "ok then"], ["input"] * 4)
+        self.assertEqual(pipeline.seen, ["you are dumb", "ok then"])
+        self.assertEqual([r[3]["decided_by"] for r in results], ["fast", "fast", "full", "full"])
+        self.assertEqual([r[0] for r in results], [True, False, False, True])
+
+        stats = flt.cascade.snapshot()
+        self.assertEqual((stats["fast"], stats["full"]), (2, 2))
+        self.assertAlmostEqual(stats["escalation_rate"], 0.5)
+
+    def test_single_check_matches_batch(self):
+        flt = make_filter(counting_pipeline())
+        texts = ["hello there", "you idiot", "you are dumb"]
+        batch = flt.check_batch(texts, ["input"] * 3)
+        self.assertEqual([flt.check(t) for t in texts], batch)
+        self.assertEqual(flt.check_detailed("hello there")[3]["decided_by"], "fast")
+
+    def test_engine_logs_deciding_tier(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = os.path.join(tmp, "cascade.log")
+            engine = SafeguardEngine({"rules": {"banned_keywords": [], "banned_regex": []},
+                                      "logging": {"log_path": log_path, "anonymize": False}})
+            engine.classifier = make_filter(counting_pipeline())
+            engine.filters = [("keyword", engine.keyword), ("classifier", engine.classifier)]
+            engine.run("hello there")
+            engine.run_batch(["you are dumb"])
+            with open(log_path, encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f]
+        decided = [e["context"]["filter_details"]["classifier"]["decided_by"]
+                   for e in entries if "filter_details" in e.get("context", {})]
+        self.assertEqual(decided, ["fast", "full"])
+
+class TestHashedNgramScorer(unittest.TestCase):
+    def test_fit_save_load(self):
+        texts = ["you stupid idiot", "shut up loser", "idiot loser", "have a nice day", "thanks for the help", "nice work"]
+        labels = [1, 1, 1, 0, 0, 0]
+        model = HashedNgramScorer.fit(texts, labels, n_features=2 ** 12, epochs=20)
+        scores = model(["what an idiot", "have a nice evening"])
+        self.assertGreater(scores[0], scores[1])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "fast.json")
+            model.save(path)
+            cascade = build_cascade({"enabled": True, "fast_model_path": path, "band": [0.3, 0.7]})
+            self.assertEqual(cascade.fast_scorer(["what an idiot"]), model(["what an idiot"]))
+
+    def test_disabled_cascade(self):
+        self.assertIsNone(build_cascade({"enabled": False}))
+        self.assertIsNone(build_cascade(None))
+        with self.assertRaises(ValueError):
+            build_cascade({"enabled": True})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import time
+import unittest
+from safeguarding.core.model_registry import default_registry
+from safeguarding.tests.helpers import AsyncSleepyFilter, CountingPipeline, EngineTestCase, SleepyFilter
+
+TEST_MODEL = "test/deadline-toxic"
+
+class SpikyPipeline(CountingPipeline):
+    """CountingPipeline taking `delay` seconds per call."""
+    delay = 0.0
+
+    def __call__(self, texts, **kwargs):
+        time.sleep(self.delay)
+        return super().__call__(texts, **kwargs)
+
+class TestDeadline(EngineTestCase):
+    log_path = "logs/test_deadline.log"
+
+    def make_engine(self, filters, execution="sequential", on_timeout=None, logging=None, **deadline_cfg):
+        return self.build_engine({
+            "logging": logging or {},
+            "concurrency": {"max_workers": 4, "filter_execution": execution},
+            "deadline": {"on_timeout": on_timeout or {}, **deadline_cfg},
+            "verdict_cache": {"enabled": True},
+        }, filters)
+
+    def test_no_deadline_keeps_result_shape(self):
+        engine = self.make_engine([("fast", SleepyFilter(0.0))])
+        self.assertNotIn("degraded", engine.run("hi"))
+
+    def test_within_budget(self):
+        engine = self.make_engine([("fast", SleepyFilter(0.0)), ("slow", SleepyFilter(0.01))])
+        result = engine.run("hi", deadline_ms=500)
+        self.assertFalse(result["degraded"])
+        self.assertEqual(result["filters_run"], ["fast", "slow"])
+
+    def test_overrunning_filter_fails_open(self):
+        engine = self.make_engine([("fast", SleepyFilter(0.0)), ("slow", SleepyFilter(0.5, allowed=False))])
+        started = time.perf_counter()
+        result = engine.run("hi", deadline_ms=100)
+        self.assertLess(time.perf_counter() - started, 0.3)
+        self.assertEqual(result["status"], "allowed")
+        self.assertTrue(result["degraded"])
+        self.assertEqual(result["filters_run"], ["fast"])
+        with open(self.log_path, encoding="utf-8") as f:
+            context = [e["context"] for e in map(json.loads, f) if "context" in e][-1]
+        self.assertEqual(context["degraded"], {"slow": "timed_out"})
+        self.assertEqual(context["deadline_ms"], 100)
+
+    def test_fail_open_allow_is_never_sampled(self):
+        sampling = {"audit_mode": "consolidated", "sampling": {"enabled": True, "rates": {"allowed": 0.0}}}
+        engine = self.make_engine([("slow", SleepyFilter(0.5))], logging=sampling)
+        engine.run("hi", deadline_ms=50)
+        engine.run("hi")
+        self.assertEqual(engine.sampler.snapshot(), {"written": {"degraded": 1}, "dropped": {"allowed": 1}})
+        self.assertEqual(engine.verdict_cache.stats["misses"], 2)  # the degraded verdict was not cached
+
+    def test_fail_closed_blocks(self):
+        engine = self.make_engine(
+            [("slow", SleepyFilter(0.5))], on_timeout={"slow": "fail_closed"}
+        )
+        result = engine.run("hi", deadline_ms=50)
+        self.assertEqual(result["status"], "blocked")
+        self.assertIn("deadline_slow", result["flags"])
+
+    def test_known_slow_filter_skipped_without_waiting(self):
+        engine = self.make_engine([("slow", SleepyFilter(0.5))], default_ms=100)
+        engine.filter_costs.observe("slow", 0.5)
+        started = time.perf_counter()
+        result = engine.run("hi")
+        self.assertLess(time.perf_counter() - started, 0.05)
+        self.assertTrue(result["degraded"])
+
+    def test_skipped_filter_recovers_after_spike(self):
+        pipeline = SpikyPipeline()
+        default_registry.register(pipeline, TEST_MODEL)
+        self.addCleanup(default_registry.release, TEST_MODEL)
+        engine = self.build_engine({
+            "classifier": {"enabled": True, "model": TEST_MODEL, "thresholds": {"toxic": {"warn": 0.5, "block": 0.8}}},
+            "deadline": {"default_ms": 100},
+        })
+        pipeline.delay = 0.6
+        self.assertTrue(engine.run("hello")["degraded"])
+        time.sleep(0.6)  # the abandoned call finishes in the background and is measured
+        pipeline.delay = 0.0
+        results = [engine.run("you idiot") for _ in range(20)]
+        self.assertEqual(results[0]["filters_run"], ["keyword"])
+        self.assertEqual(results[-1]["status"], "blocked")
+        self.assertFalse(results[-1]["degraded"])
+
+    def test_high_cost_hint_does_not_disable_filter(self):
+        engine = self.make_engine([("slow", SleepyFilter(0.0, allowed=False))], default_ms=100)
+        engine.filter_costs.seed("slow", 10.0)
+        statuses = [engine.run("hi")["status"] for _ in range(30)]
+        self.assertEqual(statuses[0], "allowed")
+        self.assertEqual(statuses[-1], "blocked")
+
+    def test_cheap_estimate_still_bounded(self):
+        engine = self.make_engine([("slow", SleepyFilter(0.6, allowed=False))], default_ms=100)
+        engine.filter_costs.observe("slow", 0.0001)
+        started = time.perf_counter()
+        result = engine.run("hi")
+        self.assertLess(time.perf_counter() - started, 0.3)
+        self.assertEqual(result["status"], "allowed")
+        self.assertTrue(result["degraded"])
+
+    def test_degraded_verdicts_not_cached(self):
+        engine = self.make_engine([("slow", SleepyFilter(0.2))])
+        self.assertTrue(engine.run("hi", deadline_ms=20)["degraded"])
+        self.assertEqual(len(engine.verdict_cache), 0)
+        self.assertFalse(engine.run("hi", deadline_ms=1000)["degraded"])
+        self.assertEqual(len(engine.verdict_cache), 1)
+
+    def test_concurrent_and_async(self):
+        engine = self.make_engine(
+            [("cpu", SleepyFilter(0.5)), ("http", AsyncSleepyFilter(0.5)), ("fast", SleepyFilter(0.0))],
+            execution="concurrent"
+        )
+        started = time.perf_counter()
+        result = asyncio.run(engine.arun("hi", deadline_ms=100))
+        self.assertLess(time.perf_counter() - started, 0.3)
+        self.assertEqual(result["filters_run"], ["fast"])
+        result = engine.run("hi again", deadline_ms=100)
+        self.assertEqual(result["filters_run"], ["fast"])
+
+    def test_async_sequential_cancels_http_filter(self):
+        engine = self.make_engine([("http", AsyncSleepyFilter(1.0))])
+        started = time.perf_counter()
+        result = asyncio.run(engine.arun("hi", deadline_ms=50))
+        self.assertLess(time.perf_counter() - started, 0.3)
+        self.assertTrue(result["degraded"])
+
+    def test_batch_deadline(self):
+        engine = self.make_engine([("fast", SleepyFilter(0.0)), ("slow", SleepyFilter(0.5))])
+        results = engine.run_batch(["a", "b"], deadline_ms=100)
+        self.assertEqual([r["filters_run"] for r in results], [["fast"], ["fast"]])
+        self.assertTrue(all(r["degraded"] for r in results))
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            self.make_engine([], on_timeout={"classifier": "maybe"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import os
+import threading
+import unittest
+from unittest import mock
+from safeguarding.core import engine as engine_module
+from safeguarding.core.classifier_filter import classifier_filter
+from safeguarding.core.engine import SafeguardEngine, aget_engine, get_engine, live_engines, reset_engines
+from safeguarding.core.keyword_filter import rule_filter
+from safeguarding.core.model_registry import default_registry
+from safeguarding.utils import logger
+
+TEST_MODEL = "test/fake-toxic"
+
+def fake_pipeline(texts, **kwargs):
+    def score(text):
+        return {"label": "toxic", "score": 0.95 if "idiot" in text else 0.01}
+    if isinstance(texts, str):
+        return [score(texts)]
+    return [score(t) for t in texts]
+
+def make_config(log_path):
+    return {
+        "rules": {"banned_keywords": ["drugs", "violence"], "banned_regex": [".*naked.*"]},
+        "classifier": {
+            "enabled": True,
+            "model": TEST_MODEL,
+            "thresholds": {"toxic": {"warn": 0.5, "block": 0.8}},
+        },
+        "logging": {"log_path": log_path, "anonymize": False},
+        "override": {"parent_phrases": ["override123"], "moderator_phrases": ["modunlock!"]},
+    }
+
+class TestSafeguardEngine(unittest.TestCase):
+    def setUp(self):
+        self.log_path = "logs/test_engine.log"
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+        default_registry.register(fake_pipeline, TEST_MODEL)
+        self.config = make_config(self.log_path)
+        self.engine = SafeguardEngine(self.config)
+
+    def tearDown(self):
+        self.engine.shutdown()
+        reset_engines()
+        default_registry.release(TEST_MODEL)
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+
+    def read_log(self):
+        with open(self.log_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_allowed_and_blocked(self):
+        self.assertEqual(self.engine.run("Let's talk about healthy food")["status"], "allowed")
+        result = self.engine.run("you idiot, let's talk about drugs")
+        self.assertEqual(result["status"], "blocked")
+        self.assertIn("keyword", result["flags"])
+        self.assertTrue(any(isinstance(f, dict) and f["name"] == "classifier_toxic" for f in result["flags"]))
+
+    def test_override_allows(self):
+        result = self.engine.run("override123 let's talk about drugs")
+        self.assertEqual(result["status"], "allowed")
+        self.assertTrue(result["override"])
+        self.assertEqual(result["role"], "parent")
+
+    def test_batch_matches_single_and_keeps_order(self):
+        texts = ["hello", "drugs", {"text": "a naked idiot", "user_id": "u1", "source": "output"}, "modunlock! drugs"]
+        batch = self.engine.run_batch(texts)
+        single = [self.engine.run(t if isinstance(t, str) else t["text"]) for t in texts]
+        self.assertEqual([r["status"] for r in batch], ["allowed", "blocked", "blocked", "allowed"])
+        self.assertEqual([r["status"] for r in batch], [r["status"] for r in single])
+        outcome = [e for e in self.read_log() if e.get("context", {}).get("endpoint") == "run_all_filters_batch"]
+        self.assertEqual(len(outcome), len(texts))
+        self.assertEqual((outcome[2]["user_id"], outcome[2]["source"]), ("u1", "output"))
+
+    def test_batch_is_one_append_in_legacy_mode(self):
+        with mock.patch("safeguarding.utils.logger._append_lines", wraps=logger._append_lines) as append:
+            self.engine.run_batch(["hello", "drugs", "more drugs"])
+        self.assertEqual(append.call_count, 1)
+        entries = self.read_log()
+        flag_lines = [e for e in entries if e["status"] == "blocked" and "context" not in e]
+        self.assertEqual(len(flag_lines), 2)
+
+    def test_batch_rejects_items_without_text(self):
+        with self.assertRaises(ValueError):
+            self.engine.run_batch([{"user_id": "u1"}])
+
+    def test_arun_matches_run(self):
+        async def run_many():
+            return await asyncio.gather(*[self.engine.arun(t) for t in ["hello", "drugs", "idiot"]])
+        results = asyncio.run(run_many())
+        self.assertEqual([r["status"] for r in results], ["allowed", "blocked", "blocked"])
+
+    def test_get_engine_is_shared_per_config(self):
+        self.assertIs(get_engine(self.config), get_engine(dict(self.config)))
+        other = make_config("logs/other.log")
+        self.assertIsNot(get_engine(self.config), get_engine(other))
+
+    def test_get_engine_evicts_and_shuts_down_old_configs(self):
+        configs = [make_config(f"logs/lru_{i}.log") for i in range(engine_module.MAX_CACHED_ENGINES + 1)]
+        first = get_engine(configs[0])
+        with mock.patch.object(first, "shutdown", wraps=first.shutdown) as shutdown:
+            for config in configs[1:]:
+                get_engine(config)
+            shutdown.assert_called_once()
+        self.assertNotIn(first, live_engines())
+        self.assertEqual(len(live_engines()), engine_module.MAX_CACHED_ENGINES)
+        self.assertIsNot(get_engine(configs[0]), first)
+
+    def test_get_engine_hashes_a_config_once(self):
+        engine = get_engine(self.config)
+        with mock.patch.object(engine_module, "config_fingerprint", side_effect=AssertionError("re-hashed")):
+            self.assertIs(get_engine(self.config), engine)
+
+    def test_legacy_helpers_use_the_shared_engine_filters(self):
+        config = {**self.config, "classifier": {**self.config["classifier"], "micro_batching": True}}
+        self.assertTrue(rule_filter("drugs", config=config).blocked)
+        self.assertTrue(classifier_filter("you idiot", config=config).blocked)
+        threads = threading.active_count()
+        for _ in range(5):
+            self.assertFalse(rule_filter("hello", config=config).blocked)
+            self.assertFalse(classifier_filter("hello", config=config).blocked)
+        self.assertEqual(threading.active_count(), threads)  # no batcher thread per call
+        self.assertEqual(len(live_engines()), 1)
+
+    def test_aget_engine_builds_off_the_event_loop(self):
+        built_in = []
+        real_init = SafeguardEngine.__init__
+
+        def init(engine, config):
+            built_in.append(threading.current_thread())
+            real_init(engine, config)
+
+        async def first_call():
+            with mock.patch.object(SafeguardEngine, "__init__", init):
+                engine = await aget_engine(self.config)
+                return engine, await aget_engine(self.config)
+        engine, again = asyncio.run(first_call())
+        self.assertIs(engine, again)
+        self.assertIs(engine, get_engine(self.config))
+        self.assertEqual(len(built_in), 1)
+        self.assertIsNot(built_in[0], threading.main_thread())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import time
+import unittest
+from safeguarding.core.evaluation import FilterCostTracker
+from safeguarding.tests.helpers import AsyncSleepyFilter, EngineTestCase, SleepyFilter
+
+TEST_MODEL = "test/eval-toxic"
+
+class TestFilterCostTracker(unittest.TestCase):
+    def test_ewma(self):
+        costs = FilterCostTracker(alpha=0.5)
+        costs.observe("a", 1.0)
+        costs.observe("a", 3.0)
+        self.assertAlmostEqual(costs.cost("a"), 2.0)
+        costs.observe("b", 10.0, count=10)
+        self.assertAlmostEqual(costs.cost("b"), 1.0)
+
+    def test_order_cheapest_first_unmeasured_last(self):
+        costs = FilterCostTracker()
+        costs.observe("slow", 0.5)
+        costs.observe("fast", 0.001)
+        self.assertEqual(costs.order(["slow", "new1", "fast", "new2"]), [2, 0, 1, 3])
+
+    def test_invalid_alpha(self):
+        with self.assertRaises(ValueError):
+            FilterCostTracker(alpha=0)
+
+class TestEvaluationPolicy(EngineTestCase):
+    log_path = "logs/test_evaluation.log"
+    model = TEST_MODEL
+
+    def make_engine(self, policy):
+        return self.build_engine({
+            "rules": {"banned_keywords": ["drugs"], "banned_regex": []},
+            "classifier": {"enabled": True, "model": TEST_MODEL, "thresholds": {"toxic": {"warn": 0.5, "block": 0.8}}},
+            "evaluation": {"policy": policy},
+        })
+
+    def audit_contexts(self):
+        with open(self.log_path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+        return [e["context"] for e in entries if "endpoint" in e.get("context", {})]
+
+    def test_exhaustive_runs_everything(self):
+        engine = self.make_engine("exhaustive")
+        result = engine.run("drugs")
+        self.assertEqual(result["status"], "blocked")
+        self.assertEqual(self.pipeline.calls, 1)
+        self.assertNotIn("skipped_filters", self.audit_contexts()[0])
+
+    def test_short_circuit_skips_classifier_after_keyword_block(self):
+        engine = self.make_engine("short_circuit")
+        self.assertEqual(engine.run("drugs")["status"], "blocked")
+        self.assertEqual(self.pipeline.calls, 0)
+        self.assertEqual(engine.run("you idiot")["status"], "blocked")
+        self.assertEqual(self.pipeline.calls, 1)
+        first, second = self.audit_contexts()
+        self.assertEqual(first["skipped_filters"], ["classifier"])
+        self.assertEqual(first["evaluation_policy"], "short_circuit")
+        self.assertNotIn("skipped_filters", second)
+
+    def test_short_circuit_orders_by_measured_cost(self):
+        engine = self.make_engine("short_circuit")
+        engine.filter_costs.observe("classifier", 0.0)
+        engine.filter_costs.observe("keyword", 1.0)
+        result = engine.run("you idiot, drugs")
+        self.assertEqual(self.pipeline.calls, 1)
+        self.assertEqual([f for f in result["flags"] if isinstance(f, str)], [])
+        self.assertEqual(self.audit_contexts()[0]["skipped_filters"], ["keyword"])
+
+    def test_short_circuit_batch_and_async(self):
+        engine = self.make_engine("short_circuit")
+        results = engine.run_batch(["drugs", "hello", "you idiot"])
+        self.assertEqual([r["status"] for r in results], ["blocked", "allowed", "blocked"])
+        self.assertEqual(self.pipeline.calls, 2)
+        self.assertIsNotNone(engine.filter_costs.cost("keyword"))
+        # The fake classifier is as fast as the keyword scan; make it look like a real model
+        engine.filter_costs.observe("classifier", 10.0)
+        self.assertEqual(asyncio.run(engine.arun("drugs"))["status"], "blocked")
+        self.assertEqual(self.pipeline.calls, 2)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            self.make_engine("sometimes")
+
+class TestConcurrentExecution(EngineTestCase):
+    log_path = "logs/test_concurrent.log"
+
+    def make_engine(self, filters, execution="concurrent", policy="exhaustive"):
+        return self.build_engine({
+            "concurrency": {"max_workers": 4, "filter_execution": execution},
+            "evaluation": {"policy": policy},
+        }, filters)
+
+    def test_latency_is_slowest_not_sum(self):
+        engine = self.make_engine([("a", SleepyFilter(0.1)), ("b", SleepyFilter(0.1)), ("c", SleepyFilter(0.1))])
+        started = time.perf_counter()
+        self.assertEqual(engine.run("hi")["status"], "allowed")
+        self.assertLess(time.perf_counter() - started, 0.25)
+
+    def test_results_merged_from_all_filters(self):
+        engine = self.make_engine([("a", SleepyFilter(0.01, False, "a")), ("b", SleepyFilter(0.02, False, "b"))])
+        self.assertEqual(sorted(engine.run("hi")["flags"]), ["a", "b"])
+        self.assertEqual([sorted(r["flags"]) for r in engine.run_batch(["x", "y"])], [["a", "b"], ["a", "b"]])
+
+    def test_async_gathers_http_and_cpu_filters(self):
+        engine = self.make_engine([("cpu", SleepyFilter(0.1)), ("http", AsyncSleepyFilter(0.1))])
+        started = time.perf_counter()
+        self.assertEqual(asyncio.run(engine.arun("hi"))["status"], "allowed")
+        self.assertLess(time.perf_counter() - started, 0.18)
+
+    def test_short_circuit_stops_waiting_after_block(self):
+        engine = self.make_engine(
+            [("fast", SleepyFilter(0.0, False, "fast")), ("slow", AsyncSleepyFilter(1.0))], policy="short_circuit"
+        )
+        started = time.perf_counter()
+        result = asyncio.run(engine.arun("hi"))
+        self.assertEqual(result["flags"], ["fast"])
+        self.assertLess(time.perf_counter() - started, 0.5)
+        with open(self.log_path, encoding="utf-8") as f:
+            contexts = [json.loads(line).get("context", {}) for line in f]
+        self.assertIn(["slow"], [c.get("skipped_filters") for c in contexts])
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            self.make_engine([], execution="parallel-ish")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import unittest
+from safeguarding.core.engine import SafeguardEngine
+from safeguarding.core.evaluation import FilterCostTracker
+from safeguarding.core.filter_registry import build_chain, chain_specs, register_filter, _FILTER_TYPES
+
+class ShoutFilter:
+    """Blocks all-caps text; `min_length` comes from the chain entry's options."""
+    instances = 0
+
+    def __init__(self, config, min_length=3):
+        ShoutFilter.instances += 1
+        self.min_length = min_length
+
+    def check(self, text, source="input"):
+        if len(text) >= self.min_length and text.isupper():
+            return False, ["shouting"], ["All-caps text."]
+        return True, [], []
+
+BASE_CONFIG = {
+    "rules": {"banned_keywords": ["badword"], "banned_regex": []},
+    "classifier": {"enabled": False},
+}
+
+class TestFilterRegistry(unittest.TestCase):
+    def setUp(self):
+        self.log_path = "logs/test_filter_registry.log"
+        register_filter("shout", ShoutFilter)
+        ShoutFilter.instances = 0
+
+    def tearDown(self):
+        _FILTER_TYPES.pop("shout", None)
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+
+    def config(self, filters):
+        return {**BASE_CONFIG, "filters": filters, "logging": {"log_path": self.log_path, "anonymize": False}}
+
+    def test_default_chain(self):
+        self.assertEqual([s.name for s in chain_specs(BASE_CONFIG)], ["keyword", "classifier"])
+
+    def test_custom_filter_in_engine(self):
+        engine = SafeguardEngine(self.config([
+            {"name": "keyword", "order": 10, "group": "inline"},
+            {"name": "shout", "order": 5, "options": {"min_length": 2}},
+        ]))
+        try:
+            self.assertEqual([name for name, _ in engine.filters], ["shout", "keyword"])
+            self.assertIsNone(engine.classifier)
+            result = engine.run("HEY")
+            self.assertEqual(result["status"], "blocked")
+            self.assertIn("shouting", result["flags"])
+            self.assertEqual(engine.run("hey")["status"], "allowed")
+        finally:
+            engine.shutdown()
+
+    def test_module_path_type(self):
+        chain = build_chain(self.config([
+            {"name": "caps", "type": "safeguarding.tests.test_filter_registry:ShoutFilter"}
+        ]))
+        self.assertEqual(type(chain[0][1]).__name__, "ShoutFilter")
+
+    def test_disabled_entry_not_instantiated(self):
+        chain = build_chain(self.config([
+            {"name": "keyword"},
+            {"name": "shout", "enabled": False},
+        ]))
+        self.assertEqual([spec.name for spec, _ in chain], ["keyword"])
+        self.assertEqual(ShoutFilter.instances, 0)
+
+    def test_equal_order_keeps_config_position(self):
+        specs = chain_specs(self.config([{"name": "shout"}, {"name": "keyword"}]))
+        self.assertEqual([s.name for s in specs], ["shout", "keyword"])
+
+    def test_cost_hints_seed_tracker(self):
+        engine = SafeguardEngine({**self.config([
+            {"name": "keyword", "cost_hint_ms": 2},
+            {"name": "shout", "cost_hint_ms": 0.5},
+        ]), "evaluation": {"policy": "short_circuit"}})
+        try:
+            self.assertAlmostEqual(engine.filter_costs.cost("shout"), 0.0005)
+            self.assertEqual(engine._evaluation_order(), [1, 0])
+        finally:
+            engine.shutdown()
+
+    def test_first_measurement_replaces_seed(self):
+        costs = FilterCostTracker(alpha=0.5)
+        costs.seed("x", 1.0)
+        costs.observe("x", 0.2)
+        self.assertAlmostEqual(costs.cost("x"), 0.2)
+        costs.seed("x", 5.0)
+        self.assertAlmostEqual(costs.cost("x"), 0.2)
+
+    def test_invalid_chains(self):
+        for filters in (
+            [{"name": "keyword"}, {"name": "keyword"}],
+            [{"name": "nope"}],
+            [{"name": "keyword", "group": "gpu"}],
+            [{"type": "keyword"}],
+        ):
+            with self.assertRaises(ValueError):
+                build_chain(self.config(filters))
+
+if __name__ == "__main__":
+    unittest.main()
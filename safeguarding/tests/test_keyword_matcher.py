@@ -0,0 +1,52 @@
+import unittest
+from safeguarding.core.keyword_matcher import AhoCorasickMatcher
+from safeguarding.core.keyword_filter import KeywordRegexFilter
+
+class TestAhoCorasickMatcher(unittest.TestCase):
+    def test_positions_reported(self):
+        matcher = AhoCorasickMatcher(["drugs", "kill"])
+        self.assertEqual(matcher.find_all("no drugs, no kill"), [(3, 8, "drugs"), (13, 17, "kill")])
+
+    def test_overlapping_and_nested(self):
+        matcher = AhoCorasickMatcher(["he", "she", "his", "hers"])
+        found = {(start, end, kw) for start, end, kw in matcher.find_all("ushers")}
+        self.assertEqual(found, {(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")})
+
+    def test_search_distinct_in_match_order(self):
+        matcher = AhoCorasickMatcher(["kill", "drugs"])
+        self.assertEqual(matcher.search("drugs kill drugs"), ["drugs", "kill"])
+
+    def test_no_match_and_empty_input(self):
+        matcher = AhoCorasickMatcher(["drugs", ""])
+        self.assertEqual(len(matcher), 1, "Empty keywords should be ignored.")
+        self.assertEqual(matcher.find_all("healthy food"), [])
+        self.assertEqual(matcher.find_all(""), [])
+
+    def test_unicode_keywords(self):
+        matcher = AhoCorasickMatcher(["drügs", "💊"])
+        self.assertEqual(matcher.search("let’s talk about drügs 💊"), ["drügs", "💊"])
+
+    def test_matches_substring_scan(self):
+        keywords = [f"word{i}" for i in range(500)] + ["sex", "address", "meet"]
+        text = "we should meet at this address about word42 and word499 " * 3
+        matcher = AhoCorasickMatcher(keywords)
+        self.assertEqual(set(matcher.search(text)), {kw for kw in keywords if kw in text})
+
+class TestKeywordFilterAutomaton(unittest.TestCase):
+    def test_automaton_and_substring_modes_agree(self):
+        config = {
+            "rules": {"banned_keywords": ["Drugs", "violence", "kill"], "banned_regex": []},
+            "logging": {"log_path": "logs/test_matcher.log"},
+        }
+        substring = KeywordRegexFilter({**config, "rules": {**config["rules"], "keyword_matcher": "substring"}})
+        automaton = KeywordRegexFilter({**config, "rules": {**config["rules"], "keyword_matcher": "automaton"}})
+        self.assertIsNotNone(automaton.keyword_matcher)
+        self.assertIsNone(substring.keyword_matcher)
+        for text in ["He mentioned DRUGS and violence.", "Let's talk about healthy food", ""]:
+            self.assertEqual(
+                sorted(substring.match_keywords(text.lower())),
+                sorted(automaton.match_keywords(text.lower())),
+            )
+
+if __name__ == "__main__":
+    unittest.main()
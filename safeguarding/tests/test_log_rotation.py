@@ -0,0 +1,106 @@
+import multiprocessing
+import os
+import shutil
+import unittest
+from safeguarding.core.engine import SafeguardEngine
+from safeguarding.log_viewer import load_logs
+from safeguarding.utils import log_rotation, log_writer
+from safeguarding.utils.log_rotation import configure_rotation, read_manifest
+from safeguarding.utils.logger import log_entry
+
+def write_rotated(log_path, n):
+    """Child process: append n entries to a shared, size-rotated log."""
+    rotator = configure_rotation(log_path, max_bytes=3000)
+    for i in range(n):
+        log_entry(f"message {os.getpid()} {i}", "allowed", [], [], log_path=log_path, anonymize=False)
+    rotator.close()
+
+class TestLogRotation(unittest.TestCase):
+    def setUp(self):
+        self.log_dir = "logs/test_log_rotation"
+        self.log_path = os.path.join(self.log_dir, "audit.log")
+        os.makedirs(self.log_dir, exist_ok=True)
+
+    def tearDown(self):
+        log_writer.close_writers()
+        log_rotation.close_rotators()
+        shutil.rmtree(self.log_dir, ignore_errors=True)
+
+    def write(self, n, status="allowed"):
+        for i in range(n):
+            log_entry(f"message {i}", status, [], [], log_path=self.log_path, anonymize=False)
+
+    def test_size_rotation_compresses_and_records_segments(self):
+        rotator = configure_rotation(self.log_path, max_bytes=2000)
+        self.write(30)
+        rotator.drain()
+        segments = read_manifest(self.log_path)
+        self.assertGreaterEqual(len(segments), 2)
+        for segment in segments:
+            self.assertTrue(segment["file"].endswith(".gz"))
+            self.assertTrue(os.path.exists(os.path.join(self.log_dir, segment["file"])))
+            self.assertLessEqual(segment["start"], segment["end"])
+        self.assertLess(os.path.getsize(self.log_path), 2000)
+        # every record is either in a segment or still in the active file
+        self.assertEqual(len(load_logs(self.log_path)), 30)
+        self.assertEqual(
+            sum(s["records"] for s in segments) + sum(1 for _ in open(self.log_path, encoding="utf-8")), 30
+        )
+
+    def test_time_rotation(self):
+        rotator = configure_rotation(self.log_path, interval_seconds=0, compress=False)
+        self.write(3)
+        rotator.drain()
+        segments = read_manifest(self.log_path)
+        self.assertEqual(len(segments), 3)
+        self.assertEqual([s["records"] for s in segments], [1, 1, 1])
+        self.assertFalse(segments[0]["compressed"])
+
+    def test_retention_keeps_newest_segments(self):
+        rotator = configure_rotation(self.log_path, interval_seconds=0, max_segments=2)
+        self.write(5)
+        rotator.drain()
+        segments = read_manifest(self.log_path)
+        self.assertEqual(len(segments), 2)
+        on_disk = [f for f in os.listdir(self.log_dir) if f.endswith(".gz")]
+        self.assertEqual(sorted(on_disk), sorted(s["file"] for s in segments))
+
+    def test_viewer_skips_segments_outside_window(self):
+        rotator = configure_rotation(self.log_path, interval_seconds=0)
+        self.write(2)
+        rotator.drain()
+        self.assertEqual(load_logs(self.log_path, after="2999-01-01T00:00:00"), [])
+
+    @unittest.skipIf(log_rotation.fcntl is None, "needs POSIX flock")
+    def test_processes_share_rotation(self):
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=write_rotated, args=(self.log_path, 60)) for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+        segments = read_manifest(self.log_path)
+        self.assertGreaterEqual(len(segments), 2)
+        self.assertEqual(len({s["file"] for s in segments}), len(segments))  # no segment listed twice/lost
+        self.assertEqual(len(load_logs(self.log_path)), 180)
+
+    def test_background_writer_rotates(self):
+        engine = SafeguardEngine({
+            "rules": {"banned_keywords": [], "banned_regex": []},
+            "classifier": {"enabled": False},
+            "logging": {
+                "log_path": self.log_path, "anonymize": False, "audit_mode": "consolidated",
+                "rotation": {"enabled": True, "max_bytes": 1500},
+                "writer": {"mode": "background", "flush_interval_ms": 1},
+            },
+        })
+        for i in range(20):
+            engine.run(f"hello {i}")
+        engine.shutdown()
+        log_rotation.rotator_for(self.log_path).drain()
+        self.assertGreaterEqual(len(read_manifest(self.log_path)), 1)
+        self.assertEqual(len(load_logs(self.log_path)), 20)
+
+if __name__ == "__main__":
+    unittest.main()
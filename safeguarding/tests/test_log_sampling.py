@@ -0,0 +1,108 @@
+import os
+import unittest
+from safeguarding.core.engine import SafeguardEngine
+from safeguarding.core.metrics import render_metrics
+from safeguarding.tests.helpers import read_entries
+from safeguarding.utils.log_sampling import AuditSampler, outcome_tier
+
+class TestLogSampling(unittest.TestCase):
+    def setUp(self):
+        self.log_path = "logs/test_log_sampling.log"
+        self.engines = []
+
+    def tearDown(self):
+        for engine in self.engines:
+            engine.shutdown()
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+
+    def make_engine(self, rates, enabled=True):
+        engine = SafeguardEngine({
+            "rules": {"banned_keywords": ["badword"], "banned_regex": []},
+            "classifier": {"enabled": False},
+            "override": {"parent_phrases": ["override123"], "moderator_phrases": ["mod456"]},
+            "logging": {
+                "log_path": self.log_path, "anonymize": False, "audit_mode": "consolidated",
+                "sampling": {"enabled": enabled, "rates": rates, "seed": 7},
+            },
+        })
+        self.engines.append(engine)
+        return engine
+
+    def test_tiers(self):
+        self.assertEqual(outcome_tier("error"), "error")
+        self.assertEqual(outcome_tier("allowed", override_used=True), "override")
+        self.assertEqual(outcome_tier("blocked", flags=["keyword"]), "blocked")
+        self.assertEqual(outcome_tier("allowed", flags=[{"name": "classifier_toxic"}]), "flagged")
+        self.assertEqual(outcome_tier("allowed"), "allowed")
+        self.assertEqual(outcome_tier("allowed", override_attempted=True), "override")
+        self.assertEqual(outcome_tier("allowed", degraded=True), "degraded")
+        self.assertEqual(outcome_tier("blocked", flags=["deadline_slow"], degraded=True), "blocked")
+
+    def test_ambiguous_override_attempt_kept(self):
+        engine = self.make_engine({"allowed": 0.0})
+        engine.run("override123 mod456 hello")
+        engine.run("hello")
+        entries = read_entries(self.log_path)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["audit"]["override"]["reasons"], ["ambiguous_match"])
+        self.assertEqual(engine.sampler.snapshot()["written"], {"override": 1})
+
+    def test_allowed_dropped_incidents_kept(self):
+        engine = self.make_engine({"allowed": 0.0})
+        for text in ["hello", "badword", "override123 badword", "hi there"]:
+            engine.run(text)
+        entries = read_entries(self.log_path)
+        self.assertEqual([e["status"] for e in entries], ["blocked", "allowed"])
+        self.assertTrue(entries[1]["override_used"])
+        self.assertEqual(engine.sampler.snapshot(), {
+            "written": {"blocked": 1, "override": 1}, "dropped": {"allowed": 2},
+        })
+        # every request is still counted, logged or not
+        self.assertEqual(engine.outcomes.snapshot()["requests"], {"allowed": 3, "blocked": 1})
+
+    def test_partial_rate_recorded_on_entries(self):
+        engine = self.make_engine({"allowed": 0.5})
+        engine.run_batch([f"hello {i}" for i in range(200)])
+        entries = read_entries(self.log_path)
+        counts = engine.sampler.snapshot()
+        self.assertEqual(len(entries), counts["written"]["allowed"])
+        self.assertEqual(counts["written"]["allowed"] + counts["dropped"]["allowed"], 200)
+        self.assertTrue(50 < len(entries) < 150)
+        self.assertTrue(all(e["context"]["sample_rate"] == 0.5 for e in entries))
+
+    def test_metrics(self):
+        engine = self.make_engine({"allowed": 0.0})
+        engine.run("hello")
+        engine.run("badword")
+        text = render_metrics([engine])
+        label = f'engine="{engine.fingerprint[:12]}"'
+        self.assertIn(f'safeguard_audit_entries_total{{{label},outcome="allowed",decision="dropped"}} 1', text)
+        self.assertIn(f'safeguard_audit_entries_total{{{label},outcome="blocked",decision="written"}} 1', text)
+
+    def test_disabled_writes_everything(self):
+        engine = self.make_engine({"allowed": 0.0}, enabled=False)
+        engine.run("hello")
+        self.assertIsNone(engine.sampler)
+        entries = read_entries(self.log_path)
+        self.assertEqual(len(entries), 1)
+        self.assertNotIn("sample_rate", entries[0]["context"])
+
+    def test_requires_consolidated_audit(self):
+        with self.assertRaises(ValueError):
+            SafeguardEngine({
+                "rules": {"banned_keywords": [], "banned_regex": []},
+                "classifier": {"enabled": False},
+                "logging": {"log_path": self.log_path, "audit_mode": "legacy", "sampling": {"enabled": True}},
+            })
+
+    def test_invalid_rates(self):
+        with self.assertRaises(ValueError):
+            AuditSampler({"allowed": 1.5})
+        with self.assertRaises(ValueError):
+            AuditSampler({"warned": 0.1})
+        with self.assertRaises(ValueError):
+            AuditSampler({"degraded": 0.5})
+
+if __name__ == "__main__":
+    unittest.main()
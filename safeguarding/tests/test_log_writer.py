@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+from safeguarding.core.engine import SafeguardEngine
+from safeguarding.tests.helpers import read_entries
+from safeguarding.utils import log_writer
+from safeguarding.utils.log_writer import AuditLogWriter
+from safeguarding.utils.logger import log_entry, queue_depth
+
+def entry(status="allowed", n=0):
+    return {"status": status, "override_used": False, "n": n}
+
+class TestAuditLogWriter(unittest.TestCase):
+    def setUp(self):
+        self.log_path = "logs/test_log_writer.log"
+        self.writers = []
+
+    def tearDown(self):
+        for writer in self.writers:
+            writer.close()
+        log_writer.close_writers()
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+
+    def make_writer(self, **options):
+        writer = AuditLogWriter(self.log_path, **options)
+        self.writers.append(writer)
+        return writer
+
+    def test_batches_allowed_entries(self):
+        writer = self.make_writer(flush_interval_ms=50)
+        for i in range(100):
+            writer.submit([entry(n=i)])
+        writer.flush()
+        self.assertEqual([e["n"] for e in read_entries(self.log_path)], list(range(100)))
+        self.assertLess(writer.stats["batches"], 100)
+
+    def test_block_is_on_disk_when_submit_returns(self):
+        writer = self.make_writer(flush_interval_ms=10000)
+        writer.submit([entry("blocked")])
+        self.assertEqual(read_entries(self.log_path)[0]["status"], "blocked")
+        self.assertGreaterEqual(writer.stats["fsyncs"], 1)
+
+    def test_periodic_fsync_does_not_wait(self):
+        writer = self.make_writer(flush_interval_ms=10000, durability="periodic_fsync")
+        writer.submit([entry("blocked")])
+        self.assertEqual(read_entries(self.log_path), [])
+        writer.close()
+        self.assertEqual(len(read_entries(self.log_path)), 1)
+
+    def test_full_queue_writes_in_caller(self):
+        writer = self.make_writer(queue_size=1, max_batch=1, flush_interval_ms=10000)
+        threads = [threading.Thread(target=writer.submit, args=([entry(n=i)],)) for i in range(20)]
+        with writer._write_lock:  # stall the writer thread so the queue stays full
+            for t in threads:
+                t.start()
+            time.sleep(0.2)
+        for t in threads:
+            t.join()
+        writer.close()
+        self.assertEqual(len(read_entries(self.log_path)), 20)
+        self.assertGreater(writer.stats["overflow"], 0)
+
+    def test_reopens_deleted_file(self):
+        writer = self.make_writer()
+        writer.submit([entry("blocked", 1)])
+        os.remove(self.log_path)
+        writer.submit([entry("blocked", 2)])
+        self.assertEqual([e["n"] for e in read_entries(self.log_path)], [2])
+
+    def test_unencodable_entry_keeps_writer_alive(self):
+        writer = self.make_writer(flush_interval_ms=50)
+        writer.submit([{**entry(), "context": {"obj": object()}}])
+        writer.flush()
+        writer.submit([entry("blocked", 1)])  # would hang if the writer thread had died
+        entries = read_entries(self.log_path)
+        self.assertTrue(entries[0]["context"]["obj"].startswith("<object object"))
+        self.assertEqual(entries[1]["n"], 1)
+        self.assertEqual(writer.stats["unencodable"], 1)
+
+    def test_failed_write_is_reported_to_urgent_caller(self):
+        writer = self.make_writer()
+        with mock.patch.object(writer, "_append", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                writer.submit([entry("blocked")])
+        self.assertEqual(writer.stats["errors"], 1)
+        self.assertEqual(writer.stats["retried"], 1)
+        writer.submit([entry("blocked", 2)])
+        self.assertEqual([e["n"] for e in read_entries(self.log_path)], [2])
+
+    def test_dead_thread_writes_in_caller(self):
+        writer = self.make_writer()
+        writer.close()
+        writer.submit([entry("blocked", 3)])
+        self.assertEqual(read_entries(self.log_path)[0]["n"], 3)
+        self.assertEqual(writer.stats["overflow"], 1)
+
+    def test_invalid_durability(self):
+        with self.assertRaises(ValueError):
+            AuditLogWriter(self.log_path, durability="sometimes")
+
+    def test_logger_routes_through_registered_writer(self):
+        writer = log_writer.open_writer(self.log_path, flush_interval_ms=10000)
+        self.assertIs(log_writer.open_writer(self.log_path), writer)
+        log_entry("hi", "allowed", [], [], log_path=self.log_path)
+        self.assertEqual(writer.stats["written"], 0)
+        self.assertGreaterEqual(queue_depth(), 0)
+        log_writer.close_writers()
+        self.assertEqual(len(read_entries(self.log_path)), 1)
+        # closed writers are unregistered: later entries are appended synchronously again
+        log_entry("hi", "allowed", [], [], log_path=self.log_path)
+        self.assertEqual(len(read_entries(self.log_path)), 2)
+
+    def test_engine_background_mode(self):
+        engine = SafeguardEngine({
+            "rules": {"banned_keywords": ["badword"], "banned_regex": []},
+            "classifier": {"enabled": False},
+            "logging": {"log_path": self.log_path, "anonymize": False,
+                        "writer": {"mode": "background", "flush_interval_ms": 10000}},
+        })
+        self.assertEqual(engine.run("badword")["status"], "blocked")
+        self.assertIn("badword", [e["text"] for e in read_entries(self.log_path)])
+        engine.run("hello")
+        engine.shutdown()
+        self.assertEqual(read_entries(self.log_path)[-1]["status"], "allowed")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import unittest
+from unittest import mock
+import requests
+from safeguarding.core.engine import get_engine, reset_engines
+from safeguarding.core.metrics import CONTENT_TYPE, render_metrics
+from safeguarding.core.perspective_api_filter import PerspectiveAPIFilter
+
+try:
+    from fastapi.testclient import TestClient
+    from safeguarding.api.api_service import app
+except ImportError:  # FastAPI (or httpx for its test client) not installed
+    TestClient = None
+
+def samples(text: str) -> dict:
+    """{'name{labels}': value} for every sample line of an exposition."""
+    out = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            key, value = line.rsplit(" ", 1)
+            out[key] = float(value)
+    return out
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.log_path = "logs/test_metrics.log"
+        self.config = {
+            "rules": {"banned_keywords": ["badword"], "banned_regex": []},
+            "classifier": {"enabled": False},
+            "logging": {"log_path": self.log_path, "anonymize": False},
+            "verdict_cache": {"enabled": True},
+            "perspective_api": {"enabled": True, "api_key": "test-key", "thresholds": {"TOXICITY": 0.8}},
+            "filters": [{"name": "keyword"}, {"name": "perspective", "group": "io"}],
+        }
+        self.engine = get_engine(self.config)
+        self.label = f'engine="{self.engine.fingerprint[:12]}"'
+
+    def tearDown(self):
+        reset_engines()
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+
+    def run_requests(self):
+        with mock.patch("requests.post", side_effect=requests.exceptions.ConnectionError("down")):
+            self.engine.run("hello")
+            self.engine.run("hello")
+            self.engine.run("badword here")
+
+    def test_exposition(self):
+        self.run_requests()
+        text = render_metrics([self.engine])
+        values = samples(text)
+        self.assertEqual(values[f'safeguard_requests_total{{{self.label},status="allowed"}}'], 2)
+        self.assertEqual(values[f'safeguard_requests_total{{{self.label},status="blocked"}}'], 1)
+        self.assertEqual(values[f'safeguard_blocks_total{{{self.label},flag="keyword"}}'], 1)
+        # Perspective is down, so its fail-open verdicts are never cached: every request runs the filters
+        self.assertEqual(values[f'safeguard_verdict_cache_lookups_total{{{self.label},result="miss"}}'], 3)
+        self.assertEqual(values[f'safeguard_perspective_requests_total{{{self.label},outcome="error"}}'], 3)
+        self.assertEqual(values[f'safeguard_perspective_error_ratio{{{self.label}}}'], 1.0)
+        self.assertEqual(
+            values[f'safeguard_filter_latency_seconds_count{{{self.label},filter="keyword"}}'], 3
+        )
+        self.assertEqual(
+            values[f'safeguard_filter_latency_seconds_bucket{{{self.label},filter="keyword",le="+Inf"}}'], 3
+        )
+        self.assertEqual(values["safeguard_log_queue_depth"], 0)
+        self.assertEqual(text.count("# TYPE safeguard_requests_total counter"), 1)
+
+    def test_families_stay_contiguous_across_engines(self):
+        other = get_engine({**self.config, "filters": [{"name": "keyword"}]})
+        other.run("hi")
+        self.engine.run("hi")
+        lines = render_metrics([self.engine, other]).splitlines()
+        start = lines.index("# TYPE safeguard_requests_total counter")
+        family = [l for l in lines if l.startswith("safeguard_requests_total")]
+        self.assertEqual(len(family), 2)
+        self.assertEqual(lines[start + 1:start + 3], family)
+
+    def test_perspective_counts_successes(self):
+        flt = PerspectiveAPIFilter(self.config)
+        response = mock.Mock()
+        response.json.return_value = {"attributeScores": {"TOXICITY": {"summaryScore": {"value": 0.1}}}}
+        with mock.patch("requests.post", return_value=response):
+            self.assertTrue(flt.check("hi")[0])
+        self.assertEqual(flt.calls, {"ok": 1, "error": 0})
+
+    @unittest.skipIf(TestClient is None, "fastapi test client not available")
+    def test_endpoint(self):
+        self.run_requests()
+        response = TestClient(app).get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], CONTENT_TYPE)
+        self.assertIn(f'safeguard_requests_total{{{self.label},status="allowed"}} 2', response.text)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import threading
+import time
+import unittest
+from safeguarding.core.micro_batcher import MicroBatcher
+
+class TestMicroBatcher(unittest.TestCase):
+    def setUp(self):
+        self.batch_sizes = []
+
+        def predict(items):
+            self.batch_sizes.append(len(items))
+            time.sleep(0.01)
+            return [item * 2 for item in items]
+
+        self.batcher = MicroBatcher(predict, max_batch_size=8, max_wait_ms=50)
+
+    def tearDown(self):
+        self.batcher.close()
+
+    def test_single_call(self):
+        self.assertEqual(self.batcher.predict(21), 42)
+
+    def test_concurrent_calls_are_batched_and_fanned_out(self):
+        results = {}
+
+        def call(i):
+            results[i] = self.batcher.predict(i)
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, {i: i * 2 for i in range(20)})
+        self.assertLessEqual(max(self.batch_sizes), 8, "Batch exceeded max_batch_size.")
+        self.assertLess(len(self.batch_sizes), 20, "Concurrent calls were not batched.")
+        self.assertEqual(self.batcher.items, 20)
+
+    def test_errors_reach_every_caller(self):
+        batcher = MicroBatcher(lambda items: 1 / 0, max_batch_size=4, max_wait_ms=1)
+        futures = [batcher.submit(i) for i in range(3)]
+        for future in futures:
+            with self.assertRaises(ZeroDivisionError):
+                future.result(timeout=1)
+        batcher.close()
+
+    def test_batch_listeners_notified(self):
+        seen = []
+        self.batcher.batch_listeners.append(seen.append)
+        self.batcher.predict(1)
+        self.assertEqual(seen, [1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import threading
+import unittest
+from safeguarding.core.model_registry import ModelRegistry
+from safeguarding.core.classifier_filter import ClassifierFilter
+
+class FakePipeline:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, **kwargs):
+        self.calls.append(texts)
+        return [{"label": "toxic", "score": 0.01} for _ in texts]
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.loads = []
+
+        def loader(task, model_name, revision, device, precision, cache_dir):
+            self.loads.append((task, model_name, revision, device, precision))
+            return FakePipeline()
+
+        self.registry = ModelRegistry(loader=loader)
+
+    def test_loaded_once_and_shared(self):
+        first = self.registry.get("unitary/toxic-bert")
+        second = self.registry.get("unitary/toxic-bert")
+        self.assertIs(first, second)
+        self.assertEqual(len(self.loads), 1)
+
+    def test_key_includes_revision_and_device(self):
+        self.registry.get("unitary/toxic-bert")
+        self.registry.get("unitary/toxic-bert", revision="v2")
+        self.registry.get("unitary/toxic-bert", device=0)
+        self.assertEqual(len(self.loads), 3)
+        self.assertEqual(len(self.registry.loaded()), 3)
+
+    def test_precision_is_part_of_key(self):
+        fp32 = self.registry.get("m")
+        int8 = self.registry.get("m", precision="int8-dynamic")
+        self.assertIsNot(fp32, int8)
+        self.assertEqual([load[4] for load in self.loads], ["fp32", "int8-dynamic"])
+
+    def test_unknown_precision_rejected(self):
+        with self.assertRaises(ValueError):
+            self.registry.get("m", precision="fp8")
+
+    def test_warmup_runs_once_on_load(self):
+        model = self.registry.get("m", warmup_texts=["warm", "up"])
+        self.registry.get("m", warmup_texts=["warm", "up"])
+        self.assertEqual(model.calls, [["warm", "up"]])
+
+    def test_warmup_can_be_disabled(self):
+        model = self.registry.get("m", warmup_texts=[])
+        self.assertEqual(model.calls, [])
+
+    def test_concurrent_first_use_loads_once(self):
+        threads = [threading.Thread(target=self.registry.get, args=("m",)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(self.loads), 1)
+
+    def test_filters_share_one_model(self):
+        config = {"classifier": {"enabled": True, "model": "m", "warmup_texts": []}}
+        first = ClassifierFilter(config, registry=self.registry)
+        second = ClassifierFilter(config, registry=self.registry)
+        self.assertIs(first.classifier, second.classifier)
+        self.assertEqual(len(self.loads), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import unittest
+from unittest import mock
+from safeguarding.core import perspective_api_filter
+from safeguarding.core.perspective_api_filter import PerspectiveAPIFilter
+
+httpx = perspective_api_filter.httpx
+
+def analyze(request):
+    return httpx.Response(200, json={"attributeScores": {"TOXICITY": {"summaryScore": {"value": 0.1}}}})
+
+@unittest.skipIf(httpx is None, "httpx not installed")
+class TestPerspectiveAsyncClient(unittest.TestCase):
+    def setUp(self):
+        self.filter = PerspectiveAPIFilter({
+            "perspective_api": {"enabled": True, "api_key": "test-key", "thresholds": {"TOXICITY": 0.8}},
+        })
+        real_client = httpx.AsyncClient
+        self.clients = []
+
+        def make_client(**kwargs):
+            client = real_client(transport=httpx.MockTransport(analyze), **kwargs)
+            self.clients.append(client)
+            return client
+        patcher = mock.patch.object(httpx, "AsyncClient", side_effect=make_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_client_reused_across_calls(self):
+        async def scenario():
+            results = [await self.filter.acheck("hello") for _ in range(3)]
+            await self.filter.aclose()
+            return results
+        results = asyncio.run(scenario())
+        self.assertEqual(results, [(True, [], [])] * 3)
+        self.assertEqual(len(self.clients), 1)
+        self.assertTrue(self.clients[0].is_closed)
+        self.assertEqual(self.filter.calls["ok"], 3)
+
+    def test_new_loop_gets_new_client(self):
+        asyncio.run(self.filter.acheck("hello"))
+        asyncio.run(self.filter.acheck("hello"))
+        self.assertEqual(len(self.clients), 2)
+        self.filter.close()
+        self.assertEqual(self.filter._aclients, {})
+
+    def test_loops_in_threads_keep_their_own_clients(self):
+        async def scenario():
+            return [await self.filter.acheck("hello") for _ in range(5)]
+        results = []
+        threads = [threading.Thread(target=lambda: results.extend(asyncio.run(scenario()))) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [(True, [], [])] * 20)
+        self.assertEqual(len(self.clients), 4)
+        self.assertEqual(self.filter.calls, {"ok": 20, "error": 0})
+
+    def test_close_from_another_thread_closes_on_owning_loop(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            asyncio.run_coroutine_threadsafe(self.filter.acheck("hello"), loop).result(timeout=5)
+
+            async def elsewhere():
+                await self.filter.acheck("hello")
+                self.filter.close()  # another loop is running in this thread: must not drive `loop`
+            asyncio.run(elsewhere())
+            asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), loop).result(timeout=5)
+            self.assertTrue(self.clients[0].is_closed)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import unittest
+from unittest import mock
+from safeguarding.core.classifier_filter import ClassifierFilter
+from safeguarding.core.quantization import compare_precisions, quantized_cache_dir, quantized_cache_path
+
+def fake_pipeline(offset, insult=0.2):
+    # Like a HF text-classification pipeline: all labels with top_k=None, else the top-1 dict per text
+    def pipe(texts, top_k=1, **kwargs):
+        results = [
+            sorted([{"label": "toxic", "score": min(1.0, (0.9 if "idiot" in t else 0.1) + offset)},
+                    {"label": "insult", "score": insult}], key=lambda r: -r["score"])
+            for t in texts
+        ]
+        return results if top_k is None else [r[0] for r in results]
+    return pipe
+
+class TestComparePrecisions(unittest.TestCase):
+    def test_drift_reported_per_label(self):
+        report = compare_precisions(fake_pipeline(0.0), fake_pipeline(0.02), ["hello", "you idiot"])
+        self.assertEqual(report["samples"], 2)
+        self.assertAlmostEqual(report["labels"]["toxic"]["max_abs_drift"], 0.02)
+        self.assertAlmostEqual(report["labels"]["insult"]["max_abs_drift"], 0.0)
+        self.assertEqual(report["decision_flips"], [])
+
+    def test_decision_flips_detected(self):
+        evaluator = ClassifierFilter({"classifier": {"thresholds": {"toxic": {"warn": 0.5, "block": 0.85}}}})
+        report = compare_precisions(
+            fake_pipeline(0.0), fake_pipeline(-0.1), ["you idiot"], evaluate=evaluator._evaluate
+        )
+        self.assertEqual(len(report["decision_flips"]), 1)
+        self.assertFalse(report["decision_flips"][0]["fp32_allowed"])
+
+    def test_decision_flips_follow_the_top1_decision(self):
+        # Only the runner-up label crosses its block tier; production sees the top-1 label and keeps allowing
+        evaluator = ClassifierFilter({"classifier": {"thresholds": {"toxic": {"warn": 0.95, "block": 0.99}, "insult": {"warn": 0.2, "block": 0.3}}}})
+        report = compare_precisions(
+            fake_pipeline(0.0, insult=0.25), fake_pipeline(0.0, insult=0.35), ["you idiot"],
+            evaluate=evaluator._evaluate
+        )
+        self.assertAlmostEqual(report["labels"]["insult"]["max_abs_drift"], 0.1)
+        self.assertEqual(report["decision_flips"], [])
+
+    def test_cache_path_is_per_model_revision_and_torch(self):
+        path = quantized_cache_path("cache", "unitary/toxic-bert", None, "2.3.0")
+        self.assertNotIn("/toxic-bert", path.replace("cache/", "", 1))
+        self.assertIn("main", path)
+        self.assertIn("2.3.0", path)
+
+    def test_cache_path_follows_resolved_commit(self):
+        old = quantized_cache_path("cache", "unitary/toxic-bert", "4d6c22e", "2.3.0")
+        new = quantized_cache_path("cache", "unitary/toxic-bert", "9a1f0b7", "2.3.0")
+        self.assertNotEqual(old, new)
+        self.assertIn("9a1f0b7", new)
+
+    def test_cache_dir_is_absolute(self):
+        with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": "/var/cache/app"}):
+            self.assertEqual(quantized_cache_dir(), "/var/cache/app/safeguard_quantized")
+        self.assertTrue(os.path.isabs(quantized_cache_dir(".cache/safeguard_quantized")))
+        self.assertFalse(quantized_cache_dir("~/q").startswith("~"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import re
+import unittest
+import warnings
+from safeguarding.core.rule_compiler import (
+    CompiledRegexRules,
+    RegexRuleWarning,
+    backtracking_warnings,
+    normalize_pattern,
+)
+
+class TestNormalizePattern(unittest.TestCase):
+    def test_strips_redundant_wildcards(self):
+        self.assertEqual(normalize_pattern(".*naked.*"), "naked")
+        self.assertEqual(normalize_pattern(".*?let's keep this secret.*?"), "let's keep this secret")
+
+    def test_keeps_meaningful_wildcards(self):
+        self.assertEqual(normalize_pattern("^.*secret"), "^.*secret", "Anchored wildcard must be kept.")
+        self.assertEqual(normalize_pattern("secret.*$"), "secret.*$", "Anchored wildcard must be kept.")
+        self.assertEqual(normalize_pattern(r"dots\.*"), r"dots\.*", "Escaped dot must be kept.")
+        self.assertEqual(normalize_pattern("a.*b"), "a.*b")
+        self.assertEqual(normalize_pattern(".*"), ".*", "Pattern must never normalise to empty.")
+
+    def test_search_semantics_unchanged(self):
+        for pattern in [".*naked.*", ".*let's keep this secret.*"]:
+            for text in ["a naked picture", "Let's keep this secret, ok?", "clean\ntext", ""]:
+                self.assertEqual(
+                    bool(re.search(pattern, text, re.IGNORECASE)),
+                    bool(re.search(normalize_pattern(pattern), text, re.IGNORECASE)),
+                )
+
+class TestBacktrackingWarnings(unittest.TestCase):
+    def test_risky_shapes_reported(self):
+        self.assertTrue(backtracking_warnings("(a+)+b"))
+        self.assertTrue(backtracking_warnings("(a|aa)*c"))
+        self.assertTrue(backtracking_warnings("x.*.*y"))
+
+    def test_safe_patterns_not_reported(self):
+        self.assertEqual(backtracking_warnings("naked"), [])
+        self.assertEqual(backtracking_warnings(r"\bmeet\s+me\b"), [])
+
+    def test_warning_emitted_at_compile_time(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            rules = CompiledRegexRules(["(a+)+b"])
+        self.assertTrue(any(issubclass(w.category, RegexRuleWarning) for w in caught))
+        self.assertEqual(len(rules.warnings), 1)
+
+class TestCompiledRegexRules(unittest.TestCase):
+    def test_single_alternation_reports_fired_rules(self):
+        rules = CompiledRegexRules([".*naked.*", "secret", "meet"])
+        self.assertIsNotNone(rules.combined)
+        self.assertEqual(rules.standalone, [])
+        self.assertEqual(rules.search_all("a NAKED secret"), [0, 1])
+        self.assertEqual(rules.search_all("healthy food"), [])
+        self.assertTrue(rules.search("let's meet"))
+
+    def test_overlapping_rules_all_reported(self):
+        rules = CompiledRegexRules(["naked", "nak"])
+        self.assertEqual(rules.search_all("naked"), [0, 1])
+
+    def test_backreference_rules_kept_standalone(self):
+        rules = CompiledRegexRules([r"(\w+) \1", "secret"])
+        self.assertEqual(rules.standalone, [0])
+        self.assertEqual(rules.search_all("hello hello secret"), [0, 1])
+
+    def test_invalid_pattern_fails_loudly(self):
+        with self.assertRaises(re.error):
+            CompiledRegexRules(["(unclosed"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import os
+import unittest
+from datetime import datetime, timezone
+from safeguarding.core.engine import SafeguardEngine
+from safeguarding.utils import serializer
+from safeguarding.utils.logger import build_entry, log_entry
+
+class TestSerializer(unittest.TestCase):
+    def setUp(self):
+        self.log_path = "logs/test_serializer.log"
+        self.entry = build_entry(
+            text="naïve ≥ text", status="blocked", flags=["keyword", {"name": "classifier_toxic", "score": 0.91}],
+            reasons=["Banned keyword: x"], anonymize=False, context={"endpoint": "run_all_filters", 3: "x"}
+        )
+
+    def tearDown(self):
+        serializer.reset_backends()
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+
+    def test_stdlib_backend_matches_json_dumps(self):
+        self.assertEqual(serializer.json_dumps(self.entry), json.dumps(self.entry, ensure_ascii=False))
+
+    @unittest.skipIf(serializer.orjson is None, "orjson not installed")
+    def test_orjson_backend_same_content(self):
+        self.assertEqual(json.loads(serializer.orjson_dumps(self.entry)), json.loads(json.dumps(self.entry)))
+
+    def test_cached_timestamp_format(self):
+        stamp = serializer.utc_timestamp()
+        parsed = datetime.fromisoformat(stamp)
+        self.assertEqual(parsed.utcoffset().total_seconds(), 0)
+        self.assertLess(abs((datetime.now(timezone.utc) - parsed).total_seconds()), 1)
+        self.assertRegex(stamp, r"^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(\.\d{6})?\+00:00$")
+
+    def test_backends_write_parseable_lines(self):
+        for backend in ("json", "auto"):
+            serializer.reset_backends()
+            serializer.use_backend(self.log_path, backend)
+            log_entry("héllo", "allowed", [], [], log_path=self.log_path, anonymize=False)
+        with open(self.log_path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual([e["text"] for e in entries], ["héllo", "héllo"])
+
+    def test_default_is_stdlib_format(self):
+        log_entry("hi", "allowed", [], [], log_path=self.log_path, anonymize=False)
+        with open(self.log_path, encoding="utf-8") as f:
+            line = f.readline()
+        self.assertEqual(line, json.dumps(json.loads(line), ensure_ascii=False) + "\n")
+
+    @unittest.skipIf(serializer.orjson is None, "orjson not installed")
+    def test_backend_is_per_file(self):
+        SafeguardEngine({"logging": {"log_path": "logs/other.log", "json_backend": "orjson"}}).shutdown()
+        SafeguardEngine({"logging": {"log_path": self.log_path, "json_backend": "json"}}).shutdown()
+        self.assertIs(serializer.encoder_for("logs/other.log"), serializer.orjson_dumps)
+        self.assertIs(serializer.encoder_for(self.log_path), serializer.json_dumps)
+        self.assertIs(serializer.encoder_for("logs/unconfigured.log"), serializer.json_dumps)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            serializer.use_backend(self.log_path, "simdjson")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from safeguarding.core.text_windows import plan_windows, length_buckets, max_per_label
+from safeguarding.core.classifier_filter import ClassifierFilter
+from safeguarding.core.model_registry import ModelRegistry
+
+class TestPlanWindows(unittest.TestCase):
+    def test_short_text_single_window(self):
+        self.assertEqual(plan_windows(10, 510, 64), [(0, 10)])
+
+    def test_long_text_covered_with_overlap(self):
+        spans = plan_windows(1000, 400, 100)
+        self.assertEqual(spans[0], (0, 400))
+        self.assertEqual(spans[-1], (600, 1000))
+        for (s1, e1), (s2, e2) in zip(spans, spans[1:]):
+            self.assertGreaterEqual(e1 - s2, 100, "Consecutive windows must overlap.")
+        self.assertTrue(all(e - s <= 400 for s, e in spans))
+
+class TestLengthBuckets(unittest.TestCase):
+    def test_similar_lengths_batched_together(self):
+        lengths = [500, 3, 480, 5, 4, 490]
+        batches = length_buckets(lengths, bucket_width=32, batch_size=2)
+        self.assertEqual(sorted(i for b in batches for i in b), list(range(6)))
+        for batch in batches:
+            self.assertEqual(len({lengths[i] // 32 for i in batch}), 1, "Batch mixes length buckets.")
+            self.assertLessEqual(len(batch), 2)
+
+class TestMaxPerLabel(unittest.TestCase):
+    def test_max_kept_per_label(self):
+        merged = max_per_label([
+            [{"label": "toxic", "score": 0.1}, {"label": "insult", "score": 0.4}],
+            [{"label": "toxic", "score": 0.9}],
+        ])
+        self.assertEqual(merged, [{"label": "toxic", "score": 0.9}, {"label": "insult", "score": 0.4}])
+
+class FakeTokenizer:
+    """Whitespace tokenizer with a 10-token model limit (2 special tokens)."""
+    model_max_length = 10
+
+    def __call__(self, texts, **kwargs):
+        return {"input_ids": [t.split() for t in texts]}
+
+    def decode(self, ids):
+        return " ".join(ids)
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+class FakePipeline:
+    tokenizer = FakeTokenizer()
+
+    def __init__(self):
+        self.seen = []
+        self.kwargs = {}
+
+    def __call__(self, texts, **kwargs):
+        self.seen.extend(texts)
+        self.kwargs = kwargs
+        return [{"label": "toxic", "score": 0.99 if "idiot" in t else 0.01} for t in texts]
+
+class TestClassifierWindowing(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = FakePipeline()
+        registry = ModelRegistry(loader=lambda *args: self.pipeline)
+        self.filter = ClassifierFilter(
+            {"classifier": {"enabled": True, "model": "fake", "warmup_texts": [], "window_overlap": 2}},
+            registry=registry,
+        )
+
+    def test_toxic_tail_of_long_text_is_caught(self):
+        long_text = " ".join(["fine"] * 40 + ["idiot"])
+        allowed, flags, reasons = self.filter.check(long_text)
+        self.assertFalse(allowed, "Toxic content past the model window was missed.")
+        self.assertTrue(all(len(piece.split()) <= 8 for piece in self.pipeline.seen))
+
+    def test_pipeline_truncates_to_model_limit(self):
+        self.filter.check(" ".join(["fine"] * 40))
+        self.assertTrue(self.pipeline.kwargs["truncation"])
+        self.assertEqual(self.pipeline.kwargs["max_length"], 10)
+
+    def test_short_text_passed_through_unchanged(self):
+        self.filter.check("hello there")
+        self.assertEqual(self.pipeline.seen, ["hello there"])
+
+    def test_batch_results_in_input_order(self):
+        texts = ["idiot", " ".join(["ok"] * 30), "fine", " ".join(["ok"] * 30 + ["idiot"])]
+        results = self.filter.check_batch(texts, ["input"] * 4)
+        self.assertEqual([r[0] for r in results], [False, True, True, False])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+from safeguarding.core.thresholds import CompiledThresholds, normalize_tiers
+
+class TestNormalizeTiers(unittest.TestCase):
+    def test_dict_and_bare_number(self):
+        self.assertEqual(normalize_tiers({"warn": 0.4, "block": 0.9}), (0.4, 0.9))
+        self.assertEqual(normalize_tiers(0.8), (0.5, 0.8))
+        self.assertEqual(normalize_tiers(0.3), (0.3, 0.3))
+        self.assertEqual(normalize_tiers(None), (0.5, 0.7))
+
+class TestCompiledThresholds(unittest.TestCase):
+    def setUp(self):
+        self.thresholds = CompiledThresholds(
+            {"toxic": {"warn": 0.5, "block": 0.8}, "insult": 0.6},
+            labels=["toxic", "insult", "threat"],
+            flag_name="classifier_{label}",
+            reason="Classifier ({label}): {score:.2f} ≥ {threshold:.2f} ({tier})",
+        )
+
+    def test_arrays_aligned_with_label_index(self):
+        self.assertEqual(self.thresholds.labels, ["toxic", "insult", "threat"])
+        np.testing.assert_allclose(self.thresholds.block, [0.8, 0.6, 0.7])
+        np.testing.assert_allclose(self.thresholds.warn, [0.5, 0.5, 0.5])
+
+    def test_batch_tiers(self):
+        results = self.thresholds.evaluate([
+            [{"label": "toxic", "score": 0.1}],
+            [{"label": "toxic", "score": 0.6}],
+            [{"label": "toxic", "score": 0.9}, {"label": "insult", "score": 0.55}],
+        ])
+        self.assertEqual(results[0], (True, [], []))
+        self.assertTrue(results[1][0])
+        self.assertEqual(results[1][1], [{"name": "classifier_toxic", "score": 0.6, "tier": "warn"}])
+        self.assertFalse(results[2][0])
+        self.assertEqual([f["tier"] for f in results[2][1]], ["block", "warn"])
+        self.assertEqual(results[2][2][0], "Classifier (toxic): 0.90 ≥ 0.80 (block)")
+
+    def test_unknown_label_gets_defaults(self):
+        allowed, flags, _ = self.thresholds.evaluate([[{"label": "obscene", "score": 0.75}]])[0]
+        self.assertFalse(allowed)
+        self.assertEqual(flags[0]["name"], "classifier_obscene")
+        self.assertIn("obscene", self.thresholds.labels)
+
+    def test_missing_scores_never_trip(self):
+        matrix = self.thresholds.score_matrix([[{"label": "insult", "score": 0.0}]])
+        self.assertTrue(np.isneginf(matrix[0, 0]))
+        self.assertEqual(self.thresholds.evaluate_matrix(matrix), [(True, [], [])])
+
+if __name__ == "__main__":
+    unittest.main()
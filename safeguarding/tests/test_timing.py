@@ -0,0 +1,93 @@
+import asyncio
+import json
+import os
+import time
+import unittest
+from safeguarding.core.engine import SafeguardEngine
+from safeguarding.core.timing import LatencyHistogram, StageHistograms, StageTimer
+
+class SlowFilter:
+    def check(self, text, source="input"):
+        time.sleep(0.02)
+        return True, [], []
+
+class TestTimingPrimitives(unittest.TestCase):
+    def test_timer_laps_accumulate(self):
+        timer = StageTimer()
+        timer.lap("a")
+        timer.lap("b")
+        timer.lap("a")
+        timer.add("filter.x", 1.5)
+        stages = timer.finish()
+        self.assertEqual(set(stages), {"a", "b", "filter.x", "total"})
+        self.assertGreaterEqual(stages["total"], stages["a"] + stages["b"])
+
+    def test_histogram_quantiles(self):
+        hist = LatencyHistogram(buckets_ms=(1, 10, 100))
+        for ms in [0.5] * 50 + [5] * 49 + [500]:
+            hist.observe(ms)
+        self.assertLessEqual(hist.quantile(0.5), 1)
+        self.assertTrue(1 < hist.quantile(0.9) <= 10)
+        self.assertEqual(hist.quantile(1.0), 100)  # +Inf bucket reported as the largest bound
+        self.assertEqual(hist.cumulative()[-1], (float("inf"), 100))
+        self.assertIsNone(LatencyHistogram().quantile(0.5))
+
+    def test_dump(self):
+        path = "logs/test_timing_dump.json"
+        os.makedirs("logs", exist_ok=True)
+        stats = StageHistograms()
+        stats.record({"total": 3.0})
+        stats.dump(path)
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["total"]["count"], 1)
+        os.remove(path)
+
+class TestEngineTimings(unittest.TestCase):
+    def setUp(self):
+        self.log_path = "logs/test_timing.log"
+        self.engine = SafeguardEngine({
+            "rules": {"banned_keywords": ["badword"], "banned_regex": []},
+            "classifier": {"enabled": False},
+            "logging": {"log_path": self.log_path, "anonymize": False},
+            "timing": {"include_in_result": True},
+        })
+        self.engine.filters = [("keyword", self.engine.keyword), ("slow", SlowFilter())]
+
+    def tearDown(self):
+        self.engine.shutdown()
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+
+    def test_result_timings(self):
+        timings = self.engine.run("hello")["timings"]
+        for stage in ("pre_process", "override", "filters", "filter.keyword", "filter.slow",
+                      "logging", "post_process", "total"):
+            self.assertIn(stage, timings)
+        self.assertGreaterEqual(timings["filter.slow"], 20)
+        self.assertGreaterEqual(timings["total"], timings["filters"])
+
+    def test_async_timings_and_histograms(self):
+        asyncio.run(self.engine.arun("hello"))
+        self.engine.run("badword")
+        snapshot = self.engine.stage_timings.snapshot()
+        self.assertEqual(snapshot["total"]["count"], 2)
+        self.assertGreaterEqual(snapshot["filter.slow"]["p50_ms"], 10)
+
+    def test_batch_recorded_under_prefix(self):
+        results = self.engine.run_batch(["a", "b"])
+        self.assertNotIn("timings", results[0])
+        self.assertEqual(self.engine.stage_timings.snapshot()["batch.total"]["count"], 1)
+
+    def test_timings_off_by_default(self):
+        engine = SafeguardEngine({
+            "rules": {"banned_keywords": [], "banned_regex": []},
+            "classifier": {"enabled": False},
+            "logging": {"log_path": self.log_path, "anonymize": False},
+            "timing": {"histograms": False},
+        })
+        self.assertNotIn("timings", engine.run("hello"))
+        self.assertIsNone(engine.stage_timings)
+        engine.shutdown()
+
+if __name__ == "__main__":
+    unittest.main()
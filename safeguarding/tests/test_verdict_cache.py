@@ -0,0 +1,119 @@
+import asyncio
+import json
+import time
+import unittest
+from unittest import mock
+import requests
+from safeguarding.core.verdict_cache import VerdictCache
+from safeguarding.tests.helpers import EngineTestCase, read_entries
+
+TEST_MODEL = "test/cache-toxic"
+
+class TestVerdictCache(unittest.TestCase):
+    def test_hit_miss_and_normalization(self):
+        cache = VerdictCache("fp", max_entries=10)
+        self.assertIsNone(cache.get("hi"))
+        cache.put("hi", "input", ["verdict"])
+        self.assertEqual(cache.get("  hi "), ["verdict"])
+        self.assertIsNone(cache.get("hi", "output"))
+        stats = cache.snapshot()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+
+    def test_lru_eviction(self):
+        cache = VerdictCache("fp", max_entries=2)
+        cache.put("a", "input", 1)
+        cache.put("b", "input", 2)
+        cache.get("a")
+        cache.put("c", "input", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.stats["evictions"], 1)
+
+    def test_ttl_expiry(self):
+        cache = VerdictCache("fp", ttl_seconds=0.01)
+        cache.put("a", "input", 1)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats["expirations"], 1)
+
+    def test_key_does_not_contain_text(self):
+        cache = VerdictCache("fp")
+        self.assertNotIn("secret", cache.key("my secret address"))
+        self.assertNotEqual(VerdictCache("other").key("hi"), cache.key("hi"))
+
+    def test_invalidate_on_new_fingerprint(self):
+        cache = VerdictCache("fp")
+        cache.put("a", "input", 1)
+        cache.invalidate("fp")
+        self.assertEqual(len(cache), 1)
+        cache.invalidate("fp2")
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.fingerprint, "fp2")
+
+class TestEngineVerdictCache(EngineTestCase):
+    log_path = "logs/test_verdict_cache.log"
+    model = TEST_MODEL
+
+    def setUp(self):
+        super().setUp()
+        self.config = {
+            "rules": {"banned_keywords": ["drugs"], "banned_regex": []},
+            "classifier": {"enabled": True, "model": TEST_MODEL, "thresholds": {"toxic": {"warn": 0.5, "block": 0.8}}},
+            "verdict_cache": {"enabled": True, "max_entries": 100, "ttl_seconds": 60},
+        }
+        self.engine = self.build_engine(self.config)
+
+    def test_repeated_text_skips_filters(self):
+        first = self.engine.run("you idiot")
+        second = self.engine.run("you idiot")
+        self.assertEqual(first, second)
+        self.assertEqual(self.pipeline.calls, 1)
+        with open(self.log_path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+        statuses = [e["context"]["verdict_cache"] for e in entries if "verdict_cache" in e.get("context", {})]
+        self.assertEqual(statuses, ["miss", "hit"])
+
+    def test_legacy_log_same_for_miss_and_hit(self):
+        def logged(run):
+            self.remove_log()
+            run()
+            entries = read_entries(self.log_path)
+            for e in entries:
+                e.pop("timestamp")
+                e.get("context", {}).pop("verdict_cache", None)
+            return entries
+        flag_lines = lambda entries: [e for e in entries if "context" not in e and "keyword" in e["flags"]]
+        miss = logged(lambda: self.engine.run("drugs and idiot"))
+        self.assertEqual(len(flag_lines(miss)), 1)
+        self.assertEqual(logged(lambda: self.engine.run("drugs and idiot")), miss)
+        self.assertEqual(flag_lines(logged(lambda: asyncio.run(self.engine.arun("drugs and idiot")))), flag_lines(miss))
+        batch_miss = logged(lambda: self.engine.run_batch(["drugs", "hello drugs"]))
+        self.assertEqual(len(flag_lines(batch_miss)), 2)
+        self.assertEqual(logged(lambda: self.engine.run_batch(["drugs", "hello drugs"])), batch_miss)
+
+    def test_batch_and_async_share_cache(self):
+        self.engine.run("hello")
+        results = self.engine.run_batch(["hello", "drugs", "hello"])
+        self.assertEqual([r["status"] for r in results], ["allowed", "blocked", "allowed"])
+        asyncio.run(self.engine.arun("drugs"))
+        self.assertEqual(self.pipeline.calls, 2)
+        self.assertEqual(self.engine.verdict_cache.stats["hits"], 3)
+
+    def test_fail_open_verdict_not_cached(self):
+        engine = self.build_engine({
+            **self.config,
+            "perspective_api": {"enabled": True, "api_key": "test-key", "thresholds": {"TOXICITY": 0.8}},
+            "filters": [{"name": "keyword"}, {"name": "perspective"}],
+        })
+        with mock.patch("requests.post", side_effect=requests.exceptions.ConnectionError("down")) as post:
+            engine.run("hello")
+            engine.run("hello")
+        self.assertEqual(post.call_count, 2)
+        self.assertEqual(len(engine.verdict_cache), 0)
+
+    def test_changed_config_gets_new_fingerprint(self):
+        other = self.build_engine({**self.config, "rules": {"banned_keywords": ["hello"], "banned_regex": []}})
+        self.assertNotEqual(other.verdict_fingerprint(), self.engine.verdict_fingerprint())
+
+if __name__ == "__main__":
+    unittest.main()
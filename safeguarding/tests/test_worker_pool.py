@@ -0,0 +1,155 @@
+import gc
+import os
+import sys
+import threading
+import time
+import types
+import unittest
+import warnings
+from unittest import mock
+from safeguarding.core.classifier_filter import ClassifierFilter
+from safeguarding.core.engine import SafeguardEngine
+from safeguarding.core.model_registry import ModelRegistry, default_registry
+from safeguarding.utils import log_writer
+from safeguarding.core.worker_pool import ClassifierWorkerPool
+
+def tag_with_pid(texts):
+    if "boom" in texts:
+        raise ValueError("bad input")
+    if "hang" in texts:
+        time.sleep(60)
+    return [(t, os.getpid()) for t in texts]
+
+def fake_pipeline(texts, **kwargs):
+    texts = [texts] if isinstance(texts, str) else list(texts)
+    return [{"label": "toxic", "score": 0.95 if "idiot" in t else 0.01} for t in texts]
+
+class TestClassifierWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = ClassifierWorkerPool(tag_with_pid, workers=2, torch_threads=None)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_scores_in_workers(self):
+        results = self.pool.score(["a", "b"])
+        self.assertEqual([t for t, _ in results], ["a", "b"])
+        self.assertIn(results[0][1], self.pool.pids())
+        self.assertNotEqual(results[0][1], os.getpid())
+
+    def test_map_keeps_order_across_workers(self):
+        texts = [str(i) for i in range(50)]
+        results = self.pool.map(texts, chunk_size=8)
+        self.assertEqual([t for t, _ in results], texts)
+        self.assertEqual(self.pool.batches, 7)
+
+    def test_concurrent_callers(self):
+        out = {}
+        def call(i):
+            out[i] = self.pool.score([f"t{i}"])[0][0]
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(out, {i: f"t{i}" for i in range(8)})
+
+    def test_worker_error_is_raised_and_worker_survives(self):
+        with self.assertRaises(RuntimeError):
+            self.pool.score(["boom"])
+        self.assertEqual(self.pool.score(["ok"])[0][0], "ok")
+
+    def test_dead_worker_replaced(self):
+        for worker in self.pool._all:
+            worker.process.kill()
+            worker.process.join()
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                self.pool.score(["x"])
+        self.assertEqual(self.pool.restarts, 2)
+        self.assertEqual(self.pool.score(["x"])[0][0], "x")
+
+    def test_hung_worker_times_out_and_is_replaced(self):
+        pool = ClassifierWorkerPool(tag_with_pid, workers=1, torch_threads=None, timeout_ms=200)
+        try:
+            started = time.perf_counter()
+            with self.assertRaisesRegex(RuntimeError, "did not answer"):
+                pool.score(["hang"])
+            self.assertLess(time.perf_counter() - started, 2)
+            self.assertEqual(pool.restarts, 1)
+            self.assertEqual(pool.score(["x"])[0][0], "x")
+        finally:
+            pool.close()
+
+class TestWorkerPoolProcessState(unittest.TestCase):
+    def test_gc_unfrozen_when_last_pool_closes(self):
+        first = ClassifierWorkerPool(tag_with_pid, workers=1, torch_threads=None)
+        second = ClassifierWorkerPool(tag_with_pid, workers=1, torch_threads=None)
+        first.close()
+        self.assertGreater(gc.get_freeze_count(), 0)
+        second.close()
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+    def test_single_torch_thread_once_torch_is_loaded(self):
+        fake_torch = types.SimpleNamespace(set_num_threads=lambda n: None)
+        with mock.patch.dict(sys.modules, {"torch": fake_torch}):
+            with self.assertWarnsRegex(RuntimeWarning, "torch_threads=4"):
+                pool = ClassifierWorkerPool(tag_with_pid, workers=1, torch_threads=4)
+        try:
+            self.assertEqual(pool.torch_threads, 1)
+            self.assertEqual(pool.score(["x"])[0][0], "x")
+        finally:
+            pool.close()
+
+class TestClassifierFilterWorkerPool(unittest.TestCase):
+    def test_filter_uses_pool(self):
+        registry = ModelRegistry()
+        registry.register(fake_pipeline, "test/pool-toxic")
+        flt = ClassifierFilter({"classifier": {
+            "enabled": True,
+            "model": "test/pool-toxic",
+            "thresholds": {"toxic": {"warn": 0.5, "block": 0.8}},
+            "worker_pool": {"enabled": True, "workers": 2, "torch_threads": None},
+        }}, registry=registry)
+        try:
+            self.assertIsNotNone(flt.worker_pool)
+            self.assertFalse(flt.check("you idiot")[0])
+            self.assertTrue(flt.check("hello")[0])
+            self.assertEqual(len(flt.check_batch(["hello"] * 40, ["input"] * 40)), 40)
+            self.assertGreaterEqual(flt.worker_pool.batches, 3)
+        finally:
+            flt.close()
+
+    def test_engine_forks_before_starting_log_threads(self):
+        default_registry.register(fake_pipeline, "test/pool-engine")
+        log_path = "logs/test_worker_pool.log"
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", RuntimeWarning)
+                engine = SafeguardEngine({
+                    "rules": {"banned_keywords": [], "banned_regex": []},
+                    "classifier": {"enabled": True, "model": "test/pool-engine",
+                                   "worker_pool": {"enabled": True, "workers": 1, "torch_threads": None}},
+                    "logging": {"log_path": log_path, "writer": {"mode": "background"}},
+                })
+            self.assertIsNotNone(engine.log_writer)
+            engine.shutdown()
+        finally:
+            log_writer.close_writers()
+            default_registry.release("test/pool-engine")
+            if os.path.exists(log_path):
+                os.remove(log_path)
+
+    def test_warns_when_forking_with_threads_running(self):
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait, name="busy")
+        thread.start()
+        try:
+            with self.assertWarnsRegex(RuntimeWarning, "busy"):
+                ClassifierWorkerPool(tag_with_pid, workers=1, torch_threads=None).close()
+        finally:
+            stop.set()
+            thread.join()
+
+if __name__ == "__main__":
+    unittest.main()
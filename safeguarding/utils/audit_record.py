@@ -0,0 +1,49 @@
+from typing import Optional
+
+# logging.audit_mode: "consolidated" = one record per request, "legacy" = separate override/flag/outcome lines
+AUDIT_MODES = ("consolidated", "legacy")
+
+
+class AuditRecord:
+    """
+    One request's audit trail, accumulated while the request runs and written as a single entry.
+    The override attempt is collected here instead of being logged on its own (pass override_entries
+    as check_override's collect), filter outcomes are added as they are merged, and attach() folds both
+    into the final outcome entry under "audit".
+    """
+    __slots__ = ("override_entries", "filters")
+
+    def __init__(self):
+        self.override_entries = []
+        self.filters = {}
+
+    def add_filter(self, name: str, result: tuple, details: Optional[dict] = None):
+        """
+        Record one filter's (allowed, flags, reasons), plus its details dict when non-empty.
+        """
+        allowed, flags, reasons = result
+        outcome = {"allowed": allowed, "flags": flags, "reasons": reasons}
+        if details:
+            outcome["details"] = details
+        self.filters[name] = outcome
+
+    def attach(self, entry: dict) -> dict:
+        """
+        Add the "audit" section to a built outcome entry (see logger.build_entry) and return it.
+        """
+        audit = {"filters": self.filters}
+        if self.override_entries:
+            attempt = self.override_entries[-1]
+            audit["override"] = {
+                "status": attempt["status"],
+                "reasons": attempt["reasons"],
+                "role": attempt["override_role"],
+            }
+        entry["audit"] = audit
+        return entry
+
+# --- NOTES FOR AUDIT/MAINTAINERS:
+# - Consolidated records keep every top-level field of the legacy outcome line; consumers of those fields
+#   need no change. Tools that count override_failed or flag lines should read entry["audit"] instead,
+#   or run with logging.audit_mode = "legacy".
+# - The override attempt's text is not copied: the outcome entry already holds it (anonymized per config).
@@ -39,6 +39,28 @@ def load_config(config_path=None):
         "classifier": {
             "enabled": True,
             "model": "unitary/toxic-bert",
+            "precision": "fp32",
+            "quantized_cache_dir": None,
+            "micro_batching": False,
+            "max_batch_size": 16,
+            "max_wait_ms": 5,
+            "batch_size": 32,
+            "windowing": True,
+            "window_overlap": 64,
+            "bucket_width": 32,
+            "worker_pool": {
+                "enabled": False,
+                "workers": 2,
+                "torch_threads": 1,
+                "timeout_ms": 30000
+            },
+            "cascade": {
+                "enabled": False,
+                "fast_model_path": None,
+                "fast_model": None,
+                "label": "toxic",
+                "band": [0.2, 0.8]
+            },
             "thresholds": {
                 "toxic": 0.8,
                 "severe_toxic": 0.7,
@@ -48,6 +70,7 @@ def load_config(config_path=None):
             }
         },
         "perspective_api": {
+            "timeout_ms": 5000,
             "enabled": True,
             "api_key": None,
             "privacy_mode": True,
@@ -59,7 +82,76 @@ def load_config(config_path=None):
         },
         "logging": {
             "log_path": "safeguard_flags.log",
-            "anonymize": True
+            "anonymize": True,
+            "audit_mode": "legacy",
+            "json_backend": "json",
+            "sampling": {
+                "enabled": False,
+                "rates": {
+                    "blocked": 1.0,
+                    "override": 1.0,
+                    "error": 1.0,
+                    "flagged": 1.0,
+                    "allowed": 0.01
+                }
+            },
+            "rotation": {
+                "enabled": False,
+                "max_bytes": 52428800,
+                "interval_seconds": 86400,
+                "compress": True,
+                "max_segments": 30,
+                "max_age_days": 90
+            },
+            "writer": {
+                "mode": "sync",
+                "queue_size": 10000,
+                "max_batch": 512,
+                "flush_interval_ms": 200,
+                "durability": "flush_on_block",
+                "fsync_interval_ms": 1000
+            }
+        },
+        "concurrency": {
+            "max_workers": 4,
+            "filter_execution": "sequential"
+        },
+        "filters": [
+            {"name": "keyword", "enabled": True, "order": 10, "cost_hint_ms": 0.05, "group": "inline"},
+            {"name": "classifier", "enabled": True, "order": 20, "cost_hint_ms": 40, "group": "pool"},
+            {"name": "perspective", "enabled": False, "order": 30, "cost_hint_ms": 150, "group": "io"}
+        ],
+        "evaluation": {
+            "policy": "exhaustive",
+            "cost_alpha": 0.2
+        },
+        "timing": {
+            "histograms": True,
+            "include_in_result": False
+        },
+        "deadline": {
+            "default_ms": None,
+            "default_on_timeout": "fail_open",
+            "on_timeout": {
+                "keyword": "fail_closed",
+                "classifier": "fail_open",
+                "perspective": "fail_open"
+            }
+        },
+        "verdict_cache": {
+            "enabled": False,
+            "max_entries": 10000,
+            "ttl_seconds": 300,
+            "backend": "memory",
+            "redis": {
+                "host": "localhost",
+                "port": 6379,
+                "db": 0,
+                "password": None,
+                "timeout_ms": 50,
+                "cooldown_seconds": 30,
+                "key_prefix": "safeguard:verdict:"
+            }
         },
         "override": {
             "parent_phrases": ["override123"],
@@ -0,0 +1,343 @@
+import atexit
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+try:
+    import fcntl  # POSIX advisory locks: rotation shared by several processes
+except ImportError:
+    fcntl = None
+
+
+class RotationLock:
+    """
+    Guards appends against rotation, within this process (thread lock) and across processes (flock on
+    <log>.lock): writers hold it shared while appending; rotate() takes it exclusive for the rename.
+    Without fcntl (Windows) only the thread lock applies, so rotation is single-process there.
+    """
+    def __init__(self, lock_path: str):
+        self.path = lock_path
+        self._thread_lock = threading.Lock()
+        self._fd = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        try:
+            self._flock(fcntl.LOCK_SH if fcntl else None)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            self._flock(fcntl.LOCK_UN if fcntl else None)
+        finally:
+            self._thread_lock.release()
+
+    def exclusive(self):
+        """
+        Upgrade to the exclusive lock (holder of `with self` only). The upgrade is not atomic: another
+        process may rotate in between, so re-check the file afterwards.
+        """
+        self._flock(fcntl.LOCK_EX if fcntl else None)
+
+    def shared(self):
+        self._flock(fcntl.LOCK_SH if fcntl else None)
+
+    def touch(self):
+        """
+        Mark a rotation (the lock file's mtime), so other processes restart their segment age from it.
+        """
+        if self._fd is not None:
+            os.utime(self.path)
+
+    def last_rotation(self) -> float:
+        try:
+            return os.stat(self.path).st_mtime if self._fd is not None else 0.0
+        except FileNotFoundError:
+            return 0.0
+
+    def _flock(self, operation):
+        if operation is None:
+            return
+        if self._fd is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._fd, operation)
+
+    def close(self):
+        with self._thread_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+@contextmanager
+def _exclusive_file(lock_path: str):
+    """
+    Process-exclusive section on lock_path (no-op without fcntl).
+    """
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # releases the lock
+
+
+class LogRotator:
+    """
+    Size/time-based rotation for one JSONL log file.
+    When the active file passes max_bytes or is older than interval_seconds it is renamed to a segment
+    (<log>.<UTC timestamp>.<n>); a background thread then gzips the segment, records it in the
+    manifest (<log>.manifest.json: file, start/end timestamps, record count, sizes) and applies retention.
+    Writers hold `lock` around their append and call after_write(), so nothing lands mid-rename, also
+    when several processes append to and rotate the same file (see RotationLock).
+    """
+    def __init__(self, path: str, max_bytes: int = None, interval_seconds: float = None, compress: bool = True,
+                 max_segments: int = None, max_age_days: float = None):
+        """
+        Args:
+            path (str): Active log file.
+            max_bytes (int): Rotate once the active file reaches this size (None: no size limit).
+            interval_seconds (float): Rotate once the active segment is this old (None: no time limit).
+                Age counts from the last rotation, or from when this process started logging to the file.
+            compress (bool): gzip closed segments.
+            max_segments (int): Keep at most this many closed segments (None: unlimited).
+            max_age_days (float): Delete closed segments whose newest record is older than this (None: keep).
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.interval = interval_seconds
+        self.compress = compress
+        self.max_segments = max_segments
+        self.max_age_days = max_age_days
+        self.manifest_path = f"{path}.manifest.json"
+        self.lock = RotationLock(f"{path}.lock")
+        self.segment_started = time.time()
+        self._sequence = 0
+        self._manifest_lock = threading.Lock()
+        self._jobs = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name="safeguard-log-rotation", daemon=True)
+        self._thread.start()
+
+    def after_write(self, size: int) -> bool:
+        """
+        Called (under self.lock) after each append with the active file's size; rotates when due.
+        Returns True if the file was rotated, so writers holding it open must reopen.
+        """
+        if not self._due(size):
+            return False
+        self.lock.exclusive()
+        try:
+            # Another process may have rotated while we waited: adopt its rotation time, re-check the size
+            self.segment_started = max(self.segment_started, self.lock.last_rotation())
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            if not self._due(size):
+                return True  # rotated by another process meanwhile: writers reopen to be safe
+            self.rotate()
+            return True
+        finally:
+            self.lock.shared()
+
+    def _due(self, size: int) -> bool:
+        return (self.max_bytes is not None and size >= self.max_bytes) or \
+            (self.interval is not None and time.time() - self.segment_started >= self.interval)
+
+    def rotate(self) -> Optional[str]:
+        """
+        Close the active segment now (caller holds self.lock, exclusively when other processes write the file);
+        returns the segment path, or None if empty.
+        """
+        self.segment_started = time.time()
+        self.lock.touch()
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return None
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        while True:
+            self._sequence += 1
+            segment = f"{self.path}.{stamp}.{self._sequence}"
+            if not (os.path.exists(segment) or os.path.exists(segment + ".gz")):
+                break
+        os.replace(self.path, segment)  # appenders reopen log_path on their next write
+        self._jobs.put(segment)
+        return segment
+
+    def segments(self) -> List[dict]:
+        """
+        Manifest entries of closed segments, oldest first.
+        """
+        return read_manifest(self.path)
+
+    def drain(self):
+        """
+        Wait until every rotated segment is compressed and recorded.
+        """
+        self._jobs.join()
+
+    def close(self):
+        self.drain()
+        self._jobs.put(None)
+        self._thread.join()
+        self.lock.close()
+
+    def _loop(self):
+        while True:
+            segment = self._jobs.get()
+            try:
+                if segment is None:
+                    return
+                self._finalize(segment)
+            except OSError:
+                pass  # left uncompressed/unlisted; the raw segment is still on disk
+            finally:
+                self._jobs.task_done()
+
+    def _finalize(self, segment: str):
+        info = _scan_segment(segment)
+        if self.compress:
+            with open(segment, "rb") as src, gzip.open(segment + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(segment)
+            segment += ".gz"
+        info.update(file=os.path.basename(segment), compressed=self.compress, stored_bytes=os.path.getsize(segment))
+        with self._manifest_lock, _exclusive_file(f"{self.manifest_path}.lock"):
+            entries = read_manifest(self.path) + [info]
+            entries = self._apply_retention(entries)
+            _write_manifest(self.manifest_path, entries)
+
+    def _apply_retention(self, entries: List[dict]) -> List[dict]:
+        keep = entries
+        if self.max_age_days is not None:
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=self.max_age_days)).isoformat()
+            keep = [e for e in keep if not e.get("end") or e["end"] >= cutoff]
+        if self.max_segments is not None:
+            keep = keep[-self.max_segments:] if self.max_segments > 0 else []
+        for entry in entries:
+            if entry not in keep:
+                try:
+                    os.remove(os.path.join(os.path.dirname(self.path), entry["file"]))
+                except FileNotFoundError:
+                    pass
+        return keep
+
+
+def read_manifest(path: str) -> List[dict]:
+    """
+    Closed segments of log `path` (oldest first), [] if it was never rotated.
+    """
+    try:
+        with open(f"{path}.manifest.json", encoding="utf-8") as f:
+            return json.load(f).get("segments", [])
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def segment_paths(path: str, after: str = None, before: str = None) -> List[str]:
+    """
+    Closed segment files of log `path` that may hold records in [after, before] (ISO timestamps), oldest first.
+    The active file itself is not included.
+    """
+    directory = os.path.dirname(path)
+    out = []
+    for entry in read_manifest(path):
+        if after and entry.get("end") and entry["end"] < after:
+            continue
+        if before and entry.get("start") and entry["start"] > before:
+            continue
+        out.append(os.path.join(directory, entry["file"]))
+    return out
+
+
+def open_segment(path: str):
+    """
+    Text handle on a segment or active log, transparently decompressing .gz segments.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def _scan_segment(segment: str) -> dict:
+    """
+    Record count, first/last timestamps and size of a closed (uncompressed) segment.
+    """
+    records, start, end = 0, None, None
+    with open(segment, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            records += 1
+            try:
+                timestamp = json.loads(line).get("timestamp")
+            except json.JSONDecodeError:
+                continue
+            if timestamp:
+                start = timestamp if start is None else min(start, timestamp)
+                end = timestamp if end is None else max(end, timestamp)
+    return {"start": start, "end": end, "records": records, "bytes": os.path.getsize(segment)}
+
+
+def _write_manifest(manifest_path: str, entries: List[dict]):
+    tmp = manifest_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"segments": entries}, f, indent=2)
+    os.replace(tmp, manifest_path)
+
+
+# --- Process-wide rotators, one per log file
+_rotators = {}
+_rotators_lock = threading.Lock()
+
+
+def configure_rotation(path: str, **options) -> LogRotator:
+    """
+    The rotator for `path`, created on first use (later options for the same file are ignored).
+    """
+    key = os.path.abspath(path)
+    with _rotators_lock:
+        rotator = _rotators.get(key)
+        if rotator is None:
+            rotator = _rotators[key] = LogRotator(path, **options)
+        return rotator
+
+
+def rotator_for(path: str) -> Optional[LogRotator]:
+    if not _rotators:
+        return None
+    return _rotators.get(os.path.abspath(path))
+
+
+def close_rotators():
+    """
+    Finish pending compressions; registered with atexit (after the log writers have flushed).
+    """
+    with _rotators_lock:
+        rotators = list(_rotators.values())
+        _rotators.clear()
+    for rotator in rotators:
+        rotator.close()
+
+
+atexit.register(close_rotators)
+
+# --- NOTES FOR AUDIT/MAINTAINERS:
+# - Enabled per engine with logging.rotation.enabled; every writer of that log_path (sync appends and the
+#   background writer) then rotates it.
+# - Segment names sort chronologically; the manifest is the source of truth for readers (log_viewer.py) and
+#   is replaced atomically, so a crash never leaves it half-written.
+# - Retention deletes whole segments only; the active file is never touched.
+# - Several processes may log to and rotate one file: appends hold <log>.lock shared, the rename holds it
+#   exclusive, and manifest updates hold <log>.manifest.json.lock. Needs POSIX flock (fcntl); without it
+#   (Windows) rotation is only safe with a single writing process.
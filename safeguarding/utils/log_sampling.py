@@ -0,0 +1,96 @@
+import random
+import threading
+from collections import Counter
+from typing import Optional, Tuple
+
+# Outcome tiers an audit entry is sampled under (see outcome_tier)
+SAMPLING_OUTCOMES = ("blocked", "override", "error", "flagged", "allowed")
+# Tiers always written in full, whatever logging.sampling.rates says
+UNSAMPLED_OUTCOMES = ("degraded",)
+
+
+def outcome_tier(status: str, override_used: bool = False, flags: list = (), override_attempted: bool = False,
+                 degraded: bool = False) -> str:
+    """
+    Sampling tier of a request outcome: errors, override attempts (granted or not) and blocks first,
+    then allows that skipped a filter, then allowed requests that still carried flags
+    (e.g. warn-tier classifier scores), then plain allows.
+    override_attempted: an override phrase was present but not granted (e.g. ambiguous_match).
+    degraded: a filter's verdict was a fail-open stand-in (deadline budget, backend unavailable).
+    """
+    if status == "error":
+        return "error"
+    if override_used or override_attempted:
+        return "override"
+    if status == "blocked":
+        return "blocked"
+    if degraded:
+        return "degraded"
+    return "flagged" if flags else "allowed"
+
+
+class AuditSampler:
+    """
+    Per-outcome sampling of audit entries (logging.sampling.rates): each tier keeps a share of its entries
+    between 0.0 and 1.0, tiers not listed keep everything. Counts what was written and what was dropped,
+    so dropped traffic stays visible in /metrics even though it never reaches the log.
+    """
+    def __init__(self, rates: dict = None, seed: int = None):
+        """
+        Args:
+            rates (dict): {tier: share kept}, tiers from SAMPLING_OUTCOMES.
+            seed (int): Seed for the sampling RNG (tests/replays); None seeds from the OS.
+        """
+        self.rates = {tier: 1.0 for tier in SAMPLING_OUTCOMES + UNSAMPLED_OUTCOMES}
+        for tier, rate in (rates or {}).items():
+            if tier in UNSAMPLED_OUTCOMES:
+                raise ValueError(f"logging.sampling tier {tier!r} is always written in full and takes no rate.")
+            if tier not in SAMPLING_OUTCOMES:
+                raise ValueError(f"Unknown logging.sampling tier {tier!r}; expected one of {SAMPLING_OUTCOMES}.")
+            if not isinstance(rate, (int, float)) or not 0.0 <= rate <= 1.0:
+                raise ValueError(f"logging.sampling rate for {tier!r} must be between 0.0 and 1.0, got {rate!r}.")
+            self.rates[tier] = float(rate)
+        self.written = Counter()
+        self.dropped = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self, status: str, override_used: bool = False, flags: list = (),
+               override_attempted: bool = False, degraded: bool = False) -> Tuple[bool, Optional[float]]:
+        """
+        Decide whether this outcome's audit entry is written (arguments as for outcome_tier).
+        Returns (keep, rate): rate is the tier's sampling rate when below 1.0 (recorded on the entry so counts
+        can be re-weighted), else None.
+        """
+        tier = outcome_tier(status, override_used, flags, override_attempted, degraded)
+        rate = self.rates[tier]
+        with self._lock:
+            keep = rate >= 1.0 or (rate > 0.0 and self._random.random() < rate)
+            (self.written if keep else self.dropped)[tier] += 1
+        return keep, (rate if rate < 1.0 else None)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"written": dict(self.written), "dropped": dict(self.dropped)}
+
+
+def build_sampler(logging_cfg: dict) -> Optional[AuditSampler]:
+    """
+    AuditSampler from logging.sampling, or None when sampling is not enabled (every entry written).
+    Sampling needs logging.audit_mode "consolidated": legacy mode writes override/flag lines of its own
+    for every request, which the sampler cannot drop.
+    """
+    sampling_cfg = logging_cfg.get("sampling") or {}
+    if not sampling_cfg.get("enabled", False):
+        return None
+    if logging_cfg.get("audit_mode", "legacy") != "consolidated":
+        raise ValueError("logging.sampling requires logging.audit_mode = \"consolidated\".")
+    return AuditSampler(sampling_cfg.get("rates"), seed=sampling_cfg.get("seed"))
+
+# --- NOTES FOR AUDIT/MAINTAINERS:
+# - The decision is made before the entry is built, so dropped requests skip anonymization and serialization too.
+# - Kept entries from a sampled tier carry context["sample_rate"]; divide by it to estimate true volumes.
+# - Failed/ambiguous override attempts are sampled with the "override" tier, like granted ones.
+# - Allows where a filter did not really run (deadline fail_open, backend unavailable) are "degraded" and always
+#   written: they are neither cached nor sampled, since the text was never fully checked.
+# - Keep blocked/override/error at 1.0: safeguarding review depends on a complete record of them.
@@ -0,0 +1,321 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import List, Optional
+
+from safeguarding.utils import log_rotation
+from safeguarding.utils.serializer import encoder_for, serialize_lines, serialize_lines_lenient
+
+WRITER_MODES = ("sync", "background")
+DURABILITY_POLICIES = ("flush_on_block", "periodic_fsync")
+
+_STOP = object()
+
+
+# Entries safeguarding review cannot afford to lose (flushed before the caller continues under flush_on_block)
+URGENT_STATUSES = ("blocked", "error")
+
+
+def is_urgent(entry: dict) -> bool:
+    """
+    Blocks, errors and granted overrides. Routine entries (allows, the per-request
+    override_failed/no_match line) are batched.
+    """
+    return entry.get("status") in URGENT_STATUSES or bool(entry.get("override_used"))
+
+
+class _Ack:
+    """
+    Completion of one urgent submission: set by the writer thread, with the error if the write failed.
+    """
+    __slots__ = ("event", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.error = None
+
+    def set(self, error: Exception = None):
+        self.error = error
+        self.event.set()
+
+
+class AuditLogWriter:
+    """
+    Background JSONL writer for one log file: callers enqueue entries (bounded queue) and a single
+    thread serializes them and appends whole batches with one write, keeping the file open.
+    Durability:
+      - "flush_on_block": blocked/override/error entries are written and fsynced before submit() returns;
+        allowed entries are batched.
+      - "periodic_fsync": everything is batched; the file is fsynced at most every fsync_interval_ms.
+    A full queue never drops entries: the caller writes them itself (counted in stats["overflow"]); so does
+    a caller whose urgent entries the writer thread failed to write, raising if that write fails too.
+    """
+    def __init__(self, path: str, queue_size: int = 10000, max_batch: int = 512, flush_interval_ms: float = 200,
+                 durability: str = "flush_on_block", fsync_interval_ms: float = 1000):
+        """
+        Args:
+            path (str): JSONL file to append to.
+            queue_size (int): Maximum submissions waiting for the writer thread.
+            max_batch (int): Maximum entries per write.
+            flush_interval_ms (float): How long the thread gathers entries before writing them.
+            durability (str): "flush_on_block" or "periodic_fsync" (see above).
+            fsync_interval_ms (float): fsync period under "periodic_fsync".
+        """
+        if durability not in DURABILITY_POLICIES:
+            raise ValueError(f"Unknown logging.writer.durability {durability!r}; expected one of {DURABILITY_POLICIES}.")
+        self.path = path
+        self.max_batch = max(1, int(max_batch))
+        self.flush_interval = max(0.0, float(flush_interval_ms)) / 1000.0
+        self.durability = durability
+        self.fsync_interval = max(0.0, float(fsync_interval_ms)) / 1000.0
+        self.stats = {
+            "written": 0, "batches": 0, "fsyncs": 0, "overflow": 0, "errors": 0, "retried": 0, "lost": 0,
+            "unencodable": 0,
+        }
+        self._queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._file = None
+        self._unsynced = False
+        self._last_fsync = time.monotonic()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._state_lock = threading.Lock()  # _closed and queue puts, so nothing is queued behind the stop marker
+        self._thread = threading.Thread(target=self._loop, name="safeguard-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, entries: List[dict]):
+        """
+        Enqueue entries for writing; under flush_on_block, waits until urgent entries are on disk.
+        """
+        if not entries:
+            return
+        urgent = self.durability == "flush_on_block" and any(is_urgent(e) for e in entries)
+        ack = _Ack() if urgent else None
+        queued = False
+        with self._state_lock:
+            if not self._closed and self._thread.is_alive():
+                try:
+                    self._queue.put_nowait((entries, ack))
+                    queued = True
+                except queue.Full:
+                    pass
+        if queued:
+            if ack is None or self._wait(ack):
+                return
+            # The writer thread could not write them: retry here, so the caller sees a persistent failure
+            counter = "retried"
+        else:
+            # Queue full (or writer closed/dead): write in the caller rather than lose the record
+            counter = "overflow"
+        with self._write_lock:
+            self.stats[counter] += 1
+            self._write(entries, fsync=urgent)
+
+    def flush(self):
+        """
+        Block until everything submitted so far is written and fsynced.
+        """
+        ack = _Ack()
+        with self._state_lock:
+            if self._closed or not self._thread.is_alive():
+                return
+            self._queue.put(([], ack))
+        self._wait(ack)
+
+    def close(self):
+        """
+        Write what is queued, stop the thread and close the file (safe to call more than once).
+        """
+        with self._state_lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread.is_alive():
+                self._queue.put((_STOP, None))
+        self._thread.join()
+        with self._write_lock:
+            # Anything still queued if the thread stopped early
+            while True:
+                try:
+                    entries, ack = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                error = None
+                if entries:
+                    try:
+                        self._write(entries)
+                    except OSError as e:
+                        error = e
+                if ack is not None:
+                    ack.set(error)
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def _wait(self, ack: _Ack) -> bool:
+        """
+        Wait for an urgent submission; False if it was not written (failed, or the writer thread died).
+        """
+        while not ack.event.wait(0.5):
+            if not self._thread.is_alive() and not self._closed:
+                return False  # nothing will ever set it; close() sets whatever it drains
+        return ack.error is None
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def _loop(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.fsync_interval or None)
+            except queue.Empty:
+                self._periodic_fsync()
+                continue
+            batch, waiters, unacked, stop = [], [], 0, False
+            gather_until = time.monotonic() + self.flush_interval
+            while True:
+                entries, ack = item
+                if entries is _STOP:
+                    stop = True
+                    break
+                batch.extend(entries)
+                if ack is not None:
+                    waiters.append(ack)
+                else:
+                    unacked += len(entries)
+                if waiters or len(batch) >= self.max_batch:
+                    break
+                remaining = gather_until - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            error = None
+            try:
+                with self._write_lock:
+                    if batch:
+                        self._write(batch, fsync=bool(waiters))
+                    elif waiters:
+                        self._sync()
+            except Exception as e:
+                # Disk full/unwritable or an unencodable entry: the thread must survive either way.
+                # Waiting callers are told and write their own entries; batched ones are counted as lost.
+                error = e
+                self.stats["errors"] += 1
+                self.stats["lost"] += unacked
+            for ack in waiters:
+                ack.set(error)
+            try:
+                self._periodic_fsync()
+            except OSError:
+                self.stats["errors"] += 1
+            if stop:
+                return
+
+    def _periodic_fsync(self):
+        if self.durability == "periodic_fsync" and self._unsynced \
+                and time.monotonic() - self._last_fsync >= self.fsync_interval:
+            with self._write_lock:
+                self._sync()
+
+    def _write(self, entries: List[dict], fsync: bool = False):
+        try:
+            data = serialize_lines(entries, encoder_for(self.path))
+        except (TypeError, ValueError):
+            # e.g. an arbitrary object in a caller's context: write it as str() rather than drop the batch
+            data = serialize_lines_lenient(entries)
+            self.stats["unencodable"] += 1
+        rotator = log_rotation.rotator_for(self.path)
+        if rotator is None:
+            self._append(data, fsync)
+        else:
+            with rotator.lock:
+                size = self._append(data, fsync)
+                if rotator.after_write(size):
+                    self._file.close()
+                    self._file = None
+        self.stats["written"] += len(entries)
+        self.stats["batches"] += 1
+
+    def _append(self, data: str, fsync: bool) -> int:
+        f = self._open()
+        f.write(data)
+        f.flush()
+        self._unsynced = True
+        if fsync:
+            self._sync()
+        return f.tell()
+
+    def _open(self):
+        """
+        The open append handle, reopened if the file was moved or deleted underneath us (rotation, cleanup).
+        """
+        if self._file is not None:
+            try:
+                if os.stat(self.path).st_ino == os.fstat(self._file.fileno()).st_ino:
+                    return self._file
+            except FileNotFoundError:
+                pass
+            self._file.close()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def _sync(self):
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+            self.stats["fsyncs"] += 1
+        self._unsynced = False
+        self._last_fsync = time.monotonic()
+
+
+# --- Process-wide writers, one per log file
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def open_writer(path: str, **options) -> AuditLogWriter:
+    """
+    The background writer for `path`, started on first use (later options for the same file are ignored).
+    """
+    key = os.path.abspath(path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = AuditLogWriter(path, **options)
+        return writer
+
+
+def writer_for(path: str) -> Optional[AuditLogWriter]:
+    if not _writers:
+        return None
+    return _writers.get(os.path.abspath(path))
+
+
+def queue_depth() -> int:
+    return sum(w.queue_depth() for w in list(_writers.values()))
+
+
+def close_writers():
+    """
+    Flush and close every writer; registered with atexit so a normal exit loses no audit record.
+    Logging to those files afterwards falls back to synchronous appends.
+    """
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+atexit.register(close_writers)
+
+# --- NOTES FOR AUDIT/MAINTAINERS:
+# - Enabled per engine with logging.writer.mode = "background"; "sync" keeps the one-append-per-call behaviour.
+# - Entries are serialized on the writer thread; callers must not mutate an entry after logging it.
+# - Overflow writes (full queue) can land before entries still queued: order by "timestamp", not file position.
+# - SIGKILL/power loss can still lose allowed entries not yet written; blocks survive under flush_on_block.
+# - A failed background write is never reported as durable: urgent callers retry it themselves (and get the
+#   OSError if that fails too); batched entries of that write are counted in stats["lost"].
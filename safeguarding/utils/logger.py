@@ -1,8 +1,8 @@
-import json
 import os
-from datetime import datetime, timezone
 from typing import List, Optional
 from safeguarding.utils.anonymizer import anonymize_text
+from safeguarding.utils import log_rotation, log_writer
+from safeguarding.utils.serializer import encoder_for, serialize_lines, utc_timestamp
 
 DEFAULT_LOG_PATH = "logs/safeguard_flags.log"
 DEFAULT_ANONYMIZE = True
@@ -29,8 +29,44 @@ def log_entry(
     - anonymize: Redacts text if True (should be passed from config, defaults to True).
     - All other parameters as before.
     """
+    entry = build_entry(
+        text=text,
+        status=status,
+        flags=flags,
+        reasons=reasons,
+        override_used=override_used,
+        override_role=override_role,
+        source=source,
+        anonymize=anonymize,
+        user_id=user_id,
+        session_id=session_id,
+        action_type=action_type,
+        error=error,
+        context=context,
+    )
+    _append_lines(log_path if log_path else DEFAULT_LOG_PATH, [entry])
+
+def build_entry(
+    text: str,
+    status: str,
+    flags: List[str],
+    reasons: List[str],
+    override_used: bool = False,
+    override_role: Optional[str] = None,
+    source: str = "input",
+    anonymize: Optional[bool] = None,
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    action_type: Optional[str] = None,
+    error: Optional[str] = None,
+    context: Optional[dict] = None,
+) -> dict:
+    """
+    Build (but do not write) the structured entry log_entry() would write.
+    Used by bulk writers that collect many entries and append them with log_entries().
+    """
     entry = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": utc_timestamp(),
         "source": source,
         "status": status,
         "flags": flags,
@@ -42,13 +78,43 @@ def log_entry(
         "session_id": session_id or "unknown",
         "action_type": action_type or "unspecified",
     }
+    if error is not None:
+        entry["error"] = error
     if context is not None:
         entry["context"] = context
+    return entry
+
+def log_entries(entries: List[dict], log_path: Optional[str] = None):
+    """
+    Append many prebuilt entries (see build_entry) in a single open/write.
+    """
+    if entries:
+        _append_lines(log_path if log_path else DEFAULT_LOG_PATH, entries)
 
-    actual_log_path = log_path if log_path else DEFAULT_LOG_PATH
-    os.makedirs(os.path.dirname(actual_log_path) or ".", exist_ok=True)
-    with open(actual_log_path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+def queue_depth() -> int:
+    """
+    Submissions accepted but not yet on disk across background writers (exported as a metric).
+    """
+    return log_writer.queue_depth()
+
+def _append_lines(log_path: str, entries: List[dict]):
+    # A background writer registered for this file (logging.writer.mode = "background") takes the entries
+    writer = log_writer.writer_for(log_path)
+    if writer is not None:
+        writer.submit(entries)
+        return
+    data = serialize_lines(entries, encoder_for(log_path))
+    os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+    rotator = log_rotation.rotator_for(log_path)
+    if rotator is None:
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(data)
+        return
+    with rotator.lock:
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(data)
+            size = f.tell()
+        rotator.after_write(size)
 
 def log_flag(
     log_path: str,
@@ -64,8 +130,20 @@ def log_flag(
     - data: Must contain at minimum text, source, flags, and reasons.
     - anonymize: Redacts text if True (set False in tests if you want to verify content).
     """
-    entry = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+    _append_lines(log_path, [build_flag_entry(data, anonymize, user_id, session_id, action_type)])
+
+def build_flag_entry(
+    data: dict,
+    anonymize: bool = True,
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    action_type: Optional[str] = None,
+) -> dict:
+    """
+    Build (but do not write) the entry log_flag() would write.
+    """
+    return {
+        "timestamp": utc_timestamp(),
         "source": data.get("source", "input"),
         "status": "blocked",                                      # Flags are always blocks in this context
         "flags": data.get("flags", []),
@@ -78,13 +156,12 @@ def log_flag(
         "action_type": action_type or "unspecified",
     }
 
-    os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
-    with open(log_path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-
 # --- NOTES FOR AUDITORS/CONTRIBUTORS:
 # - All log writes are JSONL (not plain text) for full machine readability, traceability, and GDPR audit.
 # - Never hardcode log file locations or anonymization—always pass from config or via argument for true modularity and testability.
+# - With rotation configured for a file (utils/log_rotation.py), appends hold its lock and may close the segment.
+# - Where a background writer is registered for a file (utils/log_writer.py), appends are queued and batched.
+# - Batch callers build entries with build_entry()/build_flag_entry() and write them once via log_entries().
 # - log_flag() is designed for unit/integration testing and filter modularity. log_entry() covers all general/cross-pipeline events.
 # - If you extend for error events, pass status="error", and set reasons=["Classifier unavailable"] or similar.
 # - Text is redacted by default unless running in test/dev mode.
@@ -1,6 +1,6 @@
 import os
 from typing import Optional, Tuple
-from safeguarding.utils.logger import log_entry  # Import the logger
+from safeguarding.utils.logger import log_entry, build_entry  # Import the logger
 
 def load_override_phrases(config: dict) -> dict:
     """
@@ -13,7 +13,8 @@ def check_override(
     config: Optional[dict] = None,
     override_data: Optional[dict] = None,
     log_path: Optional[str] = None,
-    anonymize: Optional[bool] = None
+    anonymize: Optional[bool] = None,
+    collect: Optional[list] = None
 ) -> Tuple[bool, Optional[str], str]:
     """
     Check if the input text contains exactly one override phrase.
@@ -25,6 +26,8 @@ def check_override(
         override_data (dict, optional): Override data, injected for testing.
         log_path (str, optional): Log file to write to (tests, prod, etc).
         anonymize (bool, optional): Redact text in log if True.
+        collect (list, optional): If given, the log entry is appended here instead of written
+            (batch callers write all collected entries at once via log_entries).
 
     Returns:
         tuple: (override_used [bool], role [str|None], cleaned_text [str])
@@ -50,7 +53,8 @@ def check_override(
     if len(matches) == 1:
         role, matched_phrase = matches[0]
         cleaned_text = text.replace(matched_phrase, "").replace("  ", " ").strip()
-        log_entry(
+        _log_or_collect(
+            collect,
             text=text,
             status="override_success",
             flags=[],
@@ -64,7 +68,8 @@ def check_override(
         return True, role, cleaned_text
 
     # --- Fail-safe, always log ambiguous or failed attempts
-    log_entry(
+    _log_or_collect(
+        collect,
         text=text,
         status="override_failed",
         flags=[],
@@ -77,6 +82,12 @@ def check_override(
     )
     return False, None, text
 
+def _log_or_collect(collect: Optional[list], log_path: Optional[str] = None, **fields):
+    if collect is None:
+        log_entry(log_path=log_path, **fields)
+    else:
+        collect.append(build_entry(**fields))
+
 # --- NOTES FOR AUDITORS/DEVS:
 # - All override attempts are logged—no admin/moderator bypass goes unlogged.
 # - Logging is always JSONL for audit and automated tools.
@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+try:
+    import orjson  # optional: much faster encoder, used by the "orjson"/"auto" backends
+except ImportError:
+    orjson = None
+
+JSON_BACKENDS = ("auto", "orjson", "json")
+
+# One reusable encoder: json.dumps(..., ensure_ascii=False) builds a new JSONEncoder on every call
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+_second_prefix = (None, "")
+
+
+def utc_timestamp() -> str:
+    """
+    datetime.now(timezone.utc).isoformat(), with the date/time prefix formatted once per second.
+    """
+    global _second_prefix
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _second_prefix
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _second_prefix = (second, prefix)
+    micro = int((now - second) * 1_000_000)
+    return f"{prefix}.{micro:06d}+00:00" if micro else f"{prefix}+00:00"
+
+
+def json_dumps(entry: dict) -> str:
+    """
+    json.dumps(entry, ensure_ascii=False), byte for byte, through the shared encoder instance.
+    """
+    return _encode(entry)
+
+
+def orjson_dumps(entry: dict) -> str:
+    """
+    orjson encoding (compact separators, same content); non-string dict keys are stringified like json does.
+    """
+    return orjson.dumps(entry, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def resolve_backend(name: str = "json") -> Callable[[dict], str]:
+    """
+    The record encoder for a logging.json_backend name: "json" (stdlib, output identical to json.dumps),
+    "orjson" (required) or "auto" (orjson when installed, else json).
+    """
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"Unknown logging.json_backend {name!r}; expected one of {JSON_BACKENDS}.")
+    if name == "orjson" and orjson is None:
+        raise RuntimeError("logging.json_backend is 'orjson' but orjson is not installed (pip install orjson).")
+    return orjson_dumps if name != "json" and orjson is not None else json_dumps
+
+
+# --- Encoder per log file (logging.json_backend); files never configured use the stdlib format
+_file_encoders = {}
+_file_encoders_lock = threading.Lock()
+
+
+def use_backend(path: str, name: str = "json") -> Callable[[dict], str]:
+    """
+    The encoder for records appended to `path`, set on first use (later backends for the same file are ignored,
+    so one file never mixes formats).
+    """
+    encoder = resolve_backend(name)  # validated even when the file already has one
+    with _file_encoders_lock:
+        return _file_encoders.setdefault(os.path.abspath(path), encoder)
+
+
+def encoder_for(path: str) -> Callable[[dict], str]:
+    if not _file_encoders:
+        return json_dumps
+    return _file_encoders.get(os.path.abspath(path), json_dumps)
+
+
+def reset_backends():
+    """
+    Forget every file's encoder (tests, config reload): files go back to the stdlib format until configured again.
+    """
+    with _file_encoders_lock:
+        _file_encoders.clear()
+
+
+def serialize_lines(entries: List[dict], dumps: Optional[Callable[[dict], str]] = None) -> str:
+    """
+    JSONL text for a batch of entries (one line each, newline-terminated); dumps defaults to json_dumps.
+    """
+    dumps = dumps or json_dumps
+    return "".join([dumps(entry) + "\n" for entry in entries])
+
+
+def serialize_lines_lenient(entries: List[dict]) -> str:
+    """
+    serialize_lines() for entries the backends reject (e.g. a non-JSON object in a caller's context):
+    stdlib json with str() for anything unencodable, so the record is still written.
+    """
+    return "".join([json.dumps(entry, ensure_ascii=False, default=str) + "\n" for entry in entries])
+
+# --- NOTES FOR AUDIT/MAINTAINERS:
+# - A per-key pre-built template was measured slower than the stdlib C encoder on log_entry's record shape,
+#   so the json backend only reuses one encoder instance (build_entry's dict literal already fixes the key order).
+# - Both backends emit valid JSON with the same keys and values; only whitespace differs (orjson is compact).
+# - Benchmark: python -m safeguarding.serialization_benchmark (records/second per backend on log_entry's shape).
+# - The backend belongs to the log file (use_backend, keyed like log rotation and writers), not the process:
+#   engines register logging.json_backend for their log_path; the default "json" keeps the stdlib line format.